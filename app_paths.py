@@ -0,0 +1,31 @@
+"""Lokasi direktori cache dan konfigurasi aplikasi (mengikuti XDG)."""
+import os
+import threading
+
+APP_NAME = "priinter"
+
+
+def cache_dir(*parts):
+    """Direktori cache aplikasi; dibuat jika belum ada."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, APP_NAME, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def config_dir(*parts):
+    """Direktori konfigurasi aplikasi; dibuat jika belum ada."""
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    path = os.path.join(base, APP_NAME, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def atomic_write(path, data, mode="wb"):
+    """Menulis file lewat file sementara lalu os.replace agar tidak pernah setengah jadi."""
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,314 @@
+"""Modul `cups` palsu di dalam proses untuk benchmark tanpa cupsd.
+
+install() mendaftarkan modul ini sebagai `cups` di sys.modules; panggil
+sebelum mengimpor modul aplikasi. Latensi per panggilan dan jumlah printer
+diatur lewat configure() atau variabel lingkungan FAKE_CUPS_LATENCY (detik)
+dan FAKE_CUPS_PRINTERS.
+"""
+import os
+import sys
+import time
+import threading
+
+CUPS_FORMAT_AUTO = "application/octet-stream"
+CUPS_FORMAT_COMMAND = "application/vnd.cups-command"
+HTTP_CONTINUE = 100
+HTTP_OK = 200
+HTTP_CREATED = 201
+IPP_OK = 0x0000
+IPP_NOT_FOUND = 0x0406
+IPP_INTERNAL_ERROR = 0x0500
+IPP_SERVICE_UNAVAILABLE = 0x0502
+IPP_TEMPORARY_ERROR = 0x0505
+IPP_PRINTER_IDLE = 3
+IPP_PRINTER_PROCESSING = 4
+IPP_PRINTER_STOPPED = 5
+
+
+class IPPError(Exception):
+    pass
+
+
+class HTTPError(Exception):
+    pass
+
+
+_OMITTED = object()
+
+
+class _State:
+    latency = float(os.environ.get("FAKE_CUPS_LATENCY", "0"))
+    printer_count = int(os.environ.get("FAKE_CUPS_PRINTERS", "10"))
+    printers = {}
+    defaults = {}
+    lock = threading.Lock()
+    calls = 0
+    subscriptions = {}
+    events = []
+    job_count = int(os.environ.get("FAKE_CUPS_JOBS", "0"))
+    jobs = None
+
+
+def configure(printers=None, latency=None, jobs=None):
+    """Mengatur jumlah printer, job antrean dan latensi per panggilan (detik)."""
+    if jobs is not None:
+        _State.job_count = int(jobs)
+    _State.jobs = None
+    if latency is not None:
+        _State.latency = float(latency)
+    if printers is not None:
+        _State.printer_count = int(printers)
+    _State.printers = {}
+    _State.defaults = {}
+    _State.calls = 0
+    _State.subscriptions = {}
+    _State.events = []
+
+
+def install():
+    sys.modules["cups"] = sys.modules[__name__]
+
+
+def call_count():
+    return _State.calls
+
+
+def _printer_table():
+    if not _State.printers:
+        for i in range(_State.printer_count):
+            name = f"Printer{i:04d}"
+            _State.printers[name] = {
+                "printer-info": f"Fake Printer {i}",
+                "printer-location": f"Building {i % 5}, Floor {i % 7}",
+                "printer-make-and-model": ("Epson L3110 Series", "HP LaserJet Pro", "Brother HL-L2350DW")[i % 3],
+                "printer-state": IPP_PRINTER_IDLE,
+                "printer-state-reasons": ["none"],
+                "printer-uri-supported": f"ipp://localhost/printers/{name}",
+                "device-uri": f"ipp://10.0.{i // 250}.{i % 250}/ipp/print",
+                "printer-is-shared": False,
+                "marker-names": ["Black", "Cyan", "Magenta", "Yellow"],
+                "marker-colors": ["#000000", "#00FFFF", "#FF00FF", "#FFFF00"],
+                "marker-levels": [80 - i % 50, 60, 45, -3],
+                "marker-types": ["ink"] * 4,
+            }
+    return _State.printers
+
+
+def _job_table():
+    if _State.jobs is None:
+        names = list(_printer_table())
+        _State.jobs = {}
+        for job_id in range(1, _State.job_count + 1):
+            printer = names[job_id % len(names)] if job_id % 3 == 0 else names[0]
+            _State.jobs[job_id] = {
+                "job-name": f"document-{job_id}.pdf",
+                "job-originating-user-name": f"user{job_id % 17}",
+                "job-state": 5 if job_id == 1 else 3,
+                "job-k-octets": 10 + job_id % 900,
+                "job-priority": 50,
+                "time-at-creation": 1700000000 + job_id,
+                "job-printer-uri": f"ipp://localhost/printers/{printer}",
+            }
+    return _State.jobs
+
+
+def _io():
+    with _State.lock:
+        _State.calls += 1
+    if _State.latency:
+        time.sleep(_State.latency)
+
+
+class Connection:
+    def __init__(self, host=None, port=None, encryption=None):
+        _io()
+
+    def getDefault(self):
+        _io()
+        printers = _printer_table()
+        return next(iter(printers), None)
+
+    def getPrinters(self):
+        _io()
+        return {name: dict(attrs) for name, attrs in _printer_table().items()}
+
+    def getDests(self):
+        _io()
+        return {(name, None): None for name in _printer_table()}
+
+    def getPrinterAttributes(self, name=None, uri=None, requested_attributes=None):
+        _io()
+        printers = _printer_table()
+        if name not in printers:
+            raise IPPError(IPP_NOT_FOUND, "The printer or class does not exist.")
+        attrs = dict(printers[name])
+        attrs.update({
+            "printer-config-change-time": 1,
+            "media-supported": ["iso_a4_210x297mm", "na_letter_8.5x11in", "na_legal_8.5x14in"],
+            "media-default": "iso_a4_210x297mm",
+            "media-type-supported": ["stationery", "photographic-glossy", "photographic-matte"],
+            "media-type-default": "stationery",
+            "print-quality-supported": [3, 4, 5],
+            "print-quality-default": 4,
+            "sides-supported": ["one-sided", "two-sided-long-edge", "two-sided-short-edge"],
+            "sides-default": "one-sided",
+            "number-up-supported": [1, 2, 4],
+            "number-up-default": 1,
+            "print-color-mode-supported": ["color", "monochrome"],
+            "print-color-mode-default": "color",
+        })
+        attrs.update({f"{k}-default": v for k, v in _State.defaults.get(name, {}).items()})
+        if requested_attributes:
+            wanted = set(requested_attributes)
+            attrs = {k: v for k, v in attrs.items() if k in wanted}
+        return attrs
+
+    def getPPD(self, name):
+        _io()
+        raise IPPError(IPP_NOT_FOUND, "No PPD for driverless queue")
+
+    def addPrinterOptionDefault(self, name, option, value):
+        _io()
+        with _State.lock:
+            _State.defaults.setdefault(name, {})[option] = value
+
+    def getJobs(self, which_jobs="not-completed", my_jobs=False, limit=-1, first_job_id=-1,
+                requested_attributes=None):
+        _io()
+        with _State.lock:
+            ids = sorted(job_id for job_id in _job_table() if job_id >= first_job_id)
+            if limit > 0:
+                ids = ids[:limit]
+            result = {}
+            for job_id in ids:
+                attrs = dict(_State.jobs[job_id], **{"job-id": job_id})
+                if requested_attributes:
+                    attrs = {k: v for k, v in attrs.items() if k in requested_attributes}
+                result[job_id] = attrs
+        return result
+
+    def createJob(self, printer, title, options):
+        _io()
+        with _State.lock:
+            jobs = _job_table()
+            job_id = max(jobs, default=0) + 1
+            jobs[job_id] = {
+                "job-name": title, "job-originating-user-name": "bench", "job-state": 3,
+                "job-k-octets": 0, "job-priority": 50, "time-at-creation": int(time.time()),
+                "job-printer-uri": f"ipp://localhost/printers/{printer}", "document-bytes": 0,
+            }
+        self._document = None
+        return job_id
+
+    def startDocument(self, printer, job_id, doc_name, format, last_document):
+        _io()
+        self._document = job_id
+        return HTTP_CONTINUE
+
+    def writeRequestData(self, buffer, length):
+        with _State.lock:
+            _State.jobs[self._document]["document-bytes"] += length
+        return HTTP_CONTINUE
+
+    def finishDocument(self, printer):
+        _io()
+        with _State.lock:
+            job = _State.jobs[self._document]
+            job["job-k-octets"] = job["document-bytes"] // 1024
+            job["finished-at"] = time.monotonic()
+        self._document = None
+        return IPP_OK
+
+    def getJobAttributes(self, job_id, requested_attributes=None):
+        _io()
+        with _State.lock:
+            job = _job_table().get(job_id)
+            if job is None:
+                raise IPPError(IPP_NOT_FOUND, f"Job #{job_id} does not exist.")
+            attrs = dict(job, **{"job-id": job_id})
+        # Job yang dikirim lewat fake selesai sendiri dalam ~1 detik.
+        if "finished-at" in attrs and attrs["job-state"] in (3, 5):
+            elapsed = time.monotonic() - attrs["finished-at"]
+            attrs["job-state"] = 3 if elapsed < 0.2 else 5 if elapsed < 1.0 else 9
+        if requested_attributes:
+            attrs = {k: v for k, v in attrs.items() if k in requested_attributes}
+        return attrs
+
+    def setJobHoldUntil(self, job_id, job_hold_until):
+        _io()
+        with _State.lock:
+            job = _job_table().get(job_id)
+            if job is None:
+                raise IPPError(IPP_NOT_FOUND, f"Job #{job_id} does not exist.")
+            job["job-state"] = 3 if job_hold_until == "no-hold" else 4
+
+    def cancelJob(self, job_id, purge_job=False):
+        _io()
+        with _State.lock:
+            if _job_table().pop(job_id, None) is None:
+                raise IPPError(IPP_NOT_FOUND, f"Job #{job_id} does not exist.")
+
+    def createSubscription(self, uri, events=None, job_id=None, recipient_uri=None,
+                           lease_duration=None, time_interval=None, user_data=None):
+        _io()
+        with _State.lock:
+            subscription_id = len(_State.subscriptions) + 1
+            _State.subscriptions[subscription_id] = list(events or [])
+        return subscription_id
+
+    def getNotifications(self, subscription_ids, sequence_numbers=_OMITTED):
+        # Seperti pycups: sequence_numbers boleh tidak diberikan, tetapi jika ada harus list.
+        if sequence_numbers is _OMITTED:
+            sequence_numbers = []
+        elif not isinstance(sequence_numbers, list):
+            raise TypeError("sequence_numbers must be a list")
+        _io()
+        first = sequence_numbers[0] if sequence_numbers else 1
+        with _State.lock:
+            events = [dict(event) for event in _State.events if event["notify-sequence-number"] >= first]
+        return {"notify-get-interval": 1, "events": events}
+
+    def renewSubscription(self, subscription_id, lease_duration=None):
+        _io()
+
+    def cancelSubscription(self, subscription_id):
+        _io()
+        with _State.lock:
+            _State.subscriptions.pop(subscription_id, None)
+
+
+def _add_event(event, name):
+    printer = _printer_table().get(name, {})
+    _State.events.append({
+        "notify-sequence-number": len(_State.events) + 1,
+        "notify-subscribed-event": event,
+        "printer-name": name,
+        "printer-state": printer.get("printer-state", IPP_PRINTER_IDLE),
+        "printer-state-reasons": printer.get("printer-state-reasons", ["none"]),
+    })
+
+
+def set_printer_state(name, **attributes):
+    """Mengubah atribut printer palsu dan mencatat event printer-state-changed."""
+    with _State.lock:
+        _printer_table()[name].update({key.replace("_", "-"): value for key, value in attributes.items()})
+        _add_event("printer-state-changed", name)
+
+
+def add_printer(name, **attributes):
+    """Menambah printer palsu dan mencatat event printer-added."""
+    with _State.lock:
+        _printer_table()[name] = {
+            "printer-info": name, "printer-location": "", "printer-make-and-model": "Generic PDF",
+            "printer-state": IPP_PRINTER_IDLE, "printer-state-reasons": ["none"],
+            "printer-uri-supported": f"ipp://localhost/printers/{name}",
+        }
+        _printer_table()[name].update({key.replace("_", "-"): value for key, value in attributes.items()})
+        _add_event("printer-added", name)
+
+
+def delete_printer(name):
+    """Menghapus printer palsu dan mencatat event printer-deleted."""
+    with _State.lock:
+        _add_event("printer-deleted", name)
+        _printer_table().pop(name, None)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Benchmark dialog Printing Preferences tanpa printer, display maupun jaringan.
+
+Berjalan dengan QT_QPA_PLATFORM=offscreen dan modul cups palsu
+(benchmarks/fake_cups.py). Semua metrik berarti "makin kecil makin baik"
+(ms, µs per operasi, MB); waktu berulang diambil nilai terbaiknya agar
+tidak mudah terganggu noise. Contoh:
+
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --threshold 0.25   # gagal jika regresi > 25%
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import fake_cups  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, f"baseline-{platform.node() or 'local'}.json")
+
+
+def _best_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return min(samples)
+
+
+def _per_op_us(func, count, rounds=5):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i in range(count):
+            func(i)
+        elapsed = (time.perf_counter() - start) * 1e6 / count
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _wait_for(app, signal, timeout_ms=10000):
+    from PySide6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    signal.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+
+
+def run(args):
+    fake_cups.configure(printers=args.printers, latency=args.latency)
+    fake_cups.install()
+    # Cache disk (atlas, kemampuan printer) dan database preset diarahkan ke direktori sementara.
+    os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="printer-bench-")
+    os.environ["XDG_CONFIG_HOME"] = tempfile.mkdtemp(prefix="printer-bench-config-")
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QPixmapCache
+    from PySide6.QtCore import QSize
+    import printer_gui
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    metrics = {}
+    dialogs = []
+
+    def construct(lazy):
+        def build():
+            dialog = printer_gui.LinuxPrinterPreferencesDialog(lazy_tabs=lazy, prebuild_tabs=False)
+            dialogs.append(dialog)
+        return build
+
+    construct(True)()  # pemanasan impor dan cache ikon
+    metrics["dialog_construct_lazy_ms"] = _best_ms(construct(True), args.repeat)
+    metrics["dialog_construct_eager_ms"] = _best_ms(construct(False), args.repeat)
+
+    printer_gui.ICON_CACHE.clear()
+    metrics["get_icon_cold_us"] = _per_op_us(
+        lambda i: (printer_gui.ICON_CACHE.clear(), printer_gui.get_icon(*printer_gui.DIALOG_ICON_SPECS[i % 4])), 200)
+    metrics["get_icon_cached_us"] = _per_op_us(
+        lambda i: printer_gui.get_icon(*printer_gui.DIALOG_ICON_SPECS[i % len(printer_gui.DIALOG_ICON_SPECS)]), 20000)
+
+    def placeholder_cold(i):
+        QPixmapCache.clear()
+        printer_gui.PLACEHOLDER_CACHE._atlas_index = {}
+        printer_gui.create_placeholder_icon_with_text(["CLN", str(i)], icon_size=QSize(32, 32))
+    metrics["placeholder_cold_us"] = _per_op_us(placeholder_cold, 300)
+    metrics["placeholder_cached_us"] = _per_op_us(
+        lambda i: printer_gui.create_placeholder_icon_with_text(["CLN", "💧"], icon_size=QSize(32, 32)), 5000)
+
+    from preview import PreviewComposer
+    composer = PreviewComposer(QSize(80, 80))
+    params = {"document_size": "A4 (210 x 297 mm)", "orientation": "Portrait", "multipage": "4 Up"}
+    metrics["preview_first_render_ms"] = _best_ms(lambda: PreviewComposer(QSize(80, 80)).compose(params), args.repeat)
+    watermarks = ("DRAFT", "CONFIDENTIAL", "None")
+    metrics["preview_toggle_us"] = _per_op_us(
+        lambda i: composer.compose(dict(params, watermark=watermarks[i % 3])), 300)
+
+    first_switch, repeat_switch = [], []
+    for _ in range(args.repeat):
+        dialog = printer_gui.LinuxPrinterPreferencesDialog(prebuild_tabs=False)
+        dialogs.append(dialog)
+        dialog.show()
+        app.processEvents()
+        for index, bucket in ((1, first_switch), (0, None), (1, repeat_switch)):
+            start = time.perf_counter()
+            dialog.tab_widget.setCurrentIndex(index)
+            app.processEvents()
+            if bucket is not None:
+                bucket.append((time.perf_counter() - start) * 1000.0)
+        dialog.hide()
+    metrics["tab_switch_first_ms"] = min(first_switch)
+    metrics["tab_switch_repeat_ms"] = min(repeat_switch)
+
+    apply_samples = []
+    for i in range(args.repeat):
+        dialog = printer_gui.LinuxPrinterPreferencesDialog(prebuild_tabs=False)
+        dialogs.append(dialog)
+        _wait_for(app, dialog.default_printer_changed)
+        dialog.settings.set("copies", i + 2)
+        start = time.perf_counter()
+        dialog.apply_settings()
+        _wait_for(app, dialog.settings_applied)
+        apply_samples.append((time.perf_counter() - start) * 1000.0)
+    metrics["apply_roundtrip_ms"] = min(apply_samples)
+
+    # ru_maxrss dalam KiB di Linux.
+    metrics["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    for dialog in dialogs:
+        dialog.deleteLater()
+    app.processEvents()
+    return {name: round(value, 4) for name, value in metrics.items()}
+
+
+def compare(metrics, baseline, threshold):
+    """Daftar (nama, baseline, sekarang) untuk metrik yang memburuk melebihi threshold."""
+    regressions = []
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        # Toleransi absolut kecil agar metrik mikro tidak gagal karena noise.
+        if value > base * (1.0 + threshold) and value - base > 0.05:
+            regressions.append((name, base, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--printers", type=int, default=int(os.environ.get("FAKE_CUPS_PRINTERS", "10")))
+    parser.add_argument("--latency", type=float, default=float(os.environ.get("FAKE_CUPS_LATENCY", "0.002")),
+                        help="latensi palsu per panggilan CUPS (detik)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="regresi relatif yang diizinkan")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    metrics = run(args)
+    if args.json:
+        print(json.dumps(metrics, indent=1))
+    else:
+        for name, value in metrics.items():
+            print(f"{name:28s} {value:12.4f}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"metrics": metrics, "python": platform.python_version(),
+                       "machine": platform.machine(), "node": platform.node()}, f, indent=1)
+        print(f"Baseline disimpan ke {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Belum ada baseline ({args.baseline}); jalankan dengan --save-baseline.", file=sys.stderr)
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["metrics"]
+    regressions = compare(metrics, baseline, args.threshold)
+    for name, base, value in regressions:
+        print(f"REGRESI {name}: {base:.4f} -> {value:.4f} (+{(value / base - 1) * 100:.0f}%)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Model kemampuan printer dari atribut IPP dan PPD, dengan cache di disk.
+
+Cache dikunci nama printer + printer-config-change-time, sehingga membuka
+ulang dialog untuk printer yang sama tidak mengunduh dan mem-parse PPD lagi.
+"""
+import os
+import re
+import json
+import threading
+
+import cups
+
+from app_paths import cache_dir, atomic_write
+from constraints import ppd_constraints, dialog_engine
+
+# Naikkan jika format cache atau constraints.DIALOG_CONSTRAINTS berubah.
+CACHE_VERSION = 2
+
+REQUESTED_ATTRIBUTES = [
+    "printer-config-change-time", "printer-make-and-model",
+    "media-supported", "media-default",
+    "media-type-supported", "media-type-default",
+    "print-quality-supported", "print-quality-default",
+    "sides-supported", "sides-default",
+    "number-up-supported", "number-up-default",
+    "print-color-mode-supported", "print-color-mode-default",
+    "orientation-requested-supported", "orientation-requested-default",
+]
+
+# Kunci pengaturan dialog -> (opsi PPD, atribut IPP). PPD didahulukan jika ada.
+UI_OPTION_SOURCES = {
+    "document_size": ("PageSize", "media"),
+    "paper_type": ("MediaType", "media-type"),
+    "quality": ("cupsPrintQuality", "print-quality"),
+    "two_sided": ("Duplex", "sides"),
+    "multipage": (None, "number-up"),
+    "color_mode": ("ColorModel", "print-color-mode"),
+}
+
+PRINT_QUALITY_LABELS = {3: "Draft", 4: "Standard", 5: "High"}
+MEDIA_TYPE_LABELS = {
+    "stationery": "Plain Paper / Bright White Paper",
+    "photographic-glossy": "Photo Paper Glossy",
+    "photographic-matte": "Matte Paper",
+}
+_UNIT_LABELS = {"mm": "mm", "in": "in"}
+
+
+def media_label(media):
+    """Label ramah pengguna untuk nama media PWG, mis. iso_a4_210x297mm -> A4 (210 x 297 mm)."""
+    match = re.match(r"^[a-z0-9]+_(.+)_([0-9.]+)x([0-9.]+)(mm|in)$", media)
+    if not match:
+        return media
+    name, width, height, unit = match.groups()
+    name = name.replace("-", " ")
+    name = name.upper() if len(name) <= 3 else name.title()
+    return f"{name} ({width} x {height} {_UNIT_LABELS[unit]})"
+
+
+def ipp_choice_label(attribute, value):
+    if attribute == "media":
+        return media_label(value)
+    if attribute == "media-type":
+        return MEDIA_TYPE_LABELS.get(value, str(value).replace("-", " ").title())
+    if attribute == "print-quality":
+        return PRINT_QUALITY_LABELS.get(value, str(value))
+    if attribute == "number-up":
+        return "Off" if value == 1 else f"{value} Up"
+    return str(value).replace("-", " ").title()
+
+
+class PrinterCapabilities:
+    """Opsi yang didukung satu printer, terindeks per kata kunci dan pilihan.
+
+    options: {keyword: {"text", "default", "choices": [[value, label], ...]}}.
+    Kata kunci PPD dan nama atribut IPP (tanpa akhiran -supported) sama-sama
+    disimpan di sini.
+    """
+
+    def __init__(self, printer_name, change_time, options, make_and_model="", constraints=None):
+        self.printer_name = printer_name
+        self.change_time = change_time
+        self.options = options
+        self.make_and_model = make_and_model
+        # Bentuk terkompilasi ConstraintEngine (to_dict); dibuat sekali per konfigurasi printer.
+        self.constraints = constraints
+        self._build_index()
+
+    def _build_index(self):
+        self._by_label = {}
+        self._by_value = {}
+        for keyword, option in self.options.items():
+            self._by_label[keyword] = {label: value for value, label in option["choices"]}
+            self._by_value[keyword] = {value: label for value, label in option["choices"]}
+
+    def source_for(self, ui_key):
+        """Kata kunci opsi yang dipakai untuk satu kunci pengaturan dialog."""
+        ppd_keyword, ipp_attribute = UI_OPTION_SOURCES.get(ui_key, (None, None))
+        if ppd_keyword and ppd_keyword in self.options:
+            return ppd_keyword
+        if ipp_attribute and ipp_attribute in self.options:
+            return ipp_attribute
+        return None
+
+    def choices_for(self, ui_key):
+        keyword = self.source_for(ui_key)
+        return list(self.options[keyword]["choices"]) if keyword else []
+
+    def default_label_for(self, ui_key):
+        keyword = self.source_for(ui_key)
+        if keyword is None:
+            return None
+        return self._by_value[keyword].get(self.options[keyword]["default"])
+
+    def value_for_label(self, keyword, label):
+        return self._by_label.get(keyword, {}).get(label)
+
+    def label_for_value(self, keyword, value):
+        return self._by_value.get(keyword, {}).get(value)
+
+    def to_dict(self):
+        return {
+            "version": CACHE_VERSION,
+            "printer": self.printer_name,
+            "change_time": self.change_time,
+            "make_and_model": self.make_and_model,
+            "options": self.options,
+            "constraints": self.constraints,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["printer"], data["change_time"], data["options"], data.get("make_and_model", ""),
+                   data.get("constraints"))
+
+
+def _options_from_ipp(attributes):
+    options = {}
+    for name in REQUESTED_ATTRIBUTES:
+        if not name.endswith("-supported"):
+            continue
+        keyword = name[:-len("-supported")]
+        supported = attributes.get(name)
+        if supported is None:
+            continue
+        if not isinstance(supported, (list, tuple)):
+            supported = [supported]
+        options[keyword] = {
+            "text": keyword.replace("-", " ").title(),
+            "default": attributes.get(f"{keyword}-default"),
+            "choices": [[value, ipp_choice_label(keyword, value)] for value in supported],
+        }
+    return options
+
+
+def _options_from_ppd(ppd):
+    options = {}
+
+    def walk(groups):
+        for group in groups:
+            for option in group.options:
+                options[option.keyword] = {
+                    "text": option.text,
+                    "default": option.defchoice,
+                    "choices": [[choice["choice"], choice["text"]] for choice in option.choices],
+                }
+            walk(group.subgroups)
+
+    walk(ppd.optionGroups)
+    return options
+
+
+def fetch_ppd_options(conn, printer_name):
+    """Mengunduh dan mem-parse PPD; (opsi, constraint) atau (None, []) tanpa PPD."""
+    try:
+        filename = conn.getPPD(printer_name)
+    except cups.IPPError:
+        return None, []
+    try:
+        ppd = cups.PPD(filename)
+        return _options_from_ppd(ppd), ppd_constraints(ppd)
+    finally:
+        try:
+            os.unlink(filename)
+        except OSError:
+            pass
+
+
+class CapabilityStore:
+    """Cache PrinterCapabilities di memori dan sebagai file JSON per printer."""
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _path(self, printer_name):
+        safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", printer_name)
+        return os.path.join(self.directory or cache_dir("capabilities"), f"{safe_name}.json")
+
+    def get(self, printer_name, change_time):
+        with self._lock:
+            caps = self._memory.get(printer_name)
+        if caps is not None and caps.change_time == change_time:
+            return caps
+        try:
+            with open(self._path(printer_name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION or data.get("change_time") != change_time:
+            return None
+        caps = PrinterCapabilities.from_dict(data)
+        with self._lock:
+            self._memory[printer_name] = caps
+        return caps
+
+    def put(self, caps):
+        with self._lock:
+            self._memory[caps.printer_name] = caps
+        atomic_write(self._path(caps.printer_name), json.dumps(caps.to_dict()).encode("utf-8"))
+
+
+_default_store = CapabilityStore()
+
+
+def load_capabilities(conn, printer_name, store=None):
+    """Membaca kemampuan printer; PPD hanya diunduh jika konfigurasi printer berubah.
+
+    Dirancang untuk dijalankan lewat CupsExecutor.submit (argumen pertama koneksi).
+    """
+    store = store if store is not None else _default_store
+    attributes = conn.getPrinterAttributes(printer_name, requested_attributes=REQUESTED_ATTRIBUTES)
+    change_time = attributes.get("printer-config-change-time", 0)
+    caps = store.get(printer_name, change_time)
+    if caps is not None:
+        return caps
+    options = _options_from_ipp(attributes)
+    ppd_options, ppd_rules = fetch_ppd_options(conn, printer_name)
+    if ppd_options:
+        options.update(ppd_options)
+    choices = {keyword: [value for value, _label in option["choices"]] for keyword, option in options.items()}
+    constraints = dialog_engine(ppd_rules, choices).to_dict()
+    caps = PrinterCapabilities(printer_name, change_time, options,
+                               attributes.get("printer-make-and-model", ""), constraints)
+    store.put(caps)
+    return caps
@@ -0,0 +1,168 @@
+"""Mesin konflik opsi dari UIConstraints/cupsUIConstraints PPD.
+
+Setiap pasangan (opsi, pilihan) mendapat satu bit. Constraint dikompilasi
+sekali menjadi bitmask sehingga pertanyaan "apakah pilihan ini bentrok dengan
+pilihan saat ini?" cukup satu operasi AND, berapa pun jumlah constraint di
+PPD. Hasil kompilasi disimpan bersama cache kemampuan printer.
+
+UIConstraints bersifat berarah: "*A a *B b" berarti B=b diblokir selama A=a
+terpilih (PPD biasanya menulis kedua arah). cupsUIConstraints berisi dua
+atau lebih syarat dan bentrok jika semua syarat terpenuhi bersamaan.
+"""
+
+# Pilihan yang berarti "tidak aktif"; constraint tanpa pilihan tidak mencakupnya.
+NONE_CHOICES = {None, False, "None", "Off", "False"}
+
+# Aturan dialog yang dulu ditulis manual di closure widget.
+DIALOG_CONSTRAINTS = [
+    [("fit_to_page", True), ("zoom_enabled", True)],
+    [("color_correction", "Automatic"), ("cc_advanced", True)],
+]
+DIALOG_CHOICES = {
+    "fit_to_page": [True, False],
+    "zoom_enabled": [True, False],
+    "color_correction": ["Automatic", "Custom"],
+    "cc_advanced": [True, False],
+}
+
+
+def _parse_constraint_terms(text):
+    """'*A a *B *C c' -> [("A", "a"), ("B", None), ("C", "c")]."""
+    terms = []
+    for token in text.split():
+        if token.startswith("*"):
+            terms.append([token[1:], None])
+        elif terms and terms[-1][1] is None:
+            terms[-1][1] = token
+    return [tuple(term) for term in terms]
+
+
+def ppd_constraints(ppd):
+    """Semua constraint sebuah cups.PPD sebagai daftar syarat (keyword, choice|None)."""
+    constraints = []
+    for constraint in ppd.constraints:
+        constraints.append([
+            (constraint.option1.lstrip("*"), constraint.choice1 or None),
+            (constraint.option2.lstrip("*"), constraint.choice2 or None),
+        ])
+    for attribute in ppd.attributes:
+        if attribute.name == "cupsUIConstraints":
+            terms = _parse_constraint_terms(attribute.value or "")
+            if len(terms) >= 2:
+                # Diberi penanda agar tidak diperlakukan berarah seperti UIConstraints.
+                constraints.append(["any"] + terms)
+    return constraints
+
+
+def _bit_indexes(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ConstraintEngine:
+    """Constraint terkompilasi plus pilihan yang sedang aktif."""
+
+    def __init__(self, terms, pairs, groups, neighbors):
+        self.terms = terms
+        self._bits = {term: 1 << index for index, term in enumerate(terms)}
+        self._pairs = pairs
+        self._groups = groups
+        self._neighbors = neighbors
+        self._group_index = {}
+        for group_id, masks in enumerate(groups):
+            for mask in masks:
+                for index in _bit_indexes(mask):
+                    self._group_index.setdefault(index, []).append(group_id)
+        self._keyword_masks = {}
+        for term, bit in self._bits.items():
+            self._keyword_masks[term[0]] = self._keyword_masks.get(term[0], 0) | bit
+        self.selected = 0
+
+    @classmethod
+    def compile(cls, constraints, choices):
+        """constraints: daftar syarat (lihat ppd_constraints); choices: {keyword: [choice, ...]}."""
+        terms = []
+        index = {}
+
+        def bit_for(term):
+            if term not in index:
+                index[term] = len(terms)
+                terms.append(term)
+            return 1 << index[term]
+
+        def mask_for(keyword, choice):
+            if choice is not None:
+                return bit_for((keyword, choice))
+            mask = 0
+            for value in choices.get(keyword, [True]):
+                if value not in NONE_CHOICES:
+                    mask |= bit_for((keyword, value))
+            return mask
+
+        pairs = {}
+        groups = []
+        neighbors = {}
+        for constraint in constraints:
+            symmetric = constraint[0] == "any"
+            terms_of = [tuple(term) for term in (constraint[1:] if symmetric else constraint)]
+            keywords = {keyword for keyword, _choice in terms_of}
+            for keyword in keywords:
+                neighbors.setdefault(keyword, set()).update(keywords - {keyword})
+            masks = [mask_for(keyword, choice) for keyword, choice in terms_of]
+            if not all(masks):
+                continue
+            if symmetric:
+                groups.append(masks)
+                continue
+            blocker, blocked = masks
+            for position in _bit_indexes(blocked):
+                pairs[position] = pairs.get(position, 0) | blocker
+        return cls(terms, pairs, groups, {k: sorted(v) for k, v in neighbors.items()})
+
+    def to_dict(self):
+        return {
+            "terms": [list(term) for term in self.terms],
+            "pairs": {str(index): mask for index, mask in self._pairs.items()},
+            "groups": self._groups,
+            "neighbors": self._neighbors,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([tuple(term) for term in data["terms"]],
+                   {int(index): mask for index, mask in data["pairs"].items()},
+                   data["groups"], data["neighbors"])
+
+    def select(self, keyword, choice):
+        """Mencatat pilihan baru; mengembalikan keyword yang widget-nya perlu dievaluasi ulang."""
+        self.selected &= ~self._keyword_masks.get(keyword, 0)
+        self.selected |= self._bits.get((keyword, choice), 0)
+        return self._neighbors.get(keyword, ())
+
+    def conflicts(self, keyword, choice):
+        """True jika memilih choice untuk keyword bentrok dengan pilihan lain saat ini."""
+        bit = self._bits.get((keyword, choice))
+        if bit is None:
+            return False
+        others = self.selected & ~self._keyword_masks[keyword]
+        index = bit.bit_length() - 1
+        if self._pairs.get(index, 0) & others:
+            return True
+        effective = others | bit
+        for group_id in self._group_index.get(index, ()):
+            if all(mask & effective for mask in self._groups[group_id]):
+                return True
+        return False
+
+    def constrained(self, keyword):
+        """True jika keyword muncul di constraint mana pun."""
+        return keyword in self._keyword_masks
+
+
+def dialog_engine(ppd_rules=None, choices=None):
+    """Engine berisi aturan dialog plus constraint printer (jika ada)."""
+    all_choices = dict(DIALOG_CHOICES)
+    all_choices.update(choices or {})
+    return ConstraintEngine.compile(DIALOG_CONSTRAINTS + list(ppd_rules or []), all_choices)
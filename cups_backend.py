@@ -0,0 +1,211 @@
+"""Lapisan akses CUPS: pool koneksi pycups dan eksekusi panggilan di thread pekerja."""
+import time
+import threading
+import concurrent.futures
+
+import cups
+
+from profiling import get_profiler
+from metrics import get_metrics
+
+DEFAULT_TIMEOUT = 10.0
+
+
+class CupsTimeoutError(TimeoutError):
+    """Panggilan CUPS melewati batas waktu yang diberikan."""
+
+
+class ConnectionPool:
+    """Pool koneksi cups.Connection yang bisa dipakai ulang.
+
+    Objek cups.Connection tidak aman dipakai dua thread sekaligus, jadi setiap
+    panggilan meminjam satu koneksi lalu mengembalikannya. Koneksi yang rusak
+    atau melewati timeout dibuang, bukan dikembalikan ke pool.
+    """
+
+    def __init__(self, max_idle=4, host=None, port=None, encryption=None):
+        self.max_idle = max_idle
+        self.host = host
+        self.port = port
+        self.encryption = encryption
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        kwargs = {}
+        if self.host is not None:
+            kwargs["host"] = self.host
+        if self.port is not None:
+            kwargs["port"] = self.port
+        if self.encryption is not None:
+            kwargs["encryption"] = self.encryption
+        metrics = get_metrics()
+        with get_profiler().phase("cups.Connection", "cups"), metrics.timed("cups", "Connection"):
+            conn = cups.Connection(**kwargs)
+        return InstrumentedConnection(conn, metrics) if metrics.enabled else conn
+
+    def acquire(self):
+        """Koneksi idle atau koneksi baru; RuntimeError jika pool sudah ditutup."""
+        with self._lock:
+            if self._closed:
+                # Tugas yang terlambat jalan setelah close() tidak boleh membuka koneksi baru.
+                raise RuntimeError("ConnectionPool sudah ditutup")
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def release(self, conn, discard=False):
+        if conn is None:
+            return
+        with self._lock:
+            if not discard and not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._idle.clear()
+
+
+class InstrumentedConnection:
+    """Pembungkus cups.Connection yang mencatat latensi setiap method ke histogram "cups".
+
+    Hanya dipakai saat metrik aktif; panggilan yang melempar IPPError atau
+    error lain dihitung sebagai error operasi tersebut.
+    """
+
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self._conn, name)
+        if not callable(attribute):
+            return attribute
+        metrics = self._metrics
+
+        def timed_call(*args, **kwargs):
+            with metrics.timed("cups", name):
+                return attribute(*args, **kwargs)
+        timed_call.__name__ = name
+        return timed_call
+
+
+class CupsExecutor:
+    """Menjalankan panggilan pycups di thread pool dengan timeout per panggilan.
+
+    submit(func, ...) memanggil func(conn, ...) dengan koneksi dari pool dan
+    mengembalikan concurrent.futures.Future. Timeout dihitung sejak panggilan
+    mulai berjalan di pekerja. Jika timeout habis, Future gagal dengan
+    CupsTimeoutError; panggilan yang masih berjalan dibiarkan selesai dan
+    koneksinya dibuang.
+    """
+
+    def __init__(self, pool=None, max_workers=4, timeout=DEFAULT_TIMEOUT):
+        self.pool = pool if pool is not None else ConnectionPool(max_idle=max_workers)
+        self.timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cups-worker"
+        )
+
+    def _run(self, outer, func, args, kwargs):
+        try:
+            if not outer.set_running_or_notify_cancel():
+                return
+        except RuntimeError:
+            # Future sudah diselesaikan dari luar sebelum pekerja sempat menjalankannya.
+            return
+        if outer.deadline:
+            outer.start_timer(outer.deadline, outer.name)
+        # Waktu antre menunjukkan pekerja yang habis dipakai panggilan lambat.
+        get_metrics().observe("cups_queue", outer.name, time.perf_counter() - outer.submitted)
+        conn = None
+        discard = False
+        try:
+            conn = self.pool.acquire()
+            with get_profiler().phase(f"cups:{outer.name}", "cups"):
+                result = func(conn, *args, **kwargs)
+        except BaseException as e:
+            discard = not _is_server_reply(e)
+            _settle(outer, exception=e)
+        else:
+            _settle(outer, result=result)
+        finally:
+            # Jika timer sudah mengisi Future, panggilan ini terlambat.
+            if isinstance(outer.exception(), CupsTimeoutError):
+                discard = True
+            self.pool.release(conn, discard=discard)
+
+    def submit(self, func, *args, timeout=None, **kwargs):
+        outer = _DeadlineFuture()
+        outer.deadline = self.timeout if timeout is None else timeout
+        outer.name = getattr(func, "__name__", repr(func))
+        outer.submitted = time.perf_counter()
+        self._executor.submit(self._run, outer, func, args, kwargs)
+        return outer
+
+    def call(self, method_name, *args, timeout=None, **kwargs):
+        """Memanggil method cups.Connection berdasarkan nama, misalnya "getDefault"."""
+        def invoke(conn, *a, **kw):
+            return getattr(conn, method_name)(*a, **kw)
+        invoke.__name__ = method_name
+        return self.submit(invoke, *args, timeout=timeout, **kwargs)
+
+    def run(self, func, *args, timeout=None, **kwargs):
+        """Versi blocking dari submit()."""
+        return self.submit(func, *args, timeout=timeout, **kwargs).result()
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self.pool.close()
+
+
+def _is_server_reply(error):
+    """True jika error adalah jawaban server (IPPError), juga bila dibungkus `raise ... from`.
+
+    Mis. settings_model.PartialCommitError membungkus IPPError: koneksinya tetap
+    sehat dan boleh kembali ke pool. Error lain membuat koneksi dicurigai.
+    """
+    return isinstance(error, cups.IPPError) or isinstance(error.__cause__, cups.IPPError)
+
+
+def _settle(future, result=None, exception=None):
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except concurrent.futures.InvalidStateError:
+        pass
+
+
+class _DeadlineFuture(concurrent.futures.Future):
+    deadline = None
+    name = ""
+    submitted = 0.0
+
+    def start_timer(self, seconds, name):
+        timer = threading.Timer(seconds, self._expire, args=(seconds, name))
+        timer.daemon = True
+        self.add_done_callback(lambda _f: timer.cancel())
+        timer.start()
+
+    def _expire(self, seconds, name):
+        try:
+            self.set_exception(CupsTimeoutError(f"{name} timed out after {seconds:g}s"))
+        except concurrent.futures.InvalidStateError:
+            pass
+
+
+_default_executor = None
+_default_lock = threading.Lock()
+
+
+def get_default_executor():
+    """Executor bersama untuk seluruh proses."""
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = CupsExecutor()
+        return _default_executor
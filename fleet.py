@@ -0,0 +1,195 @@
+"""Menerapkan satu set opsi (misalnya dari preset) ke banyak printer sekaligus.
+
+Setiap pekerja memakai koneksi CUPS-nya sendiri dari pool CupsExecutor.
+Jumlah tugas yang dimulai per detik dibatasi, kegagalan sementara diulang
+dengan backoff, dan hasil dilaporkan per printer.
+"""
+import time
+import heapq
+import itertools
+import threading
+import collections
+import concurrent.futures
+
+import cups
+
+from cups_backend import CupsExecutor, ConnectionPool, CupsTimeoutError
+from presets import preset_options
+from settings_model import commit_option_defaults, PartialCommitError
+
+# Status IPP yang layak dicoba ulang (server sibuk atau gangguan sementara).
+RETRYABLE_IPP_STATUSES = {
+    cups.IPP_SERVICE_UNAVAILABLE,
+    cups.IPP_INTERNAL_ERROR,
+    cups.IPP_TEMPORARY_ERROR,
+}
+
+
+class RateLimiter:
+    """Token bucket sederhana yang aman dipakai banyak thread."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FleetCanceled(Exception):
+    """Printer dilewati karena cancel_event di-set sebelum ia diproses."""
+
+
+class FleetResult:
+    """Hasil penerapan opsi ke satu printer."""
+
+    def __init__(self, printer, ok, changes=None, error=None, attempts=1, elapsed=0.0, skipped=False):
+        self.printer = printer
+        self.ok = ok
+        self.changes = changes or {}
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+        # True: printer tidak diproses (lagi) karena dibatalkan.
+        self.skipped = skipped
+
+    def to_dict(self):
+        return {
+            "printer": self.printer,
+            "ok": self.ok,
+            "changes": self.changes,
+            "error": None if self.error is None else str(self.error),
+            "attempts": self.attempts,
+            "elapsed": round(self.elapsed, 4),
+            "skipped": self.skipped,
+        }
+
+    def __repr__(self):
+        status = "ok" if self.ok else ("skipped" if self.skipped else f"error={self.error!r}")
+        return f"FleetResult({self.printer!r}, {status}, attempts={self.attempts})"
+
+
+def is_retryable(error):
+    if isinstance(error, PartialCommitError):
+        # Percobaan ulang membaca ulang default, jadi opsi yang sudah tersimpan tidak dikirim lagi.
+        error = error.error
+    if isinstance(error, cups.IPPError):
+        status = error.args[0] if error.args else None
+        return status in RETRYABLE_IPP_STATUSES
+    return isinstance(error, (cups.HTTPError, CupsTimeoutError, RuntimeError, OSError))
+
+
+def apply_options_to_printers(printers, options, max_workers=16, rate=None, retries=2,
+                              backoff=0.5, timeout=30.0, on_result=None, executor=None,
+                              cancel_event=None):
+    """Menerapkan opsi ke setiap printer dan mengembalikan daftar FleetResult.
+
+    rate membatasi jumlah printer yang mulai diproses per detik (None = tanpa
+    batas). Pembatasan laju dan backoff percobaan ulang terjadi di thread
+    pemanggil sebelum tugas dikirim, jadi timeout hanya menghitung pekerjaan
+    CUPS. Paling banyak max_workers printer diproses bersamaan.
+    on_result(FleetResult) dipanggil dari thread pemanggil setiap kali satu
+    printer selesai. cancel_event (threading.Event) menghentikan pengiriman
+    tugas baru; printer yang belum diproses dilaporkan dengan skipped=True.
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        executor = CupsExecutor(pool=ConnectionPool(max_idle=max_workers),
+                                max_workers=max_workers, timeout=timeout)
+    limiter = RateLimiter(rate) if rate else None
+    waiting = collections.deque(printers)
+    # Percobaan ulang yang menunggu backoff: heap (waktu siap, urutan, printer).
+    retry_heap = []
+    retry_order = itertools.count()
+    started = {}
+    attempts = {}
+    results = []
+    pending = {}
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    def report(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    def report_future(future, printer, error):
+        report(FleetResult(
+            printer, error is None,
+            changes=getattr(error, "applied", None) if error is not None else future.result(),
+            error=error, attempts=attempts[printer], elapsed=time.perf_counter() - started[printer],
+        ))
+
+    def next_printer():
+        if retry_heap and retry_heap[0][0] <= time.monotonic():
+            return heapq.heappop(retry_heap)[2]
+        return waiting.popleft() if waiting else None
+
+    def fill():
+        while len(pending) < max_workers and not cancelled():
+            printer = next_printer()
+            if printer is None:
+                return
+            if limiter is not None:
+                limiter.acquire()
+                if cancelled():
+                    waiting.appendleft(printer)
+                    return
+            attempts[printer] = attempts.get(printer, 0) + 1
+            started.setdefault(printer, time.perf_counter())
+            pending[executor.submit(commit_option_defaults, printer, options)] = printer
+
+    try:
+        while True:
+            fill()
+            if cancelled():
+                break
+            if not pending:
+                if not retry_heap:
+                    break
+                # Hanya tersisa printer yang menunggu backoff.
+                delay = max(0.0, retry_heap[0][0] - time.monotonic())
+                if cancel_event is not None:
+                    cancel_event.wait(delay)
+                else:
+                    time.sleep(delay)
+                continue
+            timeout_wait = max(0.0, retry_heap[0][0] - time.monotonic()) if retry_heap else None
+            done, _ = concurrent.futures.wait(pending, timeout=timeout_wait,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                printer = pending.pop(future)
+                error = future.exception()
+                if error is not None and attempts[printer] <= retries and is_retryable(error) and not cancelled():
+                    ready_at = time.monotonic() + backoff * (2 ** (attempts[printer] - 1))
+                    heapq.heappush(retry_heap, (ready_at, next(retry_order), printer))
+                    continue
+                report_future(future, printer, error)
+        # Dibatalkan: tunggu tugas yang sudah berjalan, lalu laporkan sisanya sebagai dilewati.
+        for future in concurrent.futures.as_completed(list(pending)):
+            report_future(future, pending.pop(future), future.exception())
+        for printer in [entry[2] for entry in sorted(retry_heap)] + list(waiting):
+            report(FleetResult(printer, False, error=FleetCanceled("Dibatalkan sebelum diproses"),
+                               attempts=attempts.get(printer, 0), skipped=True))
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=False)
+    return results
+
+
+def apply_preset_to_printers(preset_name, printers, **kwargs):
+    """Seperti apply_options_to_printers, dengan opsi diambil dari preset bernama."""
+    return apply_options_to_printers(printers, preset_options(preset_name), **kwargs)
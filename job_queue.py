@@ -0,0 +1,93 @@
+"""Antrean job CUPS untuk Job Arranger Lite: baca per halaman dan aksi massal.
+
+Modul ini bebas Qt. Job disimpan sebagai tuple sesuai JOB_ATTRIBUTES (bukan
+dict) agar antrean puluhan ribu job tetap hemat memori. getJobs hanya
+meminta atribut yang ditampilkan dan dibaca per halaman lewat first_job_id.
+"""
+import subprocess
+
+import cups
+
+JOB_ATTRIBUTES = [
+    "job-id", "job-name", "job-originating-user-name", "job-state",
+    "job-k-octets", "job-priority", "time-at-creation", "job-printer-uri",
+]
+JOB_FIELD = {name: index for index, name in enumerate(JOB_ATTRIBUTES)}
+JOB_STATE_LABELS = {
+    3: "Pending", 4: "Held", 5: "Processing", 6: "Stopped",
+    7: "Canceled", 8: "Aborted", 9: "Completed",
+}
+JOB_ACTIONS = ("hold", "release", "cancel", "top", "bottom")
+# job-priority CUPS: 1..100, bawaan 50; job dengan prioritas lebih tinggi dicetak lebih dulu.
+PRIORITY_TOP = 100
+PRIORITY_BOTTOM = 1
+DEFAULT_PAGE_SIZE = 500
+
+
+def _job_tuple(job_id, attributes):
+    return tuple(job_id if name == "job-id" else attributes.get(name) for name in JOB_ATTRIBUTES)
+
+
+def fetch_jobs_page(conn, printer_name=None, first_job_id=1, limit=DEFAULT_PAGE_SIZE):
+    """Satu halaman job aktif mulai first_job_id.
+
+    Mengembalikan (jobs, next_first_job_id): jobs berupa daftar tuple urut
+    job-id; next_first_job_id None jika antrean sudah habis. getJobs tidak
+    bisa difilter per printer, jadi penyaringan printer dilakukan di sini.
+    """
+    reply = conn.getJobs(which_jobs="not-completed", my_jobs=False, limit=limit,
+                         first_job_id=first_job_id, requested_attributes=JOB_ATTRIBUTES)
+    suffix = f"/printers/{printer_name}" if printer_name else None
+    jobs = []
+    for job_id in sorted(reply):
+        attributes = reply[job_id]
+        if suffix and not (attributes.get("job-printer-uri") or "").endswith(suffix):
+            continue
+        jobs.append(_job_tuple(job_id, attributes))
+    next_first = max(reply) + 1 if len(reply) >= limit else None
+    return jobs, next_first
+
+
+def fetch_jobs_range(conn, printer_name=None, first_job_id=1, last_job_id=None, limit=DEFAULT_PAGE_SIZE):
+    """Semua job aktif dengan first_job_id <= job-id <= last_job_id, dibaca per halaman."""
+    jobs = []
+    cursor = first_job_id
+    while cursor is not None and (last_job_id is None or cursor <= last_job_id):
+        page, cursor = fetch_jobs_page(conn, printer_name, cursor, limit)
+        jobs.extend(job for job in page if last_job_id is None or job[0] <= last_job_id)
+    return jobs
+
+
+def set_job_priority(job_id, priority):
+    """pycups tidak punya Set-Job-Attributes; job-priority diubah lewat `lp -i ID -q N`."""
+    result = subprocess.run(["lp", "-i", str(job_id), "-q", str(priority)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"lp exited with {result.returncode}")
+
+
+def apply_job_action(conn, job_ids, action, progress=None):
+    """Menjalankan satu aksi massal pada banyak job.
+
+    Gagal pada satu job tidak menghentikan job lain; mengembalikan dict
+    {job_id: error} untuk job yang gagal. "top"/"bottom" mengatur ulang urutan
+    lewat job-priority sehingga urutan relatif job yang dipilih tetap.
+    """
+    if action not in JOB_ACTIONS:
+        raise ValueError(f"Unknown job action: {action}")
+    errors = {}
+    for done, job_id in enumerate(job_ids, 1):
+        try:
+            if action == "hold":
+                conn.setJobHoldUntil(job_id, "indefinite")
+            elif action == "release":
+                conn.setJobHoldUntil(job_id, "no-hold")
+            elif action == "cancel":
+                conn.cancelJob(job_id)
+            else:
+                set_job_priority(job_id, PRIORITY_TOP if action == "top" else PRIORITY_BOTTOM)
+        except (cups.IPPError, RuntimeError, OSError) as e:
+            errors[job_id] = e
+        if progress is not None:
+            progress(done, len(job_ids))
+    return errors
@@ -0,0 +1,49 @@
+"""Perintah maintenance printer sebagai job CUPS command file.
+
+Filter commandtoescpx/commandtops dan sejenisnya menjalankan job bertipe
+application/vnd.cups-command. Job dikirim dengan createJob/startDocument agar
+tidak perlu file sementara, lalu dilacak lewat job-id sampai selesai.
+"""
+import cups
+
+from print_jobs import submit_stream
+
+# Baris command file per item maintenance (lihat dokumentasi CUPS "Command Files").
+MAINTENANCE_COMMANDS = {
+    "Cleaning": ["Clean all"],
+    # Tidak ada perintah standar untuk deep cleaning; driver umumnya
+    # menaikkan kekuatan pembersihan saat Clean diulang berturut-turut.
+    "Deep Cleaning": ["Clean all", "Clean all"],
+    "Print Head Alignment": ["PrintAlignmentPage"],
+    "Nozzle Check": ["PrintSelfTestPage"],
+}
+TRACKED_JOB_ATTRIBUTES = ["job-state", "job-state-reasons", "job-printer-state-message"]
+JOB_STATE_COMPLETED = 9
+TERMINAL_JOB_STATES = (7, 8, JOB_STATE_COMPLETED)
+JOB_STATE_TEXT = {3: "Waiting", 4: "Held", 5: "Running", 6: "Stopped",
+                  7: "Canceled", 8: "Aborted", 9: "Completed"}
+
+
+def command_file(commands):
+    return ("#CUPS-COMMAND\n" + "".join(f"{command}\n" for command in commands)).encode("ascii")
+
+
+def submit_command_job(conn, printer_name, commands, title="Maintenance"):
+    """Mengirim command file sebagai job baru; mengembalikan job-id."""
+    return submit_stream(conn, printer_name, title, [command_file(commands)], cups.CUPS_FORMAT_COMMAND)
+
+
+def submit_maintenance(conn, printer_name, title):
+    """Mengirim item maintenance bernama (kunci MAINTENANCE_COMMANDS)."""
+    return submit_command_job(conn, printer_name, MAINTENANCE_COMMANDS[title], title)
+
+
+def job_status(conn, job_id):
+    """(job-state, teks status) satu job; teks memakai pesan printer bila ada."""
+    attributes = conn.getJobAttributes(job_id, requested_attributes=TRACKED_JOB_ATTRIBUTES)
+    state = attributes.get("job-state", 0)
+    text = JOB_STATE_TEXT.get(state, str(state))
+    message = attributes.get("job-printer-state-message")
+    if message and state not in TERMINAL_JOB_STATES:
+        text = f"{text}: {message}"
+    return state, text
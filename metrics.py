@@ -0,0 +1,384 @@
+"""Metrik diagnosis "dialog hang": latensi panggilan CUPS dan jeda event loop GUI.
+
+Aktif lewat `printer.py --metrics[=PATH]` (atau PRINTER_METRICS=PATH) yang
+menulis dump JSON saat keluar, dan/atau `--metrics-port=[HOST:]PORT` (atau
+PRINTER_METRICS_PORT) yang melayani http://HOST:PORT/metrics (format teks
+Prometheus, HOST bawaan 127.0.0.1) serta /metrics.json. `--stall-threshold=MS` (atau
+PRINTER_STALL_MS) mengatur batas jeda event loop yang dicatat.
+
+Modul ini bebas Qt: StallWatchdog hanya perlu beat() dipanggil berkala dari
+thread GUI, mis. oleh QTimer.
+"""
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import contextlib
+import collections
+import http.server
+
+ENV_VAR = "PRINTER_METRICS"
+PORT_ENV_VAR = "PRINTER_METRICS_PORT"
+STALL_ENV_VAR = "PRINTER_STALL_MS"
+DEFAULT_OUTPUT = "printer-metrics.json"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_STALL_MS = 200
+HEARTBEAT_MS = 50
+# Batas atas bucket (detik), seperti bucket bawaan klien Prometheus.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_STALLS = 200
+
+
+class Histogram:
+    """Histogram kumulatif ala Prometheus untuk satu label."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+        self.max = 0.0
+
+    def observe(self, seconds, error=False):
+        index = 0
+        while index < len(BUCKETS) and seconds > BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+        if error:
+            self.errors += 1
+
+    def quantile(self, q):
+        """Perkiraan kuantil dari batas bucket (batas atas bucket yang memuatnya)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum_ms": round(self.total * 1000.0, 3),
+            "max_ms": round(self.max * 1000.0, 3),
+            "p50_ms": round(self.quantile(0.5) * 1000.0, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000.0, 3),
+            "buckets": {("+Inf" if index == len(BUCKETS) else f"{BUCKETS[index]:g}"): count
+                        for index, count in enumerate(self.counts)},
+        }
+
+
+class StallWatchdog:
+    """Mendeteksi event loop GUI yang tidak berdetak lebih lama dari threshold_ms.
+
+    Thread GUI memanggil beat() tiap HEARTBEAT_MS. Thread watchdog memeriksa
+    jarak sejak detak terakhir; saat melewati batas, handler yang sedang
+    berjalan (lihat Metrics.handler) dan frame teratas thread GUI dicatat.
+    Durasi jeda dihitung saat detak berikutnya datang.
+    """
+
+    def __init__(self, metrics, threshold_ms=DEFAULT_STALL_MS, interval_ms=HEARTBEAT_MS):
+        self.metrics = metrics
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self._last_beat = time.monotonic()
+        self._gui_thread_id = threading.get_ident()
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._last_beat = time.monotonic()
+        self._gui_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def beat(self):
+        now = time.monotonic()
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            pending, self._pending = self._pending, None
+        stalled = gap - self.interval
+        if stalled < self.threshold:
+            return
+        if pending is None:
+            pending = {"handler": self.metrics.current_handler(), "frame": None,
+                       "started": time.time() - gap}
+        self.metrics.record_stall(pending["handler"], stalled, pending["started"], pending["frame"])
+
+    def _top_frame(self):
+        frame = sys._current_frames().get(self._gui_thread_id)
+        if frame is None:
+            return None
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+
+    def _run(self):
+        poll = min(self.threshold / 4, 0.05)
+        while not self._stop.wait(poll):
+            with self._lock:
+                late = time.monotonic() - self._last_beat > self.threshold + self.interval
+                if not late or self._pending is not None:
+                    continue
+                self._pending = {"handler": self.metrics.current_handler(), "frame": self._top_frame(),
+                                 "started": time.time() - (time.monotonic() - self._last_beat)}
+
+
+class Metrics:
+    """Kumpulan histogram latensi plus catatan jeda event loop."""
+
+    def __init__(self, output_path=None, port=None, stall_ms=DEFAULT_STALL_MS, enabled=True, dump=True,
+                 host=DEFAULT_HOST):
+        self.enabled = enabled
+        # dump=False: hanya endpoint HTTP, tanpa file JSON saat keluar.
+        self.dump = dump and enabled
+        self.output_path = output_path or DEFAULT_OUTPUT
+        self.port = port
+        self.host = host
+        self.stall_ms = stall_ms
+        self._histograms = {}
+        self._handlers = []
+        self._stalls = collections.deque(maxlen=MAX_STALLS)
+        self._stall_counts = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._server = None
+        self.watchdog = None
+
+    def observe(self, family, label, seconds, error=False):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((family, label))
+            if histogram is None:
+                histogram = self._histograms[(family, label)] = Histogram()
+            histogram.observe(seconds, error)
+
+    @contextlib.contextmanager
+    def _timed(self, family, label):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(family, label, time.perf_counter() - start, error)
+
+    def timed(self, family, label):
+        """Context manager yang mencatat durasi ke histogram family{label}."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(family, label)
+
+    @contextlib.contextmanager
+    def _handler(self, name):
+        self._handlers.append(name)
+        try:
+            with self._timed("gui_handler", name):
+                yield
+        finally:
+            self._handlers.pop()
+
+    def handler(self, name):
+        """Menandai handler GUI yang sedang berjalan; hanya dipakai dari thread GUI."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._handler(name)
+
+    def current_handler(self):
+        handlers = list(self._handlers)
+        return "/".join(handlers) if handlers else "idle"
+
+    def record_stall(self, handler, seconds, started, frame=None):
+        self.observe("gui_stall", handler, seconds)
+        with self._lock:
+            self._stall_counts[handler] = self._stall_counts.get(handler, 0) + 1
+            self._stalls.append({
+                "handler": handler, "duration_ms": round(seconds * 1000.0, 1),
+                "at": round(started, 3), "frame": frame,
+            })
+
+    def start_watchdog(self, threshold_ms=None):
+        """Memulai watchdog dari thread GUI; pemanggil wajib memanggil beat() berkala."""
+        if not self.enabled or self.watchdog is not None:
+            return self.watchdog
+        self.watchdog = StallWatchdog(self, threshold_ms or self.stall_ms)
+        self.watchdog.start()
+        return self.watchdog
+
+    def to_dict(self):
+        with self._lock:
+            histograms = {}
+            for (family, label), histogram in sorted(self._histograms.items()):
+                histograms.setdefault(family, {})[label] = histogram.to_dict()
+            return {
+                "started": round(self._started, 3),
+                "uptime_s": round(time.time() - self._started, 3),
+                "stall_threshold_ms": self.stall_ms,
+                "histograms": histograms,
+                "stall_counts": dict(self._stall_counts),
+                "stalls": list(self._stalls),
+            }
+
+    def prometheus_text(self):
+        """Semua histogram dalam format eksposisi teks Prometheus 0.0.4."""
+        lines = []
+        errors = []
+        described = set()
+        with self._lock:
+            for (family, label), histogram in sorted(self._histograms.items()):
+                name = f"priinter_{family}_seconds"
+                if family not in described:
+                    described.add(family)
+                    lines.append(f"# TYPE {name} histogram")
+                key = "operation" if family.startswith("cups") else "handler"
+                labels = '{}="{}"'.format(key, label.replace("\\", "\\\\").replace('"', '\\"'))
+                running = 0
+                for index, count in enumerate(histogram.counts):
+                    running += count
+                    bound = "+Inf" if index == len(BUCKETS) else f"{BUCKETS[index]:g}"
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+                if family == "cups":
+                    errors.append(f"priinter_cups_errors_total{{{labels}}} {histogram.errors}")
+        if errors:
+            lines.append("# TYPE priinter_cups_errors_total counter")
+            lines.extend(errors)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=None):
+        """Menulis dump JSON; mengembalikan path-nya."""
+        if not self.enabled:
+            return None
+        path = path or self.output_path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        return path
+
+    def serve(self, port=None):
+        """Melayani /metrics dan /metrics.json di self.host (bawaan 127.0.0.1) dari thread latar."""
+        port = self.port if port is None else port
+        if not self.enabled or port is None or self._server is not None:
+            return self._server
+        metrics = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = metrics.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics.to_dict(), indent=1).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((self.host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    def close(self):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+_metrics = Metrics(enabled=False)
+
+
+def get_metrics():
+    """Metrik aktif; objek nonaktif (tanpa biaya berarti) jika tidak diminta."""
+    return _metrics
+
+
+def tracked(name):
+    """Dekorator: menandai fungsi sebagai handler GUI bernama name untuk watchdog."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _metrics.handler(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def parse_address(value):
+    """(host, port) dari "PORT" atau "HOST:PORT"; ValueError dengan pesan jelas jika tidak valid."""
+    host, sep, port = value.strip().rpartition(":")
+    host = host.strip("[]") if sep else DEFAULT_HOST
+    if not port.isdigit() or not 0 < int(port) < 65536 or (sep and not host):
+        raise ValueError(f"Alamat metrik tidak valid: {value!r} (harus PORT atau HOST:PORT, port 1-65535)")
+    return host, int(port)
+
+
+def _parse_stall_ms(value):
+    try:
+        stall_ms = int(value)
+    except (TypeError, ValueError):
+        stall_ms = -1
+    if stall_ms <= 0:
+        raise ValueError(f"Batas jeda tidak valid: {value!r} (harus bilangan bulat milidetik > 0)")
+    return stall_ms
+
+
+def configure_metrics(argv):
+    """Mengaktifkan metrik dari --metrics[=PATH], --metrics-port=[HOST:]PORT, --stall-threshold=MS.
+
+    Opsi-opsi itu dibuang dari argv agar tidak diteruskan ke Qt atau argparse.
+    Mengembalikan argv yang sudah dibersihkan; ValueError jika nilainya tidak
+    valid.
+    """
+    global _metrics
+    output_path = os.environ.get(ENV_VAR) or None
+    port = os.environ.get(PORT_ENV_VAR) or None
+    stall_ms = os.environ.get(STALL_ENV_VAR) or DEFAULT_STALL_MS
+    dump = output_path is not None
+    remaining = []
+    for arg in argv:
+        if arg == "--metrics":
+            dump = True
+        elif arg.startswith("--metrics="):
+            dump = True
+            output_path = arg.split("=", 1)[1]
+        elif arg.startswith("--metrics-port="):
+            port = arg.split("=", 1)[1]
+        elif arg.startswith("--stall-threshold="):
+            stall_ms = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+    if output_path == "1":
+        output_path = None
+    if dump or port is not None:
+        host, port = parse_address(port) if port is not None else (DEFAULT_HOST, None)
+        _metrics = Metrics(output_path, port, _parse_stall_ms(stall_ms), dump=dump, host=host)
+    return remaining
@@ -0,0 +1,162 @@
+"""Preset pencetakan: kumpulan nilai SettingsModel yang bisa diterapkan sekaligus.
+
+Preset disimpan di PresetStore (SQLite di direktori konfigurasi) yang
+terindeks per nama dan per model printer. Daftar di dialog hanya membaca nama
+preset; isi pengaturan dibaca saat sebuah preset dipilih.
+"""
+import json
+import time
+import sqlite3
+import threading
+
+from app_paths import config_dir
+from settings_model import settings_to_cups_options
+
+# Preset bawaan; dimasukkan ke PresetStore saat database pertama kali dibuat.
+BUILTIN_PRESETS = {
+    "Document - Fast": {"quality": "Draft"},
+    "Document - Standard Quality": {"quality": "Standard"},
+    "Document - High Quality": {"quality": "High"},
+    "Document - 2-Up": {"multipage": "2 Up"},
+    "Document - Fast Grayscale": {"quality": "Draft", "color_mode": "Black/Grayscale"},
+    "Document - Grayscale": {"color_mode": "Black/Grayscale"},
+}
+
+# Pengaturan tampilan dialog yang tidak ikut disimpan ke preset.
+NON_PRESET_KEYS = {"print_preview", "job_arranger", "quiet_mode"}
+
+SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    name TEXT PRIMARY KEY,
+    printer_model TEXT NOT NULL DEFAULT '',
+    builtin INTEGER NOT NULL DEFAULT 0,
+    settings TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS presets_by_model ON presets (printer_model, name);
+"""
+
+
+class PresetStore:
+    """Penyimpanan preset berbasis SQLite, dibuka saat pertama kali dipakai.
+
+    printer_model kosong berarti preset berlaku untuk semua printer. Setiap
+    perubahan berjalan dalam satu transaksi, sehingga file tidak pernah
+    setengah tertulis. Aman dipakai dari beberapa thread.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+        self._settings_cache = {}
+
+    def _db(self):
+        if self._conn is None:
+            path = self.path or f"{config_dir()}/presets.sqlite3"
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executescript(_SCHEMA)
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    now = time.time()
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO presets (name, builtin, settings, updated) VALUES (?, 1, ?, ?)",
+                        [(name, json.dumps(values), now) for name, values in BUILTIN_PRESETS.items()],
+                    )
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn = conn
+        return self._conn
+
+    def names(self, printer_model=None):
+        """Nama preset terurut (hanya membaca indeks); preset umum ikut disertakan."""
+        with self._lock:
+            db = self._db()
+            if printer_model:
+                rows = db.execute(
+                    "SELECT name FROM presets WHERE printer_model IN ('', ?) ORDER BY name", (printer_model,))
+            else:
+                rows = db.execute("SELECT name FROM presets ORDER BY name")
+            return [row[0] for row in rows]
+
+    def __contains__(self, name):
+        with self._lock:
+            return self._db().execute("SELECT 1 FROM presets WHERE name = ?", (name,)).fetchone() is not None
+
+    def get(self, name):
+        """Nilai pengaturan sebuah preset; KeyError jika tidak ada."""
+        with self._lock:
+            values = self._settings_cache.get(name)
+            if values is None:
+                row = self._db().execute("SELECT settings FROM presets WHERE name = ?", (name,)).fetchone()
+                if row is None:
+                    raise KeyError(name)
+                values = self._settings_cache[name] = json.loads(row[0])
+            return dict(values)
+
+    def is_builtin(self, name):
+        with self._lock:
+            row = self._db().execute("SELECT builtin FROM presets WHERE name = ?", (name,)).fetchone()
+            return bool(row and row[0])
+
+    def save(self, name, values, printer_model=""):
+        self.save_many([(name, values, printer_model)])
+
+    def save_many(self, presets):
+        """Menyimpan banyak preset (name, values, printer_model) dalam satu transaksi.
+
+        Dipakai untuk sinkronisasi dari config management; ribuan preset
+        tetap satu kali commit.
+        """
+        now = time.time()
+        rows = [(name, printer_model or "", json.dumps(values), now) for name, values, printer_model in presets]
+        with self._lock:
+            with self._db() as db:
+                db.executemany(
+                    "INSERT INTO presets (name, printer_model, settings, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET printer_model = excluded.printer_model, "
+                    "settings = excluded.settings, updated = excluded.updated",
+                    rows,
+                )
+            for row in rows:
+                self._settings_cache.pop(row[0], None)
+
+    def delete(self, name):
+        with self._lock:
+            with self._db() as db:
+                db.execute("DELETE FROM presets WHERE name = ?", (name,))
+            self._settings_cache.pop(name, None)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._settings_cache.clear()
+
+
+_default_store = None
+
+
+def get_preset_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = PresetStore()
+    return _default_store
+
+
+def settings_for_preset(values):
+    """Nilai SettingsModel yang layak disimpan sebagai preset."""
+    return {key: value for key, value in values.items() if key not in NON_PRESET_KEYS}
+
+
+def preset_settings(name, store=None):
+    """Nilai pengaturan sebuah preset; KeyError jika preset tidak dikenal."""
+    return (store or get_preset_store()).get(name)
+
+
+def preset_options(name, caps=None, store=None):
+    """Opsi CUPS yang diubah oleh sebuah preset."""
+    return settings_to_cups_options(preset_settings(name, store), caps)
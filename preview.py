@@ -0,0 +1,299 @@
+"""Pratinjau cetak langsung: tata letak halaman digambar di thread pekerja.
+
+Pratinjau disusun dari tiga lapisan yang di-cache terpisah:
+  1. halaman  - satu halaman logis (ukuran kertas, zoom/fit, rotasi, mirror, warna)
+  2. grid     - lembar kertas berisi N halaman (Multi-Page, orientasi)
+  3. overlay  - teks watermark di atas lembar
+Mengubah satu kontrol hanya menggambar ulang lapisan yang terpengaruh; sisanya
+diambil dari cache lalu dikomposisikan ulang.
+"""
+import re
+import time
+import threading
+import collections
+import concurrent.futures
+
+from PySide6.QtGui import QImage, QPainter, QColor, QFont, QTransform
+from PySide6.QtCore import Qt, QObject, Signal, QTimer, QRectF, QSize
+
+# Kunci SettingsModel yang memengaruhi pratinjau.
+PREVIEW_KEYS = (
+    "document_size", "orientation", "multipage", "zoom", "zoom_enabled", "fit_to_page",
+    "rotate_180", "mirror_image", "watermark", "color_mode",
+)
+
+_SIZE_RE = re.compile(r"\(([\d./ ]+?) x ([\d./ ]+?) (mm|in)\)")
+
+
+def _parse_length(text):
+    total = 0.0
+    for part in text.split():
+        if "/" in part:
+            numerator, denominator = part.split("/", 1)
+            total += float(numerator) / float(denominator)
+        else:
+            total += float(part)
+    return total
+
+
+def page_aspect(document_size):
+    """Rasio lebar/tinggi dari label ukuran kertas; A4 jika tidak bisa dibaca."""
+    match = _SIZE_RE.search(document_size or "")
+    if not match:
+        return 210.0 / 297.0
+    try:
+        width, height = _parse_length(match.group(1)), _parse_length(match.group(2))
+    except ValueError:
+        return 210.0 / 297.0
+    return width / height if height else 210.0 / 297.0
+
+
+def pages_per_sheet(multipage):
+    match = re.match(r"(\d+)\s*Up", multipage or "")
+    return int(match.group(1)) if match else 1
+
+
+class _LayerCache:
+    """LRU kecil untuk satu lapisan pratinjau."""
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self._items = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        image = self._items.get(key)
+        if image is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = render()
+        self._items[key] = image
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+        return image
+
+
+class PreviewComposer:
+    """Menggambar dan mengomposisikan lapisan pratinjau ke QImage (aman di thread pekerja)."""
+
+    def __init__(self, size=QSize(80, 80), device_pixel_ratio=1.0):
+        self.size = size
+        self.dpr = device_pixel_ratio
+        self.page_cache = _LayerCache()
+        self.grid_cache = _LayerCache()
+        self.overlay_cache = _LayerCache()
+
+    def _pixel_size(self):
+        return round(self.size.width() * self.dpr), round(self.size.height() * self.dpr)
+
+    def sheet_rect(self, params):
+        """Persegi lembar kertas di dalam area pratinjau (piksel fisik)."""
+        width, height = self._pixel_size()
+        aspect = page_aspect(params.get("document_size"))
+        if params.get("orientation") == "Landscape":
+            aspect = 1.0 / aspect
+        margin = 2.0 * self.dpr
+        box_w, box_h = width - 2 * margin, height - 2 * margin
+        sheet_w, sheet_h = (box_w, box_w / aspect) if box_w / aspect <= box_h else (box_h * aspect, box_h)
+        return QRectF((width - sheet_w) / 2, (height - sheet_h) / 2, sheet_w, sheet_h)
+
+    def render_page(self, params, cell_w, cell_h):
+        """Lapisan 1: satu halaman contoh (judul, baris teks, gambar)."""
+        aspect = page_aspect(params.get("document_size"))
+        page_h = max(1, round(cell_h))
+        page_w = max(1, round(min(cell_w, page_h * aspect)))
+        image = QImage(page_w, page_h, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.white)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        transform = QTransform()
+        transform.translate(page_w / 2, page_h / 2)
+        if params.get("rotate_180"):
+            transform.rotate(180)
+        if params.get("mirror_image"):
+            transform.scale(-1, 1)
+        if params.get("fit_to_page"):
+            scale = 1.08
+        elif params.get("zoom_enabled"):
+            scale = max(10, min(400, params.get("zoom", 100))) / 100.0
+        else:
+            scale = 1.0
+        transform.scale(scale, scale)
+        transform.translate(-page_w / 2, -page_h / 2)
+        painter.setTransform(transform)
+
+        grayscale = params.get("color_mode") == "Black/Grayscale"
+        margin = page_w * 0.1
+        content_w = page_w - 2 * margin
+        painter.fillRect(QRectF(margin, margin, content_w * 0.6, page_h * 0.05),
+                         QColor(40, 40, 40) if grayscale else QColor(30, 80, 160))
+        picture = QRectF(margin + content_w * 0.68, margin, content_w * 0.32, page_h * 0.16)
+        painter.fillRect(picture, QColor(150, 150, 150) if grayscale else QColor(230, 120, 40))
+        line_h = max(1.0, page_h * 0.018)
+        y = margin + page_h * 0.22
+        line = 0
+        while y < page_h - margin:
+            width = content_w * (0.55 if line % 5 == 4 else 1.0)
+            painter.fillRect(QRectF(margin, y, width, line_h), QColor(120, 120, 120))
+            y += line_h * 2.4
+            line += 1
+        painter.end()
+        return image
+
+    def render_grid(self, params, sheet):
+        """Lapisan 2: lembar kertas berisi 1, 2 atau 4 halaman."""
+        image = QImage(max(1, round(sheet.width())), max(1, round(sheet.height())), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.white)
+        count = pages_per_sheet(params.get("multipage"))
+        if count == 4:
+            columns, rows = 2, 2
+        elif count == 2:
+            columns, rows = (2, 1) if image.width() >= image.height() else (1, 2)
+        else:
+            columns, rows = 1, 1
+        cell_w, cell_h = image.width() / columns, image.height() / rows
+        page = self.page_cache.get_or_render(
+            (params.get("document_size"), params.get("rotate_180"), params.get("mirror_image"),
+             params.get("fit_to_page"), params.get("zoom_enabled"), params.get("zoom"),
+             params.get("color_mode"), round(cell_w), round(cell_h)),
+            lambda: self.render_page(params, cell_w - 2, cell_h - 2),
+        )
+        painter = QPainter(image)
+        for index in range(columns * rows):
+            col, row = index % columns, index // columns
+            x = col * cell_w + (cell_w - page.width()) / 2
+            y = row * cell_h + (cell_h - page.height()) / 2
+            painter.drawImage(round(x), round(y), page)
+        if columns * rows > 1:
+            painter.setPen(QColor(200, 200, 200))
+            for col in range(1, columns):
+                painter.drawLine(round(col * cell_w), 0, round(col * cell_w), image.height())
+            for row in range(1, rows):
+                painter.drawLine(0, round(row * cell_h), image.width(), round(row * cell_h))
+        painter.setPen(QColor(90, 90, 90))
+        painter.drawRect(0, 0, image.width() - 1, image.height() - 1)
+        painter.end()
+        return image
+
+    def render_overlay(self, text, sheet):
+        """Lapisan 3: watermark transparan, diagonal di tengah lembar."""
+        image = QImage(max(1, round(sheet.width())), max(1, round(sheet.height())), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        font = QFont()
+        font.setBold(True)
+        font.setPixelSize(max(6, round(image.width() / max(4, len(text)) * 1.2)))
+        painter.setFont(font)
+        painter.setPen(QColor(200, 0, 0, 110))
+        painter.translate(image.width() / 2, image.height() / 2)
+        painter.rotate(-35)
+        painter.drawText(QRectF(-image.width(), -image.height() / 2, 2 * image.width(), image.height()),
+                         Qt.AlignCenter, text)
+        painter.end()
+        return image
+
+    def compose(self, params):
+        width, height = self._pixel_size()
+        sheet = self.sheet_rect(params)
+        grid = self.grid_cache.get_or_render(
+            tuple(params.get(key) for key in PREVIEW_KEYS if key != "watermark") + (round(sheet.width()), round(sheet.height())),
+            lambda: self.render_grid(params, sheet),
+        )
+        watermark = params.get("watermark")
+        overlay = None
+        if watermark and watermark not in ("None", "Add/Delete..."):
+            overlay = self.overlay_cache.get_or_render(
+                (watermark, round(sheet.width()), round(sheet.height())),
+                lambda: self.render_overlay(watermark, sheet),
+            )
+        result = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        result.fill(Qt.transparent)
+        painter = QPainter(result)
+        painter.drawImage(round(sheet.x()), round(sheet.y()), grid)
+        if overlay is not None:
+            painter.drawImage(round(sheet.x()), round(sheet.y()), overlay)
+        painter.end()
+        result.setDevicePixelRatio(self.dpr)
+        return result
+
+    def stats(self):
+        return {name: {"hits": cache.hits, "misses": cache.misses}
+                for name, cache in (("page", self.page_cache), ("grid", self.grid_cache), ("overlay", self.overlay_cache))}
+
+
+class PreviewRenderer(QObject):
+    """Men-debounce perubahan pengaturan dan merender pratinjau di thread pekerja.
+
+    Hanya satu render berjalan pada satu waktu; perubahan yang datang selama
+    render digabung dan dirender sekali setelahnya.
+    """
+    preview_ready = Signal(QImage)
+
+    def __init__(self, settings, size=QSize(80, 80), device_pixel_ratio=1.0, debounce_ms=30, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        self.composer = PreviewComposer(size, device_pixel_ratio)
+        self.last_render_ms = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._busy = False
+        self._pending = None
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.render_now)
+        settings.subscribe(self._on_setting_changed)
+
+    def _on_setting_changed(self, key, _value):
+        if key in PREVIEW_KEYS:
+            self._debounce.start()
+
+    def schedule(self):
+        self._debounce.start()
+
+    def render_now(self):
+        params = {key: self.settings.get(key) for key in PREVIEW_KEYS}
+        with self._lock:
+            if self._busy:
+                self._pending = params
+                return
+            self._busy = True
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self._executor.submit(self._render, params)
+
+    def _render(self, params):
+        try:
+            while params is not None:
+                start = time.perf_counter()
+                image = self.composer.compose(params)
+                self.last_render_ms = (time.perf_counter() - start) * 1000.0
+                self.preview_ready.emit(image)
+                with self._lock:
+                    params, self._pending = self._pending, None
+                    if params is None:
+                        self._busy = False
+        except Exception as e:
+            print(f"Render pratinjau gagal: {e}")
+        finally:
+            if params is not None:
+                # Render gagal di tengah jalan: lepaskan flag agar perubahan berikutnya tetap dirender.
+                with self._lock:
+                    self._busy = False
+                    self._pending = None
+
+    def stop(self):
+        """Menghentikan thread render; thread dibuat lagi saat render berikutnya (mode resident)."""
+        self._debounce.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        self.settings.unsubscribe(self._on_setting_changed)
+        self.stop()
@@ -0,0 +1,59 @@
+"""Mengirim dokumen ke CUPS sebagai aliran chunk (createJob/startDocument/writeRequestData).
+
+Dokumen tidak pernah disalin utuh ke memori atau file sementara; setiap
+chunk dari generator langsung ditulis ke koneksi IPP.
+"""
+import os
+
+import cups
+
+from stamping import stamp_pdf_stream, needs_stamping
+
+CHUNK_SIZE = 1 << 20
+
+
+def submit_stream(conn, printer_name, title, chunks, document_format=None, options=None, on_chunk=None):
+    """Membuat job dan mengalirkan chunk byte sebagai satu dokumen; mengembalikan job-id.
+
+    on_chunk(jumlah_byte) dipanggil setelah setiap chunk terkirim; jika ia
+    (atau generator chunk) melempar exception di tengah jalan, job dibatalkan
+    agar tidak tercetak setengah.
+    """
+    job_id = conn.createJob(printer_name, title, options or {})
+    try:
+        conn.startDocument(printer_name, job_id, title, document_format or cups.CUPS_FORMAT_AUTO, 1)
+        for chunk in chunks:
+            if chunk:
+                conn.writeRequestData(chunk, len(chunk))
+                if on_chunk is not None:
+                    on_chunk(len(chunk))
+    except BaseException:
+        try:
+            conn.finishDocument(printer_name)
+        finally:
+            conn.cancelJob(job_id)
+        raise
+    status = conn.finishDocument(printer_name)
+    if status not in (cups.IPP_OK, None):
+        raise cups.IPPError(status, f"Failed to send {title} to {printer_name}")
+    return job_id
+
+
+def print_file(conn, printer_name, path, options=None, watermark=None, header_footer=False, title=None,
+               on_chunk=None, chunk_size=CHUNK_SIZE):
+    """Mencetak satu file; PDF dicap watermark/header-footer saat dialirkan bila diminta."""
+    title = title or os.path.basename(path)
+    if needs_stamping(watermark, header_footer):
+        chunks = stamp_pdf_stream(path, watermark=watermark, header_footer=header_footer)
+        # Chunk pertama memicu validasi PDF sebelum job dibuat.
+        first = next(chunks, b"")
+        return submit_stream(conn, printer_name, title, _prepend(first, chunks), "application/pdf", options,
+                             on_chunk)
+    with open(path, "rb") as handle:
+        return submit_stream(conn, printer_name, title, iter(lambda: handle.read(chunk_size), b""), None,
+                             options, on_chunk)
+
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
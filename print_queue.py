@@ -0,0 +1,274 @@
+"""Mengirim banyak dokumen ke satu atau beberapa antrean CUPS sekaligus.
+
+Setiap file dialirkan per chunk lewat print_jobs.print_file
+(createJob/startDocument/writeRequestData), jadi memori tidak tumbuh dengan
+ukuran maupun jumlah dokumen. Jumlah unggahan paralel dibatasi max_workers,
+dan per antrean dibatasi per_printer agar satu printer lambat tidak
+memonopoli pekerja. Kemajuan (file, byte, throughput) dibaca lewat
+PrintProgress.snapshot() dari thread mana pun.
+"""
+import os
+import glob
+import time
+import threading
+import collections
+import concurrent.futures
+
+from cups_backend import CupsExecutor, ConnectionPool
+from print_jobs import print_file
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_PRINTER = 2
+# Batas waktu satu unggahan utuh (detik), terpisah dari batas per panggilan CUPS.
+UPLOAD_TIMEOUT = 600.0
+
+
+class PrintCanceled(Exception):
+    """Pengiriman dihentikan lewat cancel_event; job yang sedang diunggah dibatalkan."""
+
+
+def expand_documents(patterns):
+    """Daftar file dari path, direktori (rekursif, urut nama) atau glob, tanpa duplikat.
+
+    Path biasa yang tidak ada dibiarkan agar kegagalannya dilaporkan per file;
+    glob yang tidak cocok dengan file apa pun adalah ValueError.
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = []
+            for root, dirs, files in os.walk(pattern):
+                dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+                found.extend(os.path.join(root, name) for name in sorted(files) if not name.startswith("."))
+        elif os.path.exists(pattern) or not glob.has_magic(pattern):
+            found = [pattern]
+        else:
+            found = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+            if not found:
+                raise ValueError(f"Tidak ada file yang cocok dengan {pattern!r}")
+        for path in found:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+
+class PrintResult:
+    """Hasil pengiriman satu file ke satu printer."""
+
+    __slots__ = ("printer", "path", "ok", "job_id", "error", "sent", "elapsed", "skipped")
+
+    def __init__(self, printer, path, ok, job_id=None, error=None, sent=0, elapsed=0.0, skipped=False):
+        self.printer = printer
+        self.path = path
+        self.ok = ok
+        self.job_id = job_id
+        self.error = error
+        self.sent = sent
+        self.elapsed = elapsed
+        # True: dokumen tidak dikirim sama sekali karena dibatalkan.
+        self.skipped = skipped
+
+    def to_dict(self):
+        record = {"printer": self.printer, "file": self.path, "ok": self.ok}
+        if self.ok:
+            record["job_id"] = self.job_id
+        else:
+            record["error"] = str(self.error)
+        record["bytes"] = self.sent
+        record["elapsed"] = round(self.elapsed, 4)
+        record["skipped"] = self.skipped
+        return record
+
+    def __repr__(self):
+        status = f"job={self.job_id}" if self.ok else ("skipped" if self.skipped else f"error={self.error!r}")
+        return f"PrintResult({self.printer!r}, {self.path!r}, {status})"
+
+
+class PrintProgress:
+    """Penghitung kemajuan yang diperbarui pekerja dan dibaca thread lain (mis. timer GUI)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files_total = 0
+        self.bytes_total = 0
+        self.files_done = 0
+        self.files_failed = 0
+        self.files_skipped = 0
+        self.bytes_sent = 0
+        self.active = 0
+        self.started = None
+        self.finished = None
+
+    def begin(self, files_total, bytes_total):
+        with self._lock:
+            self.files_total = files_total
+            self.bytes_total = bytes_total
+            self.started = time.perf_counter()
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes_sent += count
+
+    def job_started(self):
+        with self._lock:
+            self.active += 1
+
+    def job_finished(self, ok):
+        with self._lock:
+            self.active -= 1
+            if ok:
+                self.files_done += 1
+            else:
+                self.files_failed += 1
+
+    def job_skipped(self):
+        with self._lock:
+            self.files_skipped += 1
+
+    def finish(self):
+        with self._lock:
+            self.finished = time.perf_counter()
+
+    def snapshot(self):
+        with self._lock:
+            end = self.finished or time.perf_counter()
+            elapsed = end - self.started if self.started is not None else 0.0
+            return {
+                "files_total": self.files_total,
+                "files_done": self.files_done,
+                "files_failed": self.files_failed,
+                "files_skipped": self.files_skipped,
+                "active": self.active,
+                "bytes_total": self.bytes_total,
+                "bytes_sent": self.bytes_sent,
+                "elapsed": elapsed,
+                "throughput": self.bytes_sent / elapsed if elapsed > 0 else 0.0,
+                "finished": self.finished is not None,
+            }
+
+
+def describe_progress(snapshot):
+    """Ringkasan satu baris, mis. "12/300 file(s), 45.1 MB of 800.0 MB, 3.2 MB/s"."""
+    finished = snapshot["files_done"] + snapshot["files_failed"]
+    text = (f"{finished}/{snapshot['files_total']} file(s), "
+            f"{format_bytes(snapshot['bytes_sent'])} of {format_bytes(snapshot['bytes_total'])}, "
+            f"{format_bytes(snapshot['throughput'])}/s")
+    if snapshot["files_failed"]:
+        text += f", {snapshot['files_failed']} failed"
+    if snapshot["files_skipped"]:
+        text += f", {snapshot['files_skipped']} skipped"
+    return text
+
+
+def submit_documents(paths, printers, options=None, watermark=None, header_footer=False,
+                     max_workers=DEFAULT_WORKERS, per_printer=DEFAULT_PER_PRINTER, timeout=UPLOAD_TIMEOUT,
+                     on_result=None, progress=None, cancel_event=None, executor=None):
+    """Mengirim setiap file ke setiap printer dan mengembalikan daftar PrintResult.
+
+    Antrean printer dilayani bergiliran; paling banyak max_workers unggahan
+    berjalan bersamaan dan paling banyak per_printer per printer. timeout
+    berlaku per dokumen (0 = tanpa batas); unggahan yang melewatinya berhenti
+    di chunk berikutnya dan job-nya dibatalkan. on_result(PrintResult)
+    dipanggil dari thread pemanggil setiap kali satu dokumen selesai.
+    cancel_event (threading.Event) menghentikan pengiriman baru dan
+    membatalkan job yang sedang diunggah; dokumen yang belum dikirim
+    dilaporkan dengan skipped=True.
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        executor = CupsExecutor(pool=ConnectionPool(max_idle=max_workers),
+                                max_workers=max_workers, timeout=timeout)
+    if progress is None:
+        progress = PrintProgress()
+    paths = list(paths)
+    printers = list(dict.fromkeys(printers))
+    progress.begin(len(paths) * len(printers), sum(map(_file_size, paths)) * len(printers))
+    queues = {printer: collections.deque(paths) for printer in printers}
+    ready = collections.deque(printer for printer in printers if queues[printer])
+    active = dict.fromkeys(printers, 0)
+    pending = {}
+    results = []
+
+    def report(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    def print_document(conn, printer, path, sent, abandoned):
+        def on_chunk(count):
+            sent[0] += count
+            progress.add_bytes(count)
+            if cancel_event is not None and cancel_event.is_set():
+                raise PrintCanceled("Pengiriman dibatalkan")
+            if abandoned.is_set():
+                # Future sudah gagal karena timeout: jangan terus mengunggah di luar slot printer.
+                raise PrintCanceled("Batas waktu unggah habis")
+        return print_file(conn, printer, path, options, watermark=watermark,
+                          header_footer=header_footer, on_chunk=on_chunk)
+
+    def fill():
+        # Bergiliran antar printer; printer yang slotnya penuh dilewati.
+        skipped = 0
+        while ready and len(pending) < max_workers and skipped < len(ready):
+            printer = ready[0]
+            ready.rotate(-1)
+            if active[printer] >= per_printer:
+                skipped += 1
+                continue
+            skipped = 0
+            path = queues[printer].popleft()
+            if not queues[printer]:
+                ready.remove(printer)
+            active[printer] += 1
+            progress.job_started()
+            sent = [0]
+            abandoned = threading.Event()
+            future = executor.submit(print_document, printer, path, sent, abandoned)
+            future.add_done_callback(lambda _future, event=abandoned: event.set())
+            pending[future] = (printer, path, sent, time.perf_counter())
+
+    try:
+        fill()
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                printer, path, sent, started = pending.pop(future)
+                active[printer] -= 1
+                error = future.exception()
+                progress.job_finished(error is None)
+                result = PrintResult(printer, path, error is None,
+                                     job_id=None if error is not None else future.result(),
+                                     error=error, sent=sent[0], elapsed=time.perf_counter() - started)
+                report(result)
+            if cancel_event is None or not cancel_event.is_set():
+                fill()
+        # Dibatalkan: dokumen yang belum sempat dikirim tetap mendapat hasil.
+        for printer in printers:
+            for path in queues[printer]:
+                progress.job_skipped()
+                report(PrintResult(printer, path, False, error=PrintCanceled("Dibatalkan sebelum dikirim"),
+                                   skipped=True))
+            queues[printer].clear()
+    finally:
+        progress.finish()
+        if owns_executor:
+            executor.shutdown(wait=False)
+    return results
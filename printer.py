@@ -1,570 +1,304 @@
 #!/usr/bin/env python3
+"""Printing Preferences untuk Linux.
+
+Tanpa subperintah, printer.py membuka dialog Qt (printer_gui.py). Subperintah
+apply, query, batch dan print berjalan tanpa Qt, sehingga bisa dipakai skrip
+provisioning di mesin tanpa display:
+
+    printer.py apply --preset "Document - Fast Grayscale" --printer P1 --printer P2
+    printer.py query --printer P1 --json
+    printer.py batch jobs.jsonl
+    printer.py print --printer P1 --watermark DRAFT --header-footer report.pdf
+    printer.py print --printer P1 --printer P2 --workers 8 'scans/**/*.pdf'
+
+--profile-startup[=PATH] (atau PRINTER_PROFILE_STARTUP=PATH) menulis profil
+waktu startup dialog; lihat profiling.py. --metrics[=PATH] dan
+--metrics-port=[HOST:]PORT mencatat latensi panggilan CUPS serta jeda event
+loop GUI (dump JSON / endpoint Prometheus); lihat metrics.py.
+
+Mode GUI menerima --printer NAMA dan --tab main|more-options|maintenance.
+Dengan --resident proses tetap hidup setelah dialog ditutup, dan peluncuran
+berikutnya hanya meneruskan argumennya ke proses itu (lihat single_instance.py):
+
+    printer.py --resident --hidden     # mis. dari autostart sesi
+    printer.py --printer P1 --tab maintenance
+    printer.py --stop-resident
+"""
 import sys
-import cups
-from PySide6.QtWidgets import (
-    QApplication, QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
-    QGridLayout, QFormLayout, QLabel, QComboBox, QRadioButton, QButtonGroup,
-    QCheckBox, QSpinBox, QPushButton, QListWidget, QSizePolicy,
-    QDialogButtonBox, QGroupBox, QSpacerItem, QStyle, QToolButton, QFrame,
-    QMessageBox
-)
-from PySide6.QtGui import QPixmap, QIcon, QPainter, QFont
-from PySide6.QtCore import Qt, QSize, QRect
-
-def get_icon(primary_name, secondary_name=None, fallback_style_pixmap_enum=None):
-    """
-    Helper function untuk memuat ikon dengan fallback.
-    1. Coba primary_name dari tema.
-    2. Jika gagal & secondary_name ada, coba secondary_name dari tema.
-    3. Jika masih gagal & fallback_style_pixmap_enum ada, gunakan ikon standar QStyle.
-    Mengembalikan QIcon object (bisa jadi QIcon kosong jika semua gagal).
-    """
-    icon = QIcon.fromTheme(primary_name)
-    if icon.isNull() and secondary_name:
-        icon = QIcon.fromTheme(secondary_name)
-    if icon.isNull() and fallback_style_pixmap_enum is not None:
-        app_instance = QApplication.instance()
-        if app_instance:
+import json
+import argparse
+
+from profiling import configure_profiler, get_profiler
+from metrics import configure_metrics, get_metrics
+
+HEADLESS_COMMANDS = ("apply", "query", "batch", "print")
+
+
+def _parse_option_pairs(pairs):
+    options = {}
+    for pair in pairs or ():
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Opsi harus berbentuk nama=nilai: {pair!r}")
+        options[name] = value
+    return options
+
+
+def _job_options(preset=None, options=None):
+    from presets import preset_options
+    merged = preset_options(preset) if preset else {}
+    merged.update(options or {})
+    if not merged:
+        raise ValueError("Tidak ada opsi: berikan --preset dan/atau --option")
+    return merged
+
+
+def query_printer(conn, printer_name):
+    """Default printer saat ini untuk semua opsi yang dikenal dialog."""
+    from settings_model import MAPPED_OPTION_NAMES, read_option_defaults
+    return read_option_defaults(conn, printer_name, MAPPED_OPTION_NAMES)
+
+
+def run_batch_job(conn, job):
+    """Menjalankan satu job batch ({"op": "apply"|"query", ...}) dan mengembalikan hasilnya."""
+    from settings_model import commit_option_defaults
+    op = job.get("op", "apply")
+    printer_name = job.get("printer")
+    if not printer_name:
+        raise ValueError("Job tanpa 'printer'")
+    if op == "query":
+        return {"printer": printer_name, "ok": True, "defaults": query_printer(conn, printer_name)}
+    if op == "apply":
+        options = _job_options(job.get("preset"), job.get("options"))
+        changes = commit_option_defaults(conn, printer_name, options)
+        return {"printer": printer_name, "ok": True, "changes": changes}
+    raise ValueError(f"Operasi tidak dikenal: {op!r}")
+
+
+def _emit(record, as_json, out):
+    if as_json:
+        out.write(json.dumps(record) + "\n")
+        return
+    status = "OK" if record.get("ok") else "FAILED"
+    details = record.get("error") or record.get("changes") or record.get("defaults") or ""
+    if not details and "job_id" in record:
+        details = f"{record.get('file', '')} -> job {record['job_id']}"
+    if isinstance(details, dict):
+        details = ", ".join(f"{k}={v}" for k, v in details.items()) or "no changes"
+    label = record.get("printer") or (f"line {record['line']}" if "line" in record else "?")
+    out.write(f"{label}: {status} {details}\n")
+
+
+def cmd_apply(args, out):
+    from fleet import apply_options_to_printers
+    options = _job_options(args.preset, _parse_option_pairs(args.option))
+    failed = 0
+    for result in apply_options_to_printers(args.printer, options, max_workers=args.workers,
+                                            rate=args.rate, retries=args.retries, timeout=args.timeout):
+        failed += not result.ok
+        _emit(result.to_dict(), args.json, out)
+    return 1 if failed else 0
+
+
+def cmd_query(args, out):
+    from cups_backend import CupsExecutor
+    executor = CupsExecutor(max_workers=1, timeout=args.timeout)
+    failed = 0
+    try:
+        for printer_name in args.printer:
             try:
-                standard_icon = app_instance.style().standardIcon(fallback_style_pixmap_enum)
-                if not standard_icon.isNull():
-                    icon = standard_icon
+                record = {"printer": printer_name, "ok": True,
+                          "defaults": executor.run(query_printer, printer_name)}
             except Exception as e:
-                print(f"Error saat memuat ikon QStyle fallback: {e}")
-    if icon.isNull():
-        return QIcon()
-    return icon
-
-def create_placeholder_icon_with_text(text_lines, icon_size=QSize(48, 48), background_color=Qt.lightGray, border_color=Qt.darkGray):
-    """Membuat QIcon placeholder dengan teks di dalamnya."""
-    pixmap = QPixmap(icon_size)
-    pixmap.fill(background_color)
-    painter = QPainter(pixmap)
-    
-    pen = painter.pen()
-    pen.setColor(border_color)
-    pen.setWidth(1)
-    painter.setPen(pen)
-    painter.drawRect(0, 0, icon_size.width() -1, icon_size.height() -1)
-
-    font_size = 9
-    if isinstance(text_lines, str): 
-        text_lines = [text_lines]
-
-    if len(text_lines) == 1:
-        font_size = 10
-    elif len(text_lines) > 2:
-        font_size = 7
-        
-    font = painter.font()
-    font.setPointSize(font_size)
-    painter.setFont(font)
-    pen.setColor(Qt.black)
-    painter.setPen(pen)
-
-    num_lines = len(text_lines)
-    padding = 2 
-    total_text_height = (font_size + padding) * num_lines - padding
-    start_y = (icon_size.height() - total_text_height) // 2
-    
-    for i, line in enumerate(text_lines):
-        line_y = start_y + i * (font_size + padding)
-        rect_line = QRect(0, line_y, icon_size.width(), font_size + padding)
-        painter.drawText(rect_line, Qt.AlignCenter | Qt.TextDontClip, line)
-        
-    painter.end()
-    return QIcon(pixmap)
-
-class LinuxPrinterPreferencesDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Printing Preferences (Linux Style with Fallback Icons)")
-        self.setMinimumSize(750, 600) 
-
-        main_dialog_layout = QVBoxLayout(self)
-        self.tab_widget = QTabWidget()
-        self.tab_main = QWidget()
-        self.tab_more_options = QWidget()
-        self.tab_maintenance = QWidget()
-
-        self.tab_widget.addTab(self.tab_main, "Main")
-        self.tab_widget.addTab(self.tab_more_options, "More Options")
-        self.tab_widget.addTab(self.tab_maintenance, "Maintenance")
-
-        self.setup_main_tab()
-        self.setup_more_options_tab()
-        self.setup_maintenance_tab()
-
-        main_dialog_layout.addWidget(self.tab_widget)
-
-        bottom_button_layout = QHBoxLayout()
-        help_icon = get_icon("help-contents", "help-faq", QStyle.SP_DialogHelpButton)
-        self.help_button = QPushButton(help_icon, "Help")
-
-        self.dialog_button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        self.dialog_button_box.accepted.connect(self.accept)
-        self.dialog_button_box.rejected.connect(self.reject)
-
-        bottom_button_layout.addStretch(1)
-        bottom_button_layout.addWidget(self.help_button)
-        bottom_button_layout.addWidget(self.dialog_button_box)
-        main_dialog_layout.addLayout(bottom_button_layout)
-
-        self.conn = cups.Connection()
-        self.printer_name = self.get_default_printer()
-
-        self.help_button.clicked.connect(self.show_help)
-        self.dialog_button_box.accepted.connect(self.apply_settings)
-        self.dialog_button_box.rejected.connect(self.reject)
-
-    def get_default_printer(self):
+                failed += 1
+                record = {"printer": printer_name, "ok": False, "error": str(e)}
+            _emit(record, args.json, out)
+    finally:
+        executor.shutdown()
+    return 1 if failed else 0
+
+
+def cmd_batch(args, out):
+    """Memproses file JSON-lines berisi banyak job dengan satu koneksi CUPS."""
+    from cups_backend import ConnectionPool
+    pool = ConnectionPool(max_idle=1)
+    conn = None
+    source = None
+    failed = 0
+    try:
+        source = sys.stdin if args.file == "-" else open(args.file, "r", encoding="utf-8")
+        conn = pool.acquire()
+        for line_number, line in enumerate(source, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            job = None
+            try:
+                job = json.loads(line)
+                record = run_batch_job(conn, job)
+            except Exception as e:
+                failed += 1
+                record = {"line": line_number, "ok": False, "error": str(e)}
+                if isinstance(job, dict) and job.get("printer"):
+                    record["printer"] = job["printer"]
+            _emit(record, args.json, out)
+    except (OSError, RuntimeError) as e:
+        # File batch tidak terbaca atau server CUPS tidak terjangkau.
+        failed += 1
+        _emit({"ok": False, "error": str(e)}, args.json, out)
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        pool.release(conn)
+        pool.close()
+    return 1 if failed else 0
+
+
+def cmd_print(args, out):
+    """Mencetak file, direktori atau glob ke satu/beberapa printer secara paralel.
+
+    PDF dicap watermark/header-footer secara streaming bila diminta. Hasil
+    tiap file ditulis begitu selesai; ringkasan throughput ke stderr.
+    """
+    from print_queue import expand_documents, submit_documents, describe_progress, PrintProgress
+    options = _parse_option_pairs(args.option)
+    if args.preset:
+        from presets import preset_options
+        options = dict(preset_options(args.preset), **options)
+    paths = expand_documents(args.file)
+    if not paths:
+        raise ValueError("Tidak ada file untuk dicetak")
+    failed = 0
+
+    def on_result(result):
+        nonlocal failed
+        failed += not result.ok
+        _emit(result.to_dict(), args.json, out)
+        out.flush()
+
+    progress = PrintProgress()
+    submit_documents(paths, args.printer, options, watermark=args.watermark, header_footer=args.header_footer,
+                     max_workers=args.workers, per_printer=args.per_printer, timeout=args.upload_timeout,
+                     on_result=on_result, progress=progress)
+    print(describe_progress(progress.snapshot()), file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _add_common_options(parser, defaults=True):
+    # Subperintah memakai SUPPRESS agar tidak menimpa nilai yang diberikan sebelum subperintah.
+    parser.add_argument("--json", action="store_true", default=False if defaults else argparse.SUPPRESS,
+                        help="output satu objek JSON per baris")
+    parser.add_argument("--timeout", type=float, default=30.0 if defaults else argparse.SUPPRESS,
+                        help="batas waktu per panggilan CUPS (detik)")
+
+
+def build_parser():
+    from print_queue import UPLOAD_TIMEOUT
+    parser = argparse.ArgumentParser(prog="printer.py", description="Printing Preferences (headless mode)")
+    _add_common_options(parser)
+    # --json/--timeout boleh ditulis sebelum maupun sesudah subperintah.
+    common = argparse.ArgumentParser(add_help=False)
+    _add_common_options(common, defaults=False)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    apply_parser = subparsers.add_parser("apply", parents=[common],
+                                         help="menerapkan preset/opsi sebagai default printer")
+    apply_parser.add_argument("--printer", action="append", required=True, help="nama printer (boleh berulang)")
+    apply_parser.add_argument("--preset", help="nama preset, mis. 'Document - Fast Grayscale'")
+    apply_parser.add_argument("--option", action="append", metavar="NAME=VALUE", help="opsi CUPS tambahan")
+    apply_parser.add_argument("--workers", type=int, default=16)
+    apply_parser.add_argument("--rate", type=float, default=None, help="maks. printer per detik")
+    apply_parser.add_argument("--retries", type=int, default=2)
+    apply_parser.set_defaults(handler=cmd_apply)
+
+    query_parser = subparsers.add_parser("query", parents=[common], help="membaca default printer")
+    query_parser.add_argument("--printer", action="append", required=True)
+    query_parser.set_defaults(handler=cmd_query)
+
+    batch_parser = subparsers.add_parser("batch", parents=[common],
+                                         help="memproses file JSON-lines ('-' untuk stdin)")
+    batch_parser.add_argument("file")
+    batch_parser.set_defaults(handler=cmd_batch)
+
+    print_parser = subparsers.add_parser("print", parents=[common],
+                                         help="mencetak file (PDF bisa diberi watermark/header-footer)")
+    print_parser.add_argument("--printer", action="append", required=True, help="nama printer (boleh berulang)")
+    print_parser.add_argument("--workers", type=int, default=4, help="maks. unggahan paralel")
+    print_parser.add_argument("--per-printer", type=int, default=2, help="maks. unggahan paralel per printer")
+    print_parser.add_argument("--upload-timeout", type=float, default=UPLOAD_TIMEOUT,
+                              help="batas waktu satu unggahan dokumen (detik, 0 = tanpa batas)")
+    print_parser.add_argument("--preset", help="opsi job diambil dari preset")
+    print_parser.add_argument("--option", action="append", metavar="NAME=VALUE", help="opsi job CUPS")
+    print_parser.add_argument("--watermark", help="teks watermark, mis. CONFIDENTIAL")
+    print_parser.add_argument("--header-footer", action="store_true", help="nama pengguna/tanggal dan nomor halaman")
+    print_parser.add_argument("file", nargs="+", help="file, direktori atau glob (mis. 'scans/*.pdf')")
+    print_parser.set_defaults(handler=cmd_print)
+    return parser
+
+
+def parse_gui_args(argv):
+    """Memisahkan opsi GUI milik aplikasi dari argumen yang diteruskan ke Qt."""
+    parser = argparse.ArgumentParser(prog="printer.py", add_help=False)
+    parser.add_argument("--printer")
+    parser.add_argument("--tab", choices=("main", "more-options", "maintenance"))
+    parser.add_argument("--resident", action="store_true")
+    parser.add_argument("--hidden", action="store_true")
+    parser.add_argument("--stop-resident", action="store_true")
+    args, rest = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + rest
+
+
+def is_headless(argv):
+    """True jika argumen memilih subperintah headless (opsi global boleh mendahuluinya)."""
+    args = list(argv[1:])
+    while args and args[0].startswith("--"):
+        option = args.pop(0)
+        if option == "--timeout" and args:
+            args.pop(0)
+    return bool(args) and args[0] in HEADLESS_COMMANDS
+
+
+def main(argv=None):
+    try:
+        argv = configure_metrics(configure_profiler(sys.argv if argv is None else argv))
+    except ValueError as e:
+        print(f"printer.py: {e}", file=sys.stderr)
+        return 2
+    if is_headless(argv):
+        args = build_parser().parse_args(argv[1:])
         try:
-            return self.conn.getDefault()
-        except Exception as e:
-            print("No default printer found:", e)
-            return None
-
-    def show_help(self):
-        QMessageBox.information(self, "Help", "This dialog allows you to configure printer settings.")
-
-    def apply_settings(self):
-        # Contoh: Terapkan pengaturan ke printer
-        # Anda bisa mengambil nilai dari widget dan mengirim ke printer di sini
-        QMessageBox.information(self, "Apply", "Settings applied to printer (dummy).")
-        self.accept()
-
-    def _create_left_panel_content(self, parent_layout, include_ink_levels=True):
-        left_column_layout = QVBoxLayout()
-        presets_groupbox = QGroupBox("Printing Presets")
-        presets_layout = QVBoxLayout()
-        presets_list = QListWidget()
-        presets_list.addItems([
-            "Document - Fast", "Document - Standard Quality", "Document - High Quality",
-            "Document - 2-Up", "Document - Fast Grayscale", "Document - Grayscale"
-        ])
-        add_remove_icon = get_icon("list-add", "document-new", QStyle.SP_FileDialogNewFolder)
-        add_remove_presets_button = QPushButton(add_remove_icon, "Add/Remove Presets...")
-        presets_layout.addWidget(presets_list)
-        presets_layout.addWidget(add_remove_presets_button)
-        presets_groupbox.setLayout(presets_layout)
-        left_column_layout.addWidget(presets_groupbox)
-
-        preview_layout = QHBoxLayout()
-        doc_preview_label = QLabel()
-        doc_icon = get_icon("text-x-generic", "document-new", QStyle.SP_FileIcon)
-        if not doc_icon.isNull():
-            doc_pixmap = doc_icon.pixmap(QSize(80, 80))
-            if not doc_pixmap.isNull():
-                doc_preview_label.setPixmap(doc_pixmap)
-            else:
-                doc_preview_label.setText("📄\n(Gagal Pixmap Dok)")
-        else:
-            doc_preview_label.setText("📄\n(Gagal Ikon Dok)")
-        doc_preview_label.setFixedSize(100, 100)
-        doc_preview_label.setAlignment(Qt.AlignCenter)
-        doc_preview_label.setStyleSheet("border: 1px solid gray;")
-
-        printer_preview_label = QLabel()
-        printer_icon = get_icon("printer", "printer-printing", QStyle.SP_DriveHDIcon)
-        if not printer_icon.isNull():
-            printer_pixmap = printer_icon.pixmap(QSize(80, 80))
-            if not printer_pixmap.isNull():
-                printer_preview_label.setPixmap(printer_pixmap)
-            else:
-                printer_preview_label.setText("🖨️\n(Gagal Pixmap Printer)")
-        else:
-            printer_preview_label.setText("🖨️\n(Gagal Ikon Printer)")
-        printer_preview_label.setFixedSize(100, 100)
-        printer_preview_label.setAlignment(Qt.AlignCenter)
-        printer_preview_label.setStyleSheet("border: 1px solid gray;")
-
-        preview_layout.addWidget(doc_preview_label)
-        preview_layout.addWidget(printer_preview_label)
-        left_column_layout.addLayout(preview_layout)
-        left_column_layout.addStretch(1)
-
-        reset_defaults_icon = get_icon("edit-undo", "document-revert", QStyle.SP_ArrowLeft)
-        reset_defaults_button = QPushButton(reset_defaults_icon,"Reset Defaults")
-        left_column_layout.addWidget(reset_defaults_button)
-
-        if include_ink_levels:
-            ink_icon = get_icon("media-color-management", "preferences-color", QStyle.SP_CustomBase)
-            ink_levels_button = QPushButton(ink_icon, "Ink Levels")
-            left_column_layout.addWidget(ink_levels_button)
-        parent_layout.addLayout(left_column_layout, 1)
-        
-    def setup_main_tab(self):
-        main_tab_layout = QHBoxLayout(self.tab_main)
-        self._create_left_panel_content(main_tab_layout, include_ink_levels=True)
-        right_column_wrapper = QVBoxLayout()
-        right_column_grid = QGridLayout()
-        right_column_grid.setSpacing(10)
-        settings_icon = get_icon("preferences-configure", "configure", QStyle.SP_DesktopIcon)
-
-        right_column_grid.addWidget(QLabel("Document Size:"), 0, 0, Qt.AlignRight)
-        doc_size_combo = QComboBox()
-        paper_sizes = ["Letter (8 1/2 x 11 in)", "A4 (210 x 297 mm)", "Legal (8 1/2 x 14 in)"]
-        doc_size_combo.addItems(paper_sizes)
-        a4_text = "A4 (210 x 297 mm)"
-        if a4_text in paper_sizes:
-            doc_size_combo.setCurrentText(a4_text)
-        doc_size_settings_button = QPushButton(settings_icon, "Settings...")
-        doc_size_layout = QHBoxLayout()
-        doc_size_layout.addWidget(doc_size_combo)
-        doc_size_layout.addWidget(doc_size_settings_button)
-        right_column_grid.addLayout(doc_size_layout, 0, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Orientation:"), 1, 0, Qt.AlignRight)
-        orientation_portrait_radio = QRadioButton("Portrait")
-        orientation_landscape_radio = QRadioButton("Landscape")
-        orientation_portrait_radio.setChecked(True)
-        orientation_group = QButtonGroup(self.tab_main)
-        orientation_group.addButton(orientation_portrait_radio)
-        orientation_group.addButton(orientation_landscape_radio)
-        orientation_layout = QHBoxLayout()
-        orientation_layout.addWidget(orientation_portrait_radio)
-        orientation_layout.addWidget(orientation_landscape_radio)
-        orientation_layout.addStretch()
-        right_column_grid.addLayout(orientation_layout, 1, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Paper Type:"), 2, 0, Qt.AlignRight)
-        paper_type_combo = QComboBox()
-        paper_type_combo.addItems(["Plain Paper / Bright White Paper", "Photo Paper Glossy", "Matte Paper"])
-        right_column_grid.addWidget(paper_type_combo, 2, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Quality:"), 3, 0, Qt.AlignRight)
-        quality_combo = QComboBox()
-        quality_combo.addItems(["Standard", "Draft", "High", "Best"])
-        right_column_grid.addWidget(quality_combo, 3, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Color:"), 4, 0, Qt.AlignRight)
-        color_color_radio = QRadioButton("Color")
-        color_grayscale_radio = QRadioButton("Black/Grayscale")
-        color_color_radio.setChecked(True)
-        color_group = QButtonGroup(self.tab_main)
-        color_group.addButton(color_color_radio)
-        color_group.addButton(color_grayscale_radio)
-        color_layout = QHBoxLayout()
-        color_layout.addWidget(color_color_radio)
-        color_layout.addWidget(color_grayscale_radio)
-        color_layout.addStretch()
-        right_column_grid.addLayout(color_layout, 4, 1, 1, 2)
-
-        sided_printing_checkbox = QCheckBox("2-Sided Printing")
-        sided_printing_settings_button = QPushButton(settings_icon, "Settings...")
-        sided_printing_settings_button.setEnabled(False)
-        sided_printing_checkbox.toggled.connect(sided_printing_settings_button.setEnabled)
-        sided_layout = QHBoxLayout()
-        sided_layout.addWidget(sided_printing_checkbox)
-        sided_layout.addWidget(sided_printing_settings_button)
-        sided_layout.addStretch()
-        right_column_grid.addLayout(sided_layout, 5, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Multi-Page:"), 6, 0, Qt.AlignRight)
-        multipage_combo = QComboBox()
-        multipage_combo.addItems(["Off", "2 Up", "4 Up", "Custom..."])
-        page_order_icon = get_icon("view-page-continuous-symbolic", "format-justify-fill", QStyle.SP_ToolBarVerticalExtensionButton)
-        multipage_pageorder_button = QPushButton(page_order_icon,"Page Order...")
-        multipage_pageorder_button.setEnabled(False)
-        multipage_combo.currentIndexChanged.connect(
-            lambda: multipage_pageorder_button.setEnabled(multipage_combo.currentText() != "Off")
-        )
-        multipage_layout = QHBoxLayout()
-        multipage_layout.addWidget(multipage_combo)
-        multipage_layout.addWidget(multipage_pageorder_button)
-        right_column_grid.addLayout(multipage_layout, 6, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Copies:"), 7, 0, Qt.AlignRight)
-        copies_spinbox = QSpinBox()
-        copies_spinbox.setMinimum(1)
-        copies_spinbox.setValue(1)
-        collate_checkbox = QCheckBox("Collate")
-        collate_checkbox.setChecked(True)
-        reverse_order_checkbox = QCheckBox("Reverse Order")
-        copies_layout = QHBoxLayout()
-        copies_layout.addWidget(copies_spinbox)
-        copies_layout.addWidget(collate_checkbox)
-        copies_layout.addWidget(reverse_order_checkbox)
-        copies_layout.addStretch()
-        right_column_grid.addLayout(copies_layout, 7, 1, 1, 2)
-
-        print_preview_checkbox = QCheckBox("Print Preview")
-        job_arranger_checkbox = QCheckBox("Job Arranger Lite")
-        quiet_mode_checkbox = QCheckBox("Quiet Mode")
-        checkboxes_layout = QVBoxLayout()
-        checkboxes_layout.addWidget(print_preview_checkbox)
-        checkboxes_layout.addWidget(job_arranger_checkbox)
-        checkboxes_layout.addWidget(quiet_mode_checkbox)
-        right_column_grid.addLayout(checkboxes_layout, 8, 1, Qt.AlignTop)
-        right_column_grid.setRowStretch(9, 1)
-        right_column_wrapper.addLayout(right_column_grid)
-        right_column_wrapper.addStretch(1)
-
-        show_settings_icon = get_icon("document-properties", "preferences-system", QStyle.SP_DialogApplyButton)
-        show_settings_button_main = QPushButton(show_settings_icon, "Show Settings")
-        show_settings_layout_main = QHBoxLayout()
-        show_settings_layout_main.addStretch(1)
-        show_settings_layout_main.addWidget(show_settings_button_main)
-        right_column_wrapper.addLayout(show_settings_layout_main)
-        main_tab_layout.addLayout(right_column_wrapper, 2)
-
-    def setup_more_options_tab(self):
-        more_options_tab_layout = QHBoxLayout(self.tab_more_options)
-        self._create_left_panel_content(more_options_tab_layout, include_ink_levels=False)
-        right_column_wrapper = QVBoxLayout()
-        right_column_grid = QGridLayout()
-        right_column_grid.setSpacing(10)
-        right_column_grid.setColumnStretch(2,1)
-        settings_icon = get_icon("preferences-configure", "configure", QStyle.SP_DesktopIcon)
-
-        right_column_grid.addWidget(QLabel("Document Size:"), 0, 0, Qt.AlignRight)
-        self.mo_doc_size_combo = QComboBox()
-        paper_sizes = ["Letter (8 1/2 x 11 in)", "A4 (210 x 297 mm)", "Legal (8 1/2 x 14 in)"]
-        self.mo_doc_size_combo.addItems(paper_sizes)
-        a4_text = "A4 (210 x 297 mm)"
-        if a4_text in paper_sizes:
-            self.mo_doc_size_combo.setCurrentText(a4_text)
-        right_column_grid.addWidget(self.mo_doc_size_combo, 0, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Output Paper:"), 1, 0, Qt.AlignRight)
-        self.output_paper_combo = QComboBox()
-        self.output_paper_combo.addItems(["Same as Document Size", "Letter (8 1/2 x 11 in)", "A4 (210 x 297 mm)"])
-        right_column_grid.addWidget(self.output_paper_combo, 1, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Reduce/Enlarge Document:"), 2, 0, Qt.AlignTop | Qt.AlignRight)
-        reduce_enlarge_layout = QVBoxLayout()
-        self.fit_to_page_checkbox = QCheckBox("Fit to Page")
-        zoom_layout = QHBoxLayout()
-        self.zoom_to_checkbox = QCheckBox("Zoom to")
-        self.zoom_spinbox = QSpinBox()
-        self.zoom_spinbox.setSuffix(" %")
-        self.zoom_spinbox.setRange(10, 400)
-        self.zoom_spinbox.setValue(100)
-        self.zoom_spinbox.setEnabled(False)
-        self.zoom_to_checkbox.toggled.connect(self.zoom_spinbox.setEnabled)
-        def fit_page_toggled(checked):
-            if checked:
-                self.zoom_to_checkbox.setChecked(False)
-                self.zoom_to_checkbox.setEnabled(False)
-            else:
-                self.zoom_to_checkbox.setEnabled(True)
-        self.fit_to_page_checkbox.toggled.connect(fit_page_toggled)
-        zoom_layout.addWidget(self.zoom_to_checkbox)
-        zoom_layout.addWidget(self.zoom_spinbox)
-        zoom_layout.addStretch()
-        reduce_enlarge_layout.addWidget(self.fit_to_page_checkbox)
-        reduce_enlarge_layout.addLayout(zoom_layout)
-        right_column_grid.addLayout(reduce_enlarge_layout, 2, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Color Correction:"), 3, 0, Qt.AlignTop | Qt.AlignRight)
-        color_correction_layout = QVBoxLayout()
-        self.cc_auto_radio = QRadioButton("Automatic")
-        self.cc_auto_radio.setChecked(True)
-        self.cc_custom_radio = QRadioButton("Custom")
-        advanced_cc_icon = get_icon("color-management", "preferences-color", QStyle.SP_CustomBase)
-        self.cc_advanced_button = QPushButton(advanced_cc_icon,"Advanced...")
-        self.cc_advanced_button.setEnabled(False)
-        image_options_icon = get_icon("image-sharpen", "transform-crop-and-resize", QStyle.SP_CustomBase)
-        self.cc_image_options_button = QPushButton(image_options_icon, "Image Options...")
-        def update_advanced_button_status_cc():
-            self.cc_advanced_button.setEnabled(self.cc_custom_radio.isChecked())
-        self.cc_auto_radio.toggled.connect(update_advanced_button_status_cc)
-        self.cc_custom_radio.toggled.connect(update_advanced_button_status_cc)
-        custom_cc_layout = QHBoxLayout()
-        custom_cc_layout.addWidget(self.cc_custom_radio)
-        custom_cc_layout.addWidget(self.cc_advanced_button)
-        custom_cc_layout.addStretch()
-        color_correction_layout.addWidget(self.cc_auto_radio)
-        color_correction_layout.addLayout(custom_cc_layout)
-        color_correction_layout.addWidget(self.cc_image_options_button, 0, Qt.AlignLeft)
-        right_column_grid.addLayout(color_correction_layout, 3, 1, 1, 2)
-
-        right_column_grid.addWidget(QLabel("Watermark:"), 4, 0, Qt.AlignRight)
-        self.watermark_combo = QComboBox()
-        self.watermark_combo.addItems(["None", "CONFIDENTIAL", "DRAFT", "Add/Delete..."])
-        watermark_add_icon = get_icon("document-edit", "draw-text", QStyle.SP_FileLinkIcon)
-        self.watermark_add_delete_button = QPushButton(watermark_add_icon,"Add/Delete...")
-        self.watermark_settings_button = QPushButton(settings_icon, "Settings...")
-        self.watermark_settings_button.setEnabled(False)
-        def watermark_changed(text):
-            is_none = (text == "None")
-            self.watermark_settings_button.setEnabled(not is_none)
-            if text == "Add/Delete...":
-                print("Add/Delete Watermark action from combobox (placeholder)")
-        self.watermark_combo.currentTextChanged.connect(watermark_changed)
-        watermark_controls_layout = QHBoxLayout()
-        watermark_controls_layout.addWidget(self.watermark_combo,1)
-        watermark_controls_layout.addWidget(self.watermark_add_delete_button)
-        watermark_controls_layout.addWidget(self.watermark_settings_button)
-        right_column_grid.addLayout(watermark_controls_layout, 4, 1, 1, 2)
-
-        self.header_footer_checkbox = QCheckBox("Header/Footer")
-        header_footer_icon = get_icon("insert-header-footer", "format-header-symbolic", QStyle.SP_FileDialogDetailedView)
-        self.header_footer_settings_button = QPushButton(header_footer_icon, "Settings...")
-        self.header_footer_settings_button.setEnabled(False)
-        self.header_footer_checkbox.toggled.connect(self.header_footer_settings_button.setEnabled)
-        header_footer_layout = QHBoxLayout()
-        header_footer_layout.addWidget(self.header_footer_checkbox)
-        header_footer_layout.addWidget(self.header_footer_settings_button)
-        header_footer_layout.addStretch()
-        right_column_grid.addLayout(header_footer_layout, 5, 1, 1, 2)
-
-        additional_settings_group = QGroupBox("Additional Settings")
-        additional_settings_layout = QVBoxLayout()
-        self.rotate_checkbox = QCheckBox("Rotate 180°")
-        self.high_speed_checkbox = QCheckBox("High Speed")
-        self.mirror_image_checkbox = QCheckBox("Mirror Image")
-        additional_settings_layout.addWidget(self.rotate_checkbox)
-        additional_settings_layout.addWidget(self.high_speed_checkbox)
-        additional_settings_layout.addWidget(self.mirror_image_checkbox)
-        additional_settings_group.setLayout(additional_settings_layout)
-        right_column_grid.addWidget(additional_settings_group, 6, 1, 1, 2)
-        right_column_grid.setRowStretch(7, 1)
-        right_column_wrapper.addLayout(right_column_grid)
-        right_column_wrapper.addStretch(1)
-
-        show_settings_icon_more = get_icon("document-properties", "preferences-system", QStyle.SP_DialogApplyButton)
-        show_settings_button_more = QPushButton(show_settings_icon_more, "Show Settings")
-        show_settings_layout_more = QHBoxLayout()
-        show_settings_layout_more.addStretch(1)
-        show_settings_layout_more.addWidget(show_settings_button_more)
-        right_column_wrapper.addLayout(show_settings_layout_more)
-        more_options_tab_layout.addLayout(right_column_wrapper, 2)
-        
-    def _create_maintenance_item(self, icon_placeholder_texts_or_qicon, title_text, description_text, icon_size=QSize(32,32)):
-        item_frame = QFrame()
-        item_frame.setFrameShape(QFrame.StyledPanel)
-        item_frame.setObjectName("MaintenanceItemFrame")
-
-        item_layout = QHBoxLayout(item_frame)
-        item_layout.setContentsMargins(10, 8, 10, 8) 
-        item_layout.setSpacing(10)
-
-        icon_label = QLabel()
-        if isinstance(icon_placeholder_texts_or_qicon, QIcon): 
-            item_icon = icon_placeholder_texts_or_qicon
-        else: 
-             item_icon = create_placeholder_icon_with_text(icon_placeholder_texts_or_qicon, icon_size=icon_size)
-
-        if not item_icon.isNull():
-            icon_pixmap = item_icon.pixmap(icon_size)
-            if not icon_pixmap.isNull():
-                icon_label.setPixmap(icon_pixmap)
-            else:
-                icon_label.setText("[PXM Gagal]")
-        else:
-            icon_label.setText("[IKON Gagal]")
-        
-        icon_label.setFixedSize(icon_size.width() + 4, icon_size.height() + 4) 
-        icon_label.setAlignment(Qt.AlignCenter)
-        item_layout.addWidget(icon_label, 0, Qt.AlignTop)
-
-        text_content_label = QLabel()
-        html_text = f"<b>{title_text}</b>&nbsp;&nbsp;{description_text}"
-        text_content_label.setText(html_text)
-        text_content_label.setTextFormat(Qt.RichText) 
-        text_content_label.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-        
-        item_layout.addWidget(text_content_label, 1) 
-                                                     
-        item_frame.mousePressEvent = lambda event, t=title_text: self.maintenance_action(t)
-
-        return item_frame
-
-    def maintenance_action(self, title):
-        # Dummy: panggil aksi maintenance sesuai judul
-        if title == "Cleaning":
-            self.printer_clean()
-        elif title == "Deep Cleaning":
-            self.printer_deep_clean()
-        elif title == "Print Head Alignment":
-            self.printer_align_head()
-        elif title == "Nozzle Check":
-            self.printer_nozzle_check()
-        elif title == "Ink Cartridge Settings":
-            self.printer_ink_settings()
-        else:
-            QMessageBox.information(self, "Maintenance", f"{title} (dummy).")
-
-    def printer_clean(self):
-        QMessageBox.information(self, "Cleaning", "Printer cleaning started (dummy).")
-
-    def printer_deep_clean(self):
-        QMessageBox.information(self, "Deep Cleaning", "Printer deep cleaning started (dummy).")
-
-    def printer_align_head(self):
-        QMessageBox.information(self, "Print Head Alignment", "Print head alignment started (dummy).")
-
-    def printer_nozzle_check(self):
-        QMessageBox.information(self, "Nozzle Check", "Nozzle check started (dummy).")
-
-    def printer_ink_settings(self):
-        QMessageBox.information(self, "Ink Cartridge Settings", "Ink cartridge settings (dummy).")
-
-
-    def setup_maintenance_tab(self):
-        main_layout = QVBoxLayout(self.tab_maintenance)
-        main_layout.setContentsMargins(10, 10, 10, 10) 
-        main_layout.setSpacing(5) 
-        main_layout.setAlignment(Qt.AlignTop)
-
-        maintenance_items_data = [
-            {"icon_text": ["CLN", "💧"], "title": "Cleaning", 
-             "desc": "Removes unwanted marks and lines from your printed output."},
-            {"icon_text": ["DEEP", "CLN", "💧💧"], "title": "Deep Cleaning", 
-             "desc": "Resolves stubborn nozzle blockages that standard cleaning cannot fix."},
-            {"icon_text": ["A|A", "↔️"], "title": "Print Head Alignment", 
-             "desc": "Corrects color and line misalignments by performing print head alignment."},
-            {"icon_text": ["|||", "---", "|||"], "title": "Nozzle Check", 
-             "desc": "Prints a test pattern to determine if any print head nozzles are clogged."},
-        ]
-
-        ink_cart_icon_theme = get_icon("color-palette", "preferences-desktop-color", QStyle.SP_CustomBase)
-        if ink_cart_icon_theme.isNull():
-            ink_cart_icon_repr = create_placeholder_icon_with_text(["INK"], icon_size=QSize(32,32))
-        else:
-            ink_cart_icon_repr = ink_cart_icon_theme
-        
-        maintenance_items_data.append(
-            {"icon_text": ink_cart_icon_repr, "title": "Ink Cartridge Settings", 
-             "desc": "Allows you to configure settings related to your ink cartridges for printing."}
-        )
-
-        for item_data in maintenance_items_data:
-            item_widget = self._create_maintenance_item( 
-                item_data["icon_text"], 
-                item_data["title"], 
-                item_data["desc"],
-                icon_size=QSize(32,32) 
-            )
-            main_layout.addWidget(item_widget)
-
-        main_layout.addStretch(1)
+            return args.handler(args, sys.stdout)
+        except ValueError as e:
+            print(f"printer.py: {e}", file=sys.stderr)
+            return 2
+        finally:
+            if get_metrics().dump:
+                print(f"INFO: Metrik ditulis ke {get_metrics().write()}", file=sys.stderr)
+    gui_args, qt_argv = parse_gui_args(argv)
+    from single_instance import forward_to_running
+    with get_profiler().phase("forward to resident instance"):
+        if gui_args.stop_resident:
+            return 0 if forward_to_running({"quit": True}) else 1
+        # Instance resident yang sudah berjalan menampilkan dialognya; proses ini selesai.
+        if forward_to_running({"printer": gui_args.printer, "tab": gui_args.tab}):
+            return 0
+    # PySide6 hanya dimuat untuk mode GUI.
+    with get_profiler().phase("import printer_gui"):
+        from printer_gui import run_gui
+    return run_gui(qt_argv, printer_name=gui_args.printer, tab=gui_args.tab,
+                   resident=gui_args.resident, hidden=gui_args.hidden)
+
+
+def __getattr__(name):
+    # Kompatibilitas: `from printer import LinuxPrinterPreferencesDialog` tetap berfungsi.
+    if name.startswith("__"):
+        raise AttributeError(name)
+    import printer_gui
+    try:
+        return getattr(printer_gui, name)
+    except AttributeError:
+        raise AttributeError(f"module 'printer' has no attribute {name!r}") from None
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    QIcon.setThemeName("breeze")
-    print(f"INFO: Mencoba mengatur tema ikon ke 'breeze'.")
-    print(f"--- Diagnostik Ikon ---")
-    print(f"Nama Tema Qt Saat Ini (setelah setThemeName): {QIcon.themeName()}")
-    print(f"Path Pencarian Tema Qt: {QIcon.themeSearchPaths()}")
-    print(f"----------------------")
-    
-    # app.setStyleSheet("""
-    #     QFrame#MaintenanceItemFrame {
-    #         border: 1px solid #e0e0e0; 
-    #         border-radius: 3px;        
-    #         background-color: #f9f9f9; 
-    #         padding: 5px;          
-    #         margin-bottom: 2px;        
-    #     }
-    #     QFrame#MaintenanceItemFrame:hover {
-    #         background-color: #eef4ff; 
-    #     }
-    # """)
-
-    # app.setStyle("Fusion") 
-    dialog = LinuxPrinterPreferencesDialog()
-    dialog.show()
-    sys.exit(app.exec())
+    sys.exit(main())
@@ -0,0 +1,2568 @@
+"""Dialog Printing Preferences berbasis PySide6. Dijalankan lewat printer.py."""
+import os
+import sys
+import html
+import json
+import time
+import bisect
+import itertools
+import threading
+import collections
+from PySide6.QtWidgets import (
+    QApplication, QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
+    QGridLayout, QFormLayout, QLabel, QComboBox, QRadioButton, QButtonGroup,
+    QCheckBox, QSpinBox, QPushButton, QListWidget, QSizePolicy,
+    QDialogButtonBox, QGroupBox, QSpacerItem, QStyle, QToolButton, QFrame,
+    QMessageBox, QProgressBar, QTableWidget, QTableWidgetItem, QListWidgetItem,
+    QTableView, QAbstractItemView, QHeaderView, QListView, QLineEdit, QInputDialog,
+    QStyledItemDelegate, QStyleOptionViewItem, QStyleOptionProgressBar, QFileDialog
+)
+from PySide6.QtNetwork import QLocalServer
+from PySide6.QtGui import (
+    QPixmap, QIcon, QPainter, QFont, QColor, QImage, QPixmapCache, QPalette, QTextDocument,
+    QAbstractTextDocumentLayout
+)
+from PySide6.QtCore import (
+    Qt, QSize, QRect, QObject, Signal, QTimer, QAbstractTableModel, QModelIndex,
+    QAbstractListModel, QSortFilterProxyModel, QItemSelectionModel, QEvent
+)
+
+from app_paths import cache_dir, atomic_write
+from profiling import get_profiler
+from metrics import get_metrics, tracked, HEARTBEAT_MS
+from capabilities import load_capabilities
+from constraints import ConstraintEngine, dialog_engine
+from cups_backend import get_default_executor
+from fleet import apply_options_to_printers
+from maintenance import MAINTENANCE_COMMANDS, TERMINAL_JOB_STATES, submit_maintenance, job_status
+from job_queue import (
+    JOB_FIELD, JOB_STATE_LABELS, DEFAULT_PAGE_SIZE, fetch_jobs_page, fetch_jobs_range, apply_job_action,
+)
+from print_queue import (
+    DEFAULT_PER_PRINTER, PrintCanceled, PrintProgress, PrintResult, expand_documents, submit_documents, describe_progress,
+)
+from printer_index import PrinterIndex, PRINTER_STATE_STOPPED, load_cached_index, refresh_index
+from presets import get_preset_store, preset_settings, preset_options, settings_for_preset
+from preview import PreviewRenderer
+from single_instance import socket_path, decode_request
+from status_monitor import StatusMonitor, marker_entries, MARKER_LEVEL_SOME_REMAINING
+from settings_model import SettingsModel, settings_to_cups_options, commit_option_defaults
+from stamping import stamp_settings
+
+class IconCache:
+    """Cache ikon untuk get_icon, berlaku untuk seluruh proses.
+
+    Kunci cache: (primary, secondary, fallback enum, nama tema). Cache otomatis
+    dikosongkan saat QIcon.themeName() berubah, misalnya setelah
+    QIcon.setThemeName().
+    """
+
+    def __init__(self):
+        self._icons = {}
+        self._theme = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, primary_name, secondary_name=None, fallback_style_pixmap_enum=None):
+        theme = QIcon.themeName()
+        if theme != self._theme:
+            self._icons.clear()
+            self._theme = theme
+        key = (primary_name, secondary_name, fallback_style_pixmap_enum, theme)
+        icon = self._icons.get(key)
+        profiler = get_profiler()
+        profiler.count("get_icon.calls")
+        if icon is not None:
+            self.hits += 1
+            return icon
+        self.misses += 1
+        profiler.count("get_icon.misses")
+        with profiler.phase(f"icon:{primary_name}", "icon"):
+            icon = _resolve_icon(primary_name, secondary_name, fallback_style_pixmap_enum)
+        # Fallback QStyle butuh QApplication; jangan simpan hasil kosong sebelum ada app.
+        if not icon.isNull() or QApplication.instance() is not None:
+            self._icons[key] = icon
+        return icon
+
+    def clear(self):
+        self._icons.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"size": len(self._icons), "hits": self.hits, "misses": self.misses, "theme": self._theme}
+
+
+ICON_CACHE = IconCache()
+
+# Ikon yang dipakai dialog, untuk warm_up_icons().
+DIALOG_ICON_SPECS = [
+    ("help-contents", "help-faq", QStyle.SP_DialogHelpButton),
+    ("list-add", "document-new", QStyle.SP_FileDialogNewFolder),
+    ("document-send", "printer", QStyle.SP_DialogApplyButton),
+    ("text-x-generic", "document-new", QStyle.SP_FileIcon),
+    ("printer", "printer-printing", QStyle.SP_DriveHDIcon),
+    ("edit-undo", "document-revert", QStyle.SP_ArrowLeft),
+    ("media-color-management", "preferences-color", QStyle.SP_CustomBase),
+    ("preferences-configure", "configure", QStyle.SP_DesktopIcon),
+    ("view-page-continuous-symbolic", "format-justify-fill", QStyle.SP_ToolBarVerticalExtensionButton),
+    ("document-properties", "preferences-system", QStyle.SP_DialogApplyButton),
+    ("color-management", "preferences-color", QStyle.SP_CustomBase),
+    ("image-sharpen", "transform-crop-and-resize", QStyle.SP_CustomBase),
+    ("document-edit", "draw-text", QStyle.SP_FileLinkIcon),
+    ("insert-header-footer", "format-header-symbolic", QStyle.SP_FileDialogDetailedView),
+    ("color-palette", "preferences-desktop-color", QStyle.SP_CustomBase),
+]
+
+
+def get_icon(primary_name, secondary_name=None, fallback_style_pixmap_enum=None):
+    """Memuat ikon dengan fallback melalui ICON_CACHE (lihat _resolve_icon)."""
+    return ICON_CACHE.get(primary_name, secondary_name, fallback_style_pixmap_enum)
+
+
+def warm_up_icons(specs=None):
+    """Memuat ikon lebih awal, sebelum dialog dibangun. Butuh QApplication."""
+    for spec in (DIALOG_ICON_SPECS if specs is None else specs):
+        get_icon(*spec)
+    return ICON_CACHE.stats()
+
+
+def _resolve_icon(primary_name, secondary_name=None, fallback_style_pixmap_enum=None):
+    """
+    Helper function untuk memuat ikon dengan fallback.
+    1. Coba primary_name dari tema.
+    2. Jika gagal & secondary_name ada, coba secondary_name dari tema.
+    3. Jika masih gagal & fallback_style_pixmap_enum ada, gunakan ikon standar QStyle.
+    Mengembalikan QIcon object (bisa jadi QIcon kosong jika semua gagal).
+    """
+    icon = QIcon.fromTheme(primary_name)
+    if icon.isNull() and secondary_name:
+        get_profiler().count("get_icon.secondary_fallback")
+        icon = QIcon.fromTheme(secondary_name)
+    if icon.isNull() and fallback_style_pixmap_enum is not None:
+        get_profiler().count("get_icon.style_fallback")
+        app_instance = QApplication.instance()
+        if app_instance:
+            try:
+                standard_icon = app_instance.style().standardIcon(fallback_style_pixmap_enum)
+                if not standard_icon.isNull():
+                    icon = standard_icon
+            except Exception as e:
+                print(f"Error saat memuat ikon QStyle fallback: {e}")
+    if icon.isNull():
+        return QIcon()
+    return icon
+
+def create_placeholder_icon_with_text(text_lines, icon_size=QSize(48, 48), background_color=Qt.lightGray, border_color=Qt.darkGray):
+    """Membuat QIcon placeholder dengan teks di dalamnya (lewat PLACEHOLDER_CACHE)."""
+    if isinstance(text_lines, str):
+        text_lines = [text_lines]
+    icon = QIcon()
+    for dpr in _placeholder_device_pixel_ratios():
+        icon.addPixmap(PLACEHOLDER_CACHE.pixmap(text_lines, icon_size, background_color, border_color, dpr))
+    return icon
+
+
+def _placeholder_device_pixel_ratios():
+    app_instance = QApplication.instance()
+    dpr = app_instance.devicePixelRatio() if app_instance else 1.0
+    return sorted({1.0, dpr})
+
+
+def _render_placeholder_pixmap(text_lines, icon_size, background_color, border_color, dpr):
+    """Menggambar placeholder langsung pada resolusi fisik dpr (bukan hasil upscale)."""
+    pixmap = QPixmap(QSize(round(icon_size.width() * dpr), round(icon_size.height() * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(background_color)
+    painter = QPainter(pixmap)
+    
+    pen = painter.pen()
+    pen.setColor(border_color)
+    pen.setWidth(1)
+    painter.setPen(pen)
+    painter.drawRect(0, 0, icon_size.width() -1, icon_size.height() -1)
+
+    font_size = 9
+    if len(text_lines) == 1:
+        font_size = 10
+    elif len(text_lines) > 2:
+        font_size = 7
+        
+    font = painter.font()
+    font.setPointSize(font_size)
+    painter.setFont(font)
+    pen.setColor(Qt.black)
+    painter.setPen(pen)
+
+    num_lines = len(text_lines)
+    padding = 2 
+    total_text_height = (font_size + padding) * num_lines - padding
+    start_y = (icon_size.height() - total_text_height) // 2
+    
+    for i, line in enumerate(text_lines):
+        line_y = start_y + i * (font_size + padding)
+        rect_line = QRect(0, line_y, icon_size.width(), font_size + padding)
+        painter.drawText(rect_line, Qt.AlignCenter | Qt.TextDontClip, line)
+        
+    painter.end()
+    return pixmap
+
+
+class PlaceholderPixmapCache:
+    """Cache pixmap placeholder: QPixmapCache di memori plus atlas PNG di disk.
+
+    Kunci: baris teks, ukuran, warna dan device pixel ratio. Atlas berupa satu
+    lembar PNG dan indeks JSON di direktori cache, sehingga peluncuran
+    berikutnya tidak perlu menggambar ulang. Atlas dibuang jika versinya atau
+    font aplikasi berubah.
+    """
+    ATLAS_VERSION = 1
+    ATLAS_WIDTH = 512
+
+    def __init__(self, atlas_dir=None, cache_limit_kb=4096):
+        self.atlas_dir = atlas_dir
+        self.cache_limit_kb = cache_limit_kb
+        self._atlas_image = None
+        self._atlas_index = None
+        self._new_images = {}
+        self.renders = 0
+        self.atlas_hits = 0
+
+    def _atlas_paths(self):
+        directory = self.atlas_dir or cache_dir("icons")
+        return os.path.join(directory, "placeholders.png"), os.path.join(directory, "placeholders.json")
+
+    @staticmethod
+    def _font_signature():
+        return QApplication.font().toString() if QApplication.instance() else ""
+
+    @staticmethod
+    def make_key(text_lines, icon_size, background_color, border_color, dpr):
+        bg = QColor(background_color).name(QColor.HexArgb)
+        border = QColor(border_color).name(QColor.HexArgb)
+        return f"placeholder:{icon_size.width()}x{icon_size.height()}@{dpr:g}:{bg}:{border}:" + "\x1f".join(text_lines)
+
+    def _load_atlas(self):
+        self._atlas_index = {}
+        image_path, index_path = self._atlas_paths()
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.ATLAS_VERSION or data.get("font") != self._font_signature():
+            return
+        image = QImage(image_path)
+        if image.isNull():
+            return
+        self._atlas_image = image
+        self._atlas_index = data.get("entries", {})
+
+    def pixmap(self, text_lines, icon_size, background_color, border_color, dpr):
+        if QPixmapCache.cacheLimit() < self.cache_limit_kb:
+            QPixmapCache.setCacheLimit(self.cache_limit_kb)
+        key = self.make_key(text_lines, icon_size, background_color, border_color, dpr)
+        cached = QPixmapCache.find(key)
+        if cached is not None:
+            return cached
+
+        if self._atlas_index is None:
+            self._load_atlas()
+        rect = self._atlas_index.get(key)
+        if rect is not None and self._atlas_image is not None:
+            pixmap = QPixmap.fromImage(self._atlas_image.copy(QRect(*rect)))
+            pixmap.setDevicePixelRatio(dpr)
+            self.atlas_hits += 1
+        else:
+            pixmap = _render_placeholder_pixmap(text_lines, icon_size, background_color, border_color, dpr)
+            self._new_images[key] = pixmap.toImage()
+            self.renders += 1
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    def save(self):
+        """Menyimpan atlas jika ada placeholder baru yang belum tersimpan."""
+        if not self._new_images:
+            return False
+        images = {}
+        if self._atlas_image is not None:
+            for key, rect in self._atlas_index.items():
+                images[key] = self._atlas_image.copy(QRect(*rect))
+        images.update(self._new_images)
+
+        # Susun per baris (shelf packing) dengan lebar lembar tetap.
+        entries = {}
+        x = y = row_height = 0
+        for key, image in images.items():
+            if x and x + image.width() > self.ATLAS_WIDTH:
+                x, y, row_height = 0, y + row_height, 0
+            entries[key] = [x, y, image.width(), image.height()]
+            x += image.width()
+            row_height = max(row_height, image.height())
+        sheet = QImage(max(self.ATLAS_WIDTH, 1), max(y + row_height, 1), QImage.Format_ARGB32_Premultiplied)
+        sheet.fill(Qt.transparent)
+        painter = QPainter(sheet)
+        for key, image in images.items():
+            painter.drawImage(entries[key][0], entries[key][1], image)
+        painter.end()
+
+        image_path, index_path = self._atlas_paths()
+        tmp_image_path = f"{image_path}.tmp-{os.getpid()}.png"
+        if not sheet.save(tmp_image_path, "PNG"):
+            print(f"Gagal menyimpan atlas placeholder ke {image_path}")
+            return False
+        os.replace(tmp_image_path, image_path)
+        index = {"version": self.ATLAS_VERSION, "font": self._font_signature(), "entries": entries}
+        atomic_write(index_path, json.dumps(index).encode("utf-8"))
+        self._atlas_image, self._atlas_index = sheet, entries
+        self._new_images.clear()
+        return True
+
+    def stats(self):
+        return {"renders": self.renders, "atlas_hits": self.atlas_hits,
+                "atlas_entries": len(self._atlas_index or {}), "unsaved": len(self._new_images)}
+
+
+PLACEHOLDER_CACHE = PlaceholderPixmapCache()
+
+
+def bind_setting(model, key, widget):
+    """Menghubungkan widget dengan satu kunci SettingsModel secara dua arah.
+
+    Jika model sudah punya nilai untuk kunci itu, nilai tersebut diterapkan ke
+    widget; jika belum, nilai awal widget dicatat sebagai nilai model.
+    """
+    if isinstance(widget, QButtonGroup):
+        def getter():
+            button = widget.checkedButton()
+            return button.text() if button is not None else None
+        def setter(value):
+            for button in widget.buttons():
+                if button.text() == value:
+                    button.setChecked(True)
+        widget.buttonToggled.connect(lambda button, checked: checked and model.set(key, getter()))
+    elif isinstance(widget, QComboBox):
+        getter, setter = widget.currentText, widget.setCurrentText
+        widget.currentTextChanged.connect(lambda _text: model.set(key, getter()))
+    elif isinstance(widget, QSpinBox):
+        getter, setter = widget.value, widget.setValue
+        widget.valueChanged.connect(lambda _value: model.set(key, getter()))
+    else:
+        getter, setter = widget.isChecked, widget.setChecked
+        widget.toggled.connect(lambda _checked: model.set(key, getter()))
+
+    if key in model:
+        setter(model.get(key))
+    else:
+        model.setdefault(key, getter())
+
+    def on_model_changed(value):
+        if getter() != value:
+            setter(value)
+    model.subscribe(on_model_changed, key)
+
+
+class CupsClient(QObject):
+    """Jembatan Qt untuk CupsExecutor: hasil panggilan dikirim ke thread GUI lewat sinyal."""
+    _finished = Signal(int, object)
+
+    def __init__(self, executor=None, parent=None):
+        super().__init__(parent)
+        self.executor = executor if executor is not None else get_default_executor()
+        self._callbacks = {}
+        self._tokens = itertools.count(1)
+        self._finished.connect(self._dispatch)
+
+    def submit(self, func, *args, on_result=None, on_error=None, timeout=None, **kwargs):
+        future = self.executor.submit(func, *args, timeout=timeout, **kwargs)
+        return self._track(future, on_result, on_error)
+
+    def call(self, method_name, *args, on_result=None, on_error=None, timeout=None, **kwargs):
+        future = self.executor.call(method_name, *args, timeout=timeout, **kwargs)
+        return self._track(future, on_result, on_error)
+
+    def _track(self, future, on_result, on_error):
+        token = next(self._tokens)
+        self._callbacks[token] = (on_result, on_error)
+        # Dipanggil dari thread pekerja; sinyal otomatis menjadi queued connection.
+        future.add_done_callback(lambda f, t=token: self._finished.emit(t, f))
+        return future
+
+    def cancel_all(self):
+        self._callbacks.clear()
+
+    def _dispatch(self, token, future):
+        on_result, on_error = self._callbacks.pop(token, (None, None))
+        if future.cancelled():
+            return
+        error = future.exception()
+        # Callback berjalan di thread GUI; watchdog mencatatnya dengan nama panggilan CUPS-nya.
+        with get_metrics().handler(f"cups result:{getattr(future, 'name', 'call')}"):
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    print(f"Panggilan CUPS gagal: {error}")
+            elif on_result is not None:
+                on_result(future.result())
+
+
+class InkLevelsDialog(QDialog):
+    """Level tinta dan alasan status printer, diperbarui langsung dari StatusMonitor."""
+
+    def __init__(self, printer_name, status, parent=None):
+        super().__init__(parent)
+        self.printer_name = printer_name
+        self.setWindowTitle(f"Ink Levels - {printer_name}")
+        self.setMinimumWidth(360)
+        layout = QVBoxLayout(self)
+        self.state_label = QLabel()
+        self.state_label.setWordWrap(True)
+        layout.addWidget(self.state_label)
+        self.markers_layout = QFormLayout()
+        layout.addLayout(self.markers_layout)
+        layout.addStretch(1)
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        self._bars = {}
+        self._status = {}
+        self.update_status(printer_name, status)
+
+    def update_status(self, printer_name, changed):
+        if printer_name != self.printer_name:
+            return
+        self._status.update(changed)
+        reasons = self._status.get("printer-state-reasons") or []
+        if isinstance(reasons, str):
+            reasons = [reasons]
+        reasons = [reason for reason in reasons if reason != "none"]
+        state = {3: "Idle", 4: "Printing", 5: "Stopped"}.get(self._status.get("printer-state"), "Unknown")
+        message = self._status.get("printer-state-message") or ""
+        self.state_label.setText(
+            f"<b>{state}</b> {message}" + (f"<br>{', '.join(reasons)}" if reasons else "")
+        )
+        entries = marker_entries(self._status)
+        if not entries:
+            self.state_label.setText(self.state_label.text() + "<br>No ink level information reported.")
+        for name, level, color in entries:
+            bar = self._bars.get(name)
+            if bar is None:
+                bar = QProgressBar()
+                bar.setRange(0, 100)
+                bar.setStyleSheet(f"QProgressBar::chunk {{ background-color: {color}; }}")
+                self.markers_layout.addRow(name, bar)
+                self._bars[name] = bar
+            if level >= 0:
+                bar.setValue(level)
+                bar.setFormat("%p%")
+            else:
+                bar.setValue(0)
+                bar.setFormat("Some remaining" if level == MARKER_LEVEL_SOME_REMAINING else "Unknown")
+
+
+class PresetListModel(QAbstractListModel):
+    """Daftar nama preset bersama untuk semua tab; isi preset dibaca saat dipilih."""
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store or get_preset_store()
+        self.printer_model = ""
+        with get_profiler().phase("presets.names"):
+            self._names = self.store.names()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._names[index.row()]
+        return None
+
+    def name(self, row):
+        return self._names[row]
+
+    def row_of(self, name):
+        try:
+            return self._names.index(name)
+        except ValueError:
+            return -1
+
+    def set_printer_model(self, printer_model):
+        if printer_model != self.printer_model:
+            self.printer_model = printer_model
+            self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._names = self.store.names(self.printer_model)
+        self.endResetModel()
+
+
+# (judul, deskripsi, teks ikon placeholder) untuk tab Maintenance.
+MAINTENANCE_ITEMS = [
+    ("Cleaning", "Removes unwanted marks and lines from your printed output.", ["CLN", "💧"]),
+    ("Deep Cleaning", "Resolves stubborn nozzle blockages that standard cleaning cannot fix.",
+     ["DEEP", "CLN", "💧💧"]),
+    ("Print Head Alignment", "Corrects color and line misalignments by performing print head alignment.",
+     ["A|A", "↔️"]),
+    ("Nozzle Check", "Prints a test pattern to determine if any print head nozzles are clogged.",
+     ["|||", "---", "|||"]),
+    ("Ink Cartridge Settings", "Allows you to configure settings related to your ink cartridges for printing.",
+     ["INK"]),
+]
+
+
+class MaintenanceListModel(QAbstractListModel):
+    """Item maintenance (judul, deskripsi, ikon, status job) untuk satu QListView."""
+    DescriptionRole = Qt.UserRole + 1
+    StatusRole = Qt.UserRole + 2
+    BusyRole = Qt.UserRole + 3
+
+    def __init__(self, items, icon_size=QSize(32, 32), parent=None):
+        super().__init__(parent)
+        # Setiap baris: [judul, deskripsi, ikon (QIcon atau teks placeholder), status, sibuk].
+        self._items = [[title, description, icon, "", False] for title, description, icon in items]
+        self._rows = {item[0]: row for row, item in enumerate(self._items)}
+        self.icon_size = icon_size
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            return item[0]
+        if role in (self.DescriptionRole, Qt.ToolTipRole):
+            return item[1]
+        if role == Qt.DecorationRole:
+            if not isinstance(item[2], QIcon):
+                # Placeholder baru digambar saat baris pertama kali tampil.
+                item[2] = create_placeholder_icon_with_text(item[2], icon_size=self.icon_size)
+            return item[2]
+        if role == self.StatusRole:
+            return item[3]
+        if role == self.BusyRole:
+            return item[4]
+        return None
+
+    def title(self, row):
+        return self._items[row][0]
+
+    def set_icon(self, title, icon):
+        row = self._rows[title]
+        self._items[row][2] = icon
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def set_status(self, title, text, busy):
+        """False jika judul tidak dikenal."""
+        row = self._rows.get(title)
+        if row is None:
+            return False
+        self._items[row][3:5] = [text, busy]
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.StatusRole, self.BusyRole])
+        return True
+
+
+class RichTextItemDelegate(QStyledItemDelegate):
+    """Menggambar ikon plus teks HTML (judul tebal, deskripsi, baris status) tanpa widget per item.
+
+    Layout QTextDocument disimpan per (html, lebar) sehingga repaint dan
+    sizeHint tidak menyusun ulang teks; hanya baris yang tampil yang digambar.
+    """
+    MARGIN = 8
+    SPACING = 10
+    CACHE_SIZE = 256
+    BUSY_BAR_WIDTH = 120
+
+    def __init__(self, icon_size=QSize(32, 32), parent=None):
+        super().__init__(parent)
+        self.icon_size = icon_size
+        self._documents = collections.OrderedDict()
+
+    def html(self, index):
+        # Status memuat teks server/exception apa adanya, jadi semua teks di-escape.
+        title = html.escape(index.data(Qt.DisplayRole) or "")
+        description = html.escape(index.data(MaintenanceListModel.DescriptionRole) or "")
+        # Baris status selalu ada agar tinggi item tidak berubah saat job berjalan.
+        status = html.escape(index.data(MaintenanceListModel.StatusRole) or "") or "&nbsp;"
+        return (f"<b>{title}</b>&nbsp;&nbsp;{description}"
+                f"<br><small><i>{status}</i></small>")
+
+    def _document(self, markup, width, font):
+        key = (markup, width, font.key())
+        document = self._documents.get(key)
+        if document is None:
+            document = QTextDocument()
+            document.setDefaultFont(font)
+            document.setDocumentMargin(0)
+            document.setHtml(markup)
+            document.setTextWidth(width)
+            self._documents[key] = document
+            if len(self._documents) > self.CACHE_SIZE:
+                self._documents.popitem(last=False)
+        else:
+            self._documents.move_to_end(key)
+        return document
+
+    def _text_width(self, width):
+        return max(width - 2 * self.MARGIN - self.icon_size.width() - self.SPACING, 50)
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        opt.text = ""
+        opt.icon = QIcon()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+
+        rect = opt.rect
+        icon = index.data(Qt.DecorationRole)
+        if isinstance(icon, QIcon) and not icon.isNull():
+            icon.paint(painter, QRect(rect.left() + self.MARGIN, rect.top() + self.MARGIN,
+                                      self.icon_size.width(), self.icon_size.height()))
+        text_left = rect.left() + self.MARGIN + self.icon_size.width() + self.SPACING
+        document = self._document(self.html(index), self._text_width(rect.width()), opt.font)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        color_role = QPalette.HighlightedText if opt.state & QStyle.State_Selected else QPalette.Text
+        context.palette.setColor(QPalette.Text, opt.palette.color(color_role))
+        painter.save()
+        painter.translate(text_left, rect.top() + self.MARGIN)
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+        if index.data(MaintenanceListModel.BusyRole):
+            bar = QStyleOptionProgressBar()
+            bar.state = QStyle.State_Enabled | QStyle.State_Horizontal
+            bar.minimum = bar.maximum = bar.progress = 0
+            bar.rect = QRect(rect.right() - self.MARGIN - self.BUSY_BAR_WIDTH,
+                             rect.bottom() - self.MARGIN - 12, self.BUSY_BAR_WIDTH, 12)
+            style.drawControl(QStyle.CE_ProgressBar, bar, painter, widget)
+
+    def sizeHint(self, option, index):
+        widget = option.widget
+        width = widget.viewport().width() if widget is not None else option.rect.width()
+        document = self._document(self.html(index), self._text_width(width), option.font)
+        height = max(document.size().height(), self.icon_size.height())
+        return QSize(width, int(height) + 2 * self.MARGIN)
+
+
+class PrinterListModel(QAbstractListModel):
+    """Hasil pencarian PrinterIndex; hanya daftar baris indeks, teks dibuat untuk baris yang tampil.
+
+    Hasil diserahkan ke view per halaman lewat fetchMore: layout QListView
+    sebanding jumlah baris model, jadi setiap ketukan kunci cukup menata
+    satu halaman, bukan ribuan antrean.
+    """
+    PAGE_SIZE = 200
+
+    def __init__(self, index=None, parent=None):
+        super().__init__(parent)
+        self.printer_index = index or PrinterIndex()
+        self.query = ""
+        self._rows = self.printer_index.search("")
+        self._loaded = min(self.PAGE_SIZE, len(self._rows))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._load_until(self._loaded + self.PAGE_SIZE)
+
+    def _load_until(self, count):
+        count = min(count, len(self._rows))
+        if count > self._loaded:
+            self.beginInsertRows(QModelIndex(), self._loaded, count - 1)
+            self._loaded = count
+            self.endInsertRows()
+
+    def match_count(self):
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        printer_index = self.printer_index
+        if role == Qt.DisplayRole:
+            name = printer_index.names[row]
+            location = printer_index.locations[row]
+            default = " (default)" if name == printer_index.default else ""
+            return f"{name}{default} \u2014 {location}" if location else f"{name}{default}"
+        if role == Qt.ToolTipRole:
+            info = printer_index.printer(row)
+            return f"{info['model']}\n{info['location']}\nState: {info['state'] or 'unknown'}"
+        if role == Qt.ForegroundRole and printer_index.states[row] == PRINTER_STATE_STOPPED:
+            return QColor(Qt.gray)
+        return None
+
+    def name(self, row):
+        return self.printer_index.names[self._rows[row]]
+
+    def row_of(self, name, load=False):
+        """Posisi printer di hasil; load=True memuat halaman sampai baris itu."""
+        index_row = self.printer_index.row_of(name)
+        try:
+            row = self._rows.index(index_row)
+        except ValueError:
+            return -1
+        if load:
+            self._load_until(row + 1)
+        return row if row < self._loaded else -1
+
+    def set_query(self, query):
+        self.query = query
+        self.beginResetModel()
+        self._rows = self.printer_index.search(query)
+        self._loaded = min(self.PAGE_SIZE, len(self._rows))
+        self.endResetModel()
+
+    def set_index(self, printer_index):
+        """Mengganti snapshot (mis. setelah penyegaran latar) dengan kueri yang sama."""
+        self.printer_index = printer_index
+        self.set_query(self.query)
+
+    def update_state(self, name, state):
+        if not self.printer_index.set_state(name, state):
+            return
+        row = self.row_of(name)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ForegroundRole, Qt.ToolTipRole])
+
+
+class PrinterPickerPopup(QFrame):
+    """Popup pemilih printer: kotak cari inkremental di atas daftar hasil."""
+    printer_chosen = Signal(str)
+
+    def __init__(self, model, current=None, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.setFrameShape(QFrame.StyledPanel)
+        self.model = model
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search name, location, model or state:idle...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setText(model.query)
+        self.search_edit.textChanged.connect(self._on_search)
+        self.search_edit.returnPressed.connect(self._choose_current)
+        self.search_edit.installEventFilter(self)
+        layout.addWidget(self.search_edit)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(model)
+        self.list_view.clicked.connect(lambda index: self._choose(index.row()))
+        self.list_view.activated.connect(lambda index: self._choose(index.row()))
+        layout.addWidget(self.list_view)
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        model.modelReset.connect(self._update_count)
+        self._update_count()
+        row = model.row_of(current, load=True) if current else -1
+        self.list_view.setCurrentIndex(model.index(max(row, 0)))
+        self.list_view.scrollTo(self.list_view.currentIndex(), QAbstractItemView.PositionAtCenter)
+        self.search_edit.setFocus()
+
+    def _on_search(self, text):
+        self.model.set_query(text)
+        self.list_view.setCurrentIndex(self.model.index(0))
+
+    def _update_count(self):
+        self.count_label.setText(f"{self.model.match_count()} of {len(self.model.printer_index)} printers")
+
+    def eventFilter(self, watched, event):
+        # Panah atas/bawah di kotak cari menggerakkan pilihan daftar.
+        if watched is self.search_edit and event.type() == QEvent.KeyPress \
+                and event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            QApplication.sendEvent(self.list_view, event)
+            return True
+        return super().eventFilter(watched, event)
+
+    def _choose_current(self):
+        index = self.list_view.currentIndex()
+        if index.isValid():
+            self._choose(index.row())
+
+    def _choose(self, row):
+        self.printer_chosen.emit(self.model.name(row))
+        self.close()
+
+    def closeEvent(self, event):
+        self.model.modelReset.disconnect(self._update_count)
+        super().closeEvent(event)
+
+
+class PresetManagerDialog(QDialog):
+    """Add/Remove Presets: menyimpan pengaturan saat ini sebagai preset atau menghapus preset."""
+
+    def __init__(self, preset_model, settings, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add/Remove Presets")
+        self.setMinimumSize(420, 420)
+        self.preset_model = preset_model
+        self.settings = settings
+
+        layout = QVBoxLayout(self)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter presets...")
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(preset_model)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.proxy_model)
+        self.list_view.selectionModel().currentChanged.connect(self._update_buttons)
+        layout.addWidget(self.list_view, 1)
+
+        buttons_layout = QHBoxLayout()
+        self.save_button = QPushButton(get_icon("list-add", "document-new", QStyle.SP_FileDialogNewFolder),
+                                       "Save Current Settings...")
+        self.save_button.clicked.connect(self.save_current)
+        self.remove_button = QPushButton(get_icon("list-remove", "edit-delete", QStyle.SP_TrashIcon), "Remove")
+        self.remove_button.clicked.connect(self.remove_selected)
+        close_button = QPushButton(get_icon("window-close", "dialog-close", QStyle.SP_DialogCloseButton), "Close")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(self.save_button)
+        buttons_layout.addWidget(self.remove_button)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+        self._update_buttons()
+
+    def current_name(self):
+        index = self.list_view.currentIndex()
+        return self.preset_model.name(self.proxy_model.mapToSource(index).row()) if index.isValid() else None
+
+    def _update_buttons(self, *args):
+        name = self.current_name()
+        self.remove_button.setEnabled(bool(name) and not self.preset_model.store.is_builtin(name))
+
+    def save_current(self):
+        name, ok = QInputDialog.getText(self, "Save Preset", "Preset name:", text=self.current_name() or "")
+        name = name.strip()
+        if not ok or not name:
+            return
+        store = self.preset_model.store
+        if store.is_builtin(name):
+            QMessageBox.warning(self, "Save Preset", f"'{name}' is a built-in preset and cannot be replaced.")
+            return
+        if name in store and QMessageBox.question(
+                self, "Save Preset", f"Replace preset '{name}'?") != QMessageBox.Yes:
+            return
+        store.save(name, settings_for_preset(self.settings.as_dict()))
+        self.preset_model.reload()
+        self._select(name)
+
+    def remove_selected(self):
+        name = self.current_name()
+        if not name or QMessageBox.question(self, "Remove Preset", f"Remove preset '{name}'?") != QMessageBox.Yes:
+            return
+        self.preset_model.store.delete(name)
+        self.preset_model.reload()
+        self._update_buttons()
+
+    def _select(self, name):
+        row = self.preset_model.row_of(name)
+        if row >= 0:
+            self.list_view.setCurrentIndex(self.proxy_model.mapFromSource(self.preset_model.index(row)))
+
+
+class JobQueueModel(QAbstractTableModel):
+    """Model tabel antrean job yang dibaca bertahap (fetchMore) dan diperbarui per baris.
+
+    Baris disimpan sebagai tuple job_queue.JOB_ATTRIBUTES dengan indeks job-id
+    terurut; pembaruan diterapkan sebagai sisip/hapus/dataChanged per rentang
+    sehingga seleksi dan posisi gulir tidak pernah di-reset.
+    """
+    COLUMNS = [
+        ("ID", "job-id"), ("Document", "job-name"), ("User", "job-originating-user-name"),
+        ("State", "job-state"), ("Size", "job-k-octets"), ("Priority", "job-priority"),
+        ("Submitted", "time-at-creation"),
+    ]
+
+    def __init__(self, printer_name, cups_client, page_size=DEFAULT_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.printer_name = printer_name
+        self.cups_client = cups_client
+        self.page_size = page_size
+        self._ids = []
+        self._jobs = {}
+        self._next_first_job_id = 1
+        self._fetching = False
+        self._refreshing = False
+        self._fields = [JOB_FIELD[attribute] for _title, attribute in self.COLUMNS]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self._jobs[self._ids[index.row()]]
+        value = job[self._fields[index.column()]]
+        attribute = self.COLUMNS[index.column()][1]
+        if role == Qt.DisplayRole:
+            if value is None:
+                return ""
+            if attribute == "job-state":
+                return JOB_STATE_LABELS.get(value, str(value))
+            if attribute == "job-k-octets":
+                return f"{value} KB"
+            if attribute == "time-at-creation":
+                return time.strftime("%Y-%m-%d %H:%M", time.localtime(value))
+            return str(value)
+        if role == Qt.TextAlignmentRole and attribute in ("job-id", "job-k-octets", "job-priority"):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def job_id(self, row):
+        return self._ids[row]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._next_first_job_id is not None and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        self.cups_client.submit(
+            fetch_jobs_page, self.printer_name, self._next_first_job_id, self.page_size,
+            on_result=self._on_page, on_error=self._on_fetch_error,
+        )
+
+    def _on_page(self, result):
+        jobs, self._next_first_job_id = result
+        self._fetching = False
+        last_id = self._ids[-1] if self._ids else 0
+        self._merge([job for job in jobs if job[0] > last_id], covered_up_to=None)
+        if not jobs and self._next_first_job_id is not None:
+            # Halaman ini hanya berisi job printer lain; tampilan tidak akan meminta lagi.
+            self.fetchMore()
+
+    def _on_fetch_error(self, error):
+        self._fetching = False
+        print(f"Gagal membaca antrean job: {error}")
+
+    def refresh(self):
+        """Membaca ulang rentang job yang sudah dimuat lalu menerapkan selisihnya."""
+        if self._refreshing:
+            return
+        if not self._ids:
+            if self._next_first_job_id is None:
+                self._next_first_job_id = 1
+            self.fetchMore()
+            return
+        self._refreshing = True
+        last_id = self._ids[-1]
+        self.cups_client.submit(
+            fetch_jobs_range, self.printer_name, 1, last_id, self.page_size,
+            on_result=lambda jobs: self._on_refreshed(jobs, last_id), on_error=self._on_refresh_error,
+        )
+
+    def _on_refreshed(self, jobs, last_id):
+        self._refreshing = False
+        self._merge(jobs, covered_up_to=last_id)
+        if self._next_first_job_id is None:
+            # Job baru setelah rentang yang dimuat akan diambil saat tampilan menggulir ke bawah.
+            self._next_first_job_id = last_id + 1
+
+    def _on_refresh_error(self, error):
+        self._refreshing = False
+        print(f"Gagal memperbarui antrean job: {error}")
+
+    @staticmethod
+    def _runs(rows):
+        """Mengelompokkan nomor baris terurut menjadi rentang (awal, akhir) berurutan."""
+        runs = []
+        for row in rows:
+            if runs and row == runs[-1][1] + 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return runs
+
+    def _merge(self, jobs, covered_up_to):
+        """Menerapkan daftar job sebagai selisih terhadap isi model.
+
+        covered_up_to: job-id tertinggi yang dicakup daftar; job yang sudah
+        dimuat sampai batas itu tetapi tidak ada di daftar dianggap selesai
+        dan dihapus. None berarti daftar hanya berisi tambahan.
+        """
+        incoming = {job[0]: job for job in jobs}
+        if covered_up_to is not None:
+            gone = [row for row, job_id in enumerate(self._ids)
+                    if job_id <= covered_up_to and job_id not in incoming]
+            for first, last in reversed(self._runs(gone)):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                for job_id in self._ids[first:last + 1]:
+                    del self._jobs[job_id]
+                del self._ids[first:last + 1]
+                self.endRemoveRows()
+
+        changed = []
+        added = []
+        for job_id, job in incoming.items():
+            current = self._jobs.get(job_id)
+            if current is None:
+                added.append(job_id)
+            elif current != job:
+                self._jobs[job_id] = job
+                changed.append(bisect.bisect_left(self._ids, job_id))
+        for first, last in self._runs(sorted(changed)):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.COLUMNS) - 1))
+
+        # Job baru yang jatuh di posisi sisip yang sama disisipkan sekaligus.
+        groups = {}
+        for job_id in sorted(added):
+            groups.setdefault(bisect.bisect_left(self._ids, job_id), []).append(job_id)
+        for position in sorted(groups, reverse=True):
+            new_ids = groups[position]
+            self.beginInsertRows(QModelIndex(), position, position + len(new_ids) - 1)
+            self._ids[position:position] = new_ids
+            for job_id in new_ids:
+                self._jobs[job_id] = incoming[job_id]
+            self.endInsertRows()
+
+
+class JobArrangerDialog(QDialog):
+    """Job Arranger Lite: melihat dan mengatur antrean job satu printer."""
+    action_progress = Signal(int, int)
+
+    def __init__(self, printer_name, refresh_interval_ms=3000, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Job Arranger Lite - {printer_name}")
+        self.setMinimumSize(720, 480)
+        self.cups_client = CupsClient(parent=self)
+        self.model = JobQueueModel(printer_name, self.cups_client, parent=self)
+
+        layout = QVBoxLayout(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setWordWrap(False)
+        # Tinggi baris tetap: tampilan tidak perlu mengukur tiap baris saat menggulir.
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        vertical_header.hide()
+        horizontal_header = self.table_view.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.Interactive)
+        horizontal_header.setStretchLastSection(True)
+        horizontal_header.resizeSection(1, 240)
+        layout.addWidget(self.table_view, 1)
+
+        buttons_layout = QHBoxLayout()
+        self.action_buttons = []
+        for label, action in (("Hold", "hold"), ("Release", "release"), ("Cancel Job", "cancel"),
+                              ("Move to Top", "top"), ("Move to Bottom", "bottom")):
+            button = QPushButton(label)
+            button.clicked.connect(lambda _checked=False, a=action: self.run_action(a))
+            buttons_layout.addWidget(button)
+            self.action_buttons.append(button)
+        buttons_layout.addStretch(1)
+        refresh_button = QPushButton(get_icon("view-refresh", None, QStyle.SP_BrowserReload), "Refresh")
+        refresh_button.clicked.connect(self.model.refresh)
+        buttons_layout.addWidget(refresh_button)
+        close_button = QPushButton(get_icon("window-close", "dialog-close", QStyle.SP_DialogCloseButton), "Close")
+        close_button.clicked.connect(self.reject)
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+        status_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        status_layout.addWidget(self.status_label, 1)
+        status_layout.addWidget(self.progress_bar)
+        layout.addLayout(status_layout)
+
+        self.action_progress.connect(self._on_action_progress)
+        self.model.rowsInserted.connect(self._update_status)
+        self.model.rowsRemoved.connect(self._update_status)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(refresh_interval_ms)
+        self.refresh_timer.timeout.connect(self.model.refresh)
+        self.model.fetchMore()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def _update_status(self, *args):
+        more = "+" if self.model.canFetchMore() else ""
+        self.status_label.setText(f"{self.model.rowCount()}{more} job(s)")
+
+    def selected_job_ids(self):
+        rows = sorted(index.row() for index in self.table_view.selectionModel().selectedRows())
+        return [self.model.job_id(row) for row in rows]
+
+    def run_action(self, action):
+        job_ids = self.selected_job_ids()
+        if not job_ids:
+            return
+        if action == "cancel" and QMessageBox.question(
+                self, "Cancel Jobs", f"Cancel {len(job_ids)} job(s)?") != QMessageBox.Yes:
+            return
+        for button in self.action_buttons:
+            button.setEnabled(False)
+        self.progress_bar.setRange(0, len(job_ids))
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cups_client.submit(
+            apply_job_action, job_ids, action, progress=self.action_progress.emit, timeout=300,
+            on_result=self._on_action_done, on_error=lambda e: self._on_action_done({None: e}),
+        )
+
+    def _on_action_progress(self, done, total):
+        self.progress_bar.setValue(done)
+
+    def _on_action_done(self, errors):
+        for button in self.action_buttons:
+            button.setEnabled(True)
+        self.progress_bar.hide()
+        if errors:
+            first_error = next(iter(errors.values()))
+            self.status_label.setText(f"{len(errors)} job(s) failed: {first_error}")
+        self.model.refresh()
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        self.cups_client.cancel_all()
+        super().done(result)
+
+
+class FleetDialog(QDialog):
+    """Menerapkan satu preset ke banyak printer sekaligus (lihat fleet.py)."""
+    result_ready = Signal(object)
+    fleet_finished = Signal(list)
+
+    def __init__(self, preset_name=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Apply Preset to Printers")
+        self.setMinimumSize(560, 480)
+        self._cancel_event = threading.Event()
+        self._running = False
+
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(get_preset_store().names())
+        if preset_name:
+            self.preset_combo.setCurrentText(preset_name)
+        form_layout.addRow("Preset:", self.preset_combo)
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, 64)
+        self.workers_spinbox.setValue(16)
+        form_layout.addRow("Parallel connections:", self.workers_spinbox)
+        self.rate_spinbox = QSpinBox()
+        self.rate_spinbox.setRange(0, 1000)
+        self.rate_spinbox.setSpecialValueText("Unlimited")
+        self.rate_spinbox.setSuffix(" printers/s")
+        form_layout.addRow("Rate limit:", self.rate_spinbox)
+        layout.addLayout(form_layout)
+
+        printers_groupbox = QGroupBox("Printers")
+        printers_layout = QVBoxLayout(printers_groupbox)
+        self.printer_list = QListWidget()
+        self.select_all_checkbox = QCheckBox("Select All")
+        self.select_all_checkbox.toggled.connect(self._set_all_checked)
+        printers_layout.addWidget(self.select_all_checkbox)
+        printers_layout.addWidget(self.printer_list)
+        layout.addWidget(printers_groupbox, 1)
+
+        self.results_table = QTableWidget(0, 3)
+        self.results_table.setHorizontalHeaderLabels(["Printer", "Status", "Details"])
+        self.results_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.results_table, 1)
+
+        bottom_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel()
+        self.apply_button = QPushButton(get_icon("dialog-ok-apply", "dialog-ok", QStyle.SP_DialogApplyButton), "Apply")
+        self.apply_button.clicked.connect(self.start)
+        self.cancel_button = QPushButton(get_icon("process-stop", None, QStyle.SP_BrowserStop), "Cancel")
+        self.cancel_button.clicked.connect(self._cancel_event.set)
+        self.cancel_button.setEnabled(False)
+        close_button = QPushButton(get_icon("window-close", "dialog-close", QStyle.SP_DialogCloseButton), "Close")
+        close_button.clicked.connect(self.reject)
+        bottom_layout.addWidget(self.progress_bar, 1)
+        bottom_layout.addWidget(self.status_label)
+        bottom_layout.addWidget(self.apply_button)
+        bottom_layout.addWidget(self.cancel_button)
+        bottom_layout.addWidget(close_button)
+        layout.addLayout(bottom_layout)
+
+        self.result_ready.connect(self._on_result)
+        self.fleet_finished.connect(self._on_finished)
+        self.cups_client = CupsClient(parent=self)
+        self.cups_client.call("getPrinters", on_result=self._on_printers,
+                              on_error=lambda e: self.status_label.setText(f"Cannot list printers: {e}"))
+
+    def _on_printers(self, printers):
+        for name in sorted(printers):
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.printer_list.addItem(item)
+        self.status_label.setText(f"{len(printers)} printer(s)")
+
+    def _set_all_checked(self, checked):
+        state = Qt.Checked if checked else Qt.Unchecked
+        for row in range(self.printer_list.count()):
+            self.printer_list.item(row).setCheckState(state)
+
+    def selected_printers(self):
+        return [self.printer_list.item(row).text() for row in range(self.printer_list.count())
+                if self.printer_list.item(row).checkState() == Qt.Checked]
+
+    def start(self):
+        printers = self.selected_printers()
+        if not printers or self._running:
+            return
+        self._running = True
+        self._cancel_event.clear()
+        self.apply_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.results_table.setRowCount(0)
+        self.progress_bar.setRange(0, len(printers))
+        self.progress_bar.setValue(0)
+        options = preset_options(self.preset_combo.currentText())
+        # Driver fleet berjalan di thread sendiri; hasil tiap printer lewat sinyal.
+        thread = threading.Thread(
+            target=self._run, name="fleet-driver", daemon=True,
+            args=(printers, options, self.workers_spinbox.value(), self.rate_spinbox.value() or None),
+        )
+        thread.start()
+
+    def _run(self, printers, options, max_workers, rate):
+        try:
+            results = apply_options_to_printers(
+                printers, options, max_workers=max_workers, rate=rate,
+                on_result=self.result_ready.emit, cancel_event=self._cancel_event,
+            )
+        except Exception as e:
+            print(f"Fleet gagal: {e}")
+            results = []
+        self.fleet_finished.emit(results)
+
+    def _on_result(self, result):
+        row = self.results_table.rowCount()
+        self.results_table.insertRow(row)
+        self.results_table.setItem(row, 0, QTableWidgetItem(result.printer))
+        status = "OK" if result.ok else ("Skipped" if result.skipped else "Failed")
+        self.results_table.setItem(row, 1, QTableWidgetItem(status))
+        details = (", ".join(f"{k}={v}" for k, v in result.changes.items()) or "No changes") if result.ok else str(result.error)
+        self.results_table.setItem(row, 2, QTableWidgetItem(details))
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+
+    def _on_finished(self, results):
+        self._running = False
+        self.apply_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        skipped = sum(1 for result in results if result.skipped)
+        failed = sum(1 for result in results if not result.ok) - skipped
+        text = f"{len(results) - failed - skipped} succeeded, {failed} failed"
+        self.status_label.setText(f"{text}, {skipped} skipped" if skipped else text)
+
+    def done(self, result):
+        self._cancel_event.set()
+        self.cups_client.cancel_all()
+        super().done(result)
+
+
+class PrintFilesDialog(QDialog):
+    """Mengirim banyak file ke printer aktif dengan pengaturan dialog (lihat print_queue.py).
+
+    Unggahan berjalan di thread driver; kemajuan dibaca dari PrintProgress
+    oleh timer, bukan sinyal per chunk, sehingga ratusan dokumen tidak
+    membanjiri event loop.
+    """
+    result_ready = Signal(object)
+    batch_finished = Signal(list)
+
+    def __init__(self, printer_name, options, watermark=None, header_footer=False, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Print Files - {printer_name}")
+        self.setMinimumSize(560, 480)
+        self.printer_name = printer_name
+        self.options = options
+        self.watermark = watermark
+        self.header_footer = header_footer
+        self._cancel_event = threading.Event()
+        self._progress = None
+        self._running = False
+
+        layout = QVBoxLayout(self)
+        files_groupbox = QGroupBox("Documents")
+        files_layout = QVBoxLayout(files_groupbox)
+        self.file_list = QListWidget()
+        self.file_list.setUniformItemSizes(True)
+        files_layout.addWidget(self.file_list)
+        file_buttons_layout = QHBoxLayout()
+        add_files_button = QPushButton(get_icon("document-open", None, QStyle.SP_DialogOpenButton), "Add Files...")
+        add_files_button.clicked.connect(self.add_files)
+        add_folder_button = QPushButton(get_icon("folder-open", None, QStyle.SP_DirOpenIcon), "Add Folder...")
+        add_folder_button.clicked.connect(self.add_folder)
+        clear_button = QPushButton(get_icon("edit-clear", None, QStyle.SP_DialogResetButton), "Clear")
+        clear_button.clicked.connect(self.file_list.clear)
+        for button in (add_files_button, add_folder_button, clear_button):
+            file_buttons_layout.addWidget(button)
+        file_buttons_layout.addStretch(1)
+        files_layout.addLayout(file_buttons_layout)
+        layout.addWidget(files_groupbox, 1)
+
+        form_layout = QFormLayout()
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, 16)
+        self.workers_spinbox.setValue(DEFAULT_PER_PRINTER)
+        form_layout.addRow("Parallel uploads:", self.workers_spinbox)
+        layout.addLayout(form_layout)
+
+        self.results_table = QTableWidget(0, 3)
+        self.results_table.setHorizontalHeaderLabels(["File", "Status", "Details"])
+        self.results_table.horizontalHeader().setStretchLastSection(True)
+        self.results_table.verticalHeader().hide()
+        layout.addWidget(self.results_table, 1)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        bottom_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        # Skala per mil: jumlah byte bisa melewati batas int QProgressBar.
+        self.progress_bar.setRange(0, 1000)
+        self.print_button = QPushButton(get_icon("document-print", "printer", QStyle.SP_DialogApplyButton), "Print")
+        self.print_button.clicked.connect(self.start)
+        self.cancel_button = QPushButton(get_icon("process-stop", None, QStyle.SP_BrowserStop), "Cancel")
+        self.cancel_button.clicked.connect(self._cancel_event.set)
+        self.cancel_button.setEnabled(False)
+        close_button = QPushButton(get_icon("window-close", "dialog-close", QStyle.SP_DialogCloseButton), "Close")
+        close_button.clicked.connect(self.reject)
+        bottom_layout.addWidget(self.progress_bar, 1)
+        bottom_layout.addWidget(self.print_button)
+        bottom_layout.addWidget(self.cancel_button)
+        bottom_layout.addWidget(close_button)
+        layout.addLayout(bottom_layout)
+
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(250)
+        self.progress_timer.timeout.connect(self._update_progress)
+        self.result_ready.connect(self._on_result)
+        self.batch_finished.connect(self._on_finished)
+
+    def add_paths(self, paths):
+        for path in paths:
+            self.file_list.addItem(path)
+        self.status_label.setText(f"{self.file_list.count()} item(s)")
+
+    def add_files(self):
+        paths, _filter = QFileDialog.getOpenFileNames(
+            self, "Add Files", "", "Printable files (*.pdf *.ps *.txt *.jpg *.jpeg *.png);;All files (*)")
+        self.add_paths(paths)
+
+    def add_folder(self):
+        # Isi folder baru dibaca saat mencetak, di thread driver.
+        path = QFileDialog.getExistingDirectory(self, "Add Folder")
+        if path:
+            self.add_paths([path])
+
+    def start(self):
+        patterns = [self.file_list.item(row).text() for row in range(self.file_list.count())]
+        if not patterns or self._running:
+            return
+        self._running = True
+        self._cancel_event.clear()
+        self._progress = PrintProgress()
+        self.print_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.results_table.setRowCount(0)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Reading files...")
+        thread = threading.Thread(target=self._run, name="print-driver", daemon=True,
+                                  args=(patterns, self.workers_spinbox.value(), self._progress))
+        thread.start()
+        self.progress_timer.start()
+
+    def _run(self, patterns, workers, progress):
+        try:
+            paths = expand_documents(patterns)
+            results = submit_documents(
+                paths, [self.printer_name], self.options, watermark=self.watermark,
+                header_footer=self.header_footer, max_workers=workers, per_printer=workers,
+                on_result=self.result_ready.emit, progress=progress, cancel_event=self._cancel_event,
+            )
+        except Exception as e:
+            print(f"Pengiriman dokumen gagal: {e}")
+            results = [PrintResult(self.printer_name, "", False, error=e)]
+        self.batch_finished.emit(results)
+
+    def _update_progress(self):
+        snapshot = self._progress.snapshot()
+        if snapshot["bytes_total"]:
+            self.progress_bar.setValue(min(1000, snapshot["bytes_sent"] * 1000 // snapshot["bytes_total"]))
+        if snapshot["files_total"]:
+            self.status_label.setText(describe_progress(snapshot))
+
+    def _on_result(self, result):
+        row = self.results_table.rowCount()
+        self.results_table.insertRow(row)
+        self.results_table.setItem(row, 0, QTableWidgetItem(os.path.basename(result.path)))
+        if isinstance(result.error, PrintCanceled):
+            status, details = "Canceled", ""
+        else:
+            status = "Sent" if result.ok else "Failed"
+            details = f"Job {result.job_id}" if result.ok else str(result.error)
+        self.results_table.setItem(row, 1, QTableWidgetItem(status))
+        self.results_table.setItem(row, 2, QTableWidgetItem(details))
+
+    def _on_finished(self, results):
+        self._running = False
+        self.progress_timer.stop()
+        self.print_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self._update_progress()
+        if len(results) == 1 and not results[0].path:
+            self.status_label.setText(f"Cannot print: {results[0].error}")
+
+    def done(self, result):
+        self._cancel_event.set()
+        self.progress_timer.stop()
+        super().done(result)
+
+
+class InstanceServer(QObject):
+    """QLocalServer untuk mode resident; setiap permintaan klien menjadi request_received."""
+    request_received = Signal(dict)
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path or socket_path()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        # Socket sisa proses yang mati dibersihkan dulu; forward_to_running sudah
+        # memastikan tidak ada instance hidup yang mendengarkan.
+        QLocalServer.removeServer(self.path)
+        if not self._server.listen(self.path):
+            print(f"Mode resident tidak aktif: {self._server.errorString()}")
+            return False
+        return True
+
+    def close(self):
+        self._server.close()
+        QLocalServer.removeServer(self.path)
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            connection = self._server.nextPendingConnection()
+            self._buffers[connection] = b""
+            connection.readyRead.connect(lambda c=connection: self._on_ready_read(c))
+            connection.disconnected.connect(lambda c=connection: self._forget(c))
+
+    def _forget(self, connection):
+        self._buffers.pop(connection, None)
+        connection.deleteLater()
+
+    def _on_ready_read(self, connection):
+        data = self._buffers.get(connection, b"") + bytes(connection.readAll())
+        if b"\n" not in data:
+            self._buffers[connection] = data
+            return
+        line = data.split(b"\n", 1)[0]
+        try:
+            request = decode_request(line)
+        except ValueError as e:
+            print(f"Permintaan instance tidak valid: {e}")
+            connection.disconnectFromServer()
+            return
+        connection.write(b"ok\n")
+        connection.flush()
+        connection.disconnectFromServer()
+        self.request_received.emit(request)
+
+
+class LinuxPrinterPreferencesDialog(QDialog):
+    default_printer_changed = Signal(str)
+    printer_status_changed = Signal(str, dict)
+    printer_events = Signal(list)
+    printer_index_loaded = Signal(object)
+    apply_progress = Signal(int, int)
+    settings_applied = Signal(dict)
+    # Daftar printer disegarkan ulang paling lambat setelah selang ini saat pemilih dibuka.
+    PRINTER_LIST_MAX_AGE = 300
+
+    def __init__(self, parent=None, lazy_tabs=True, prebuild_tabs=True, settings=None, printer_name=None):
+        super().__init__(parent)
+        self.setWindowTitle("Printing Preferences (Linux Style with Fallback Icons)")
+        self.setMinimumSize(750, 600) 
+        self.settings = settings if settings is not None else SettingsModel()
+        self.prebuild_tabs = prebuild_tabs
+        self._first_paint_done = False
+        self.capabilities = None
+        self._preview_labels = []
+        self._ink_levels_button = None
+        self._left_panel = None
+        self._left_panel_tab = None
+        self._left_panel_slots = {}
+        self.preview_renderer = PreviewRenderer(
+            self.settings, size=QSize(80, 80), device_pixel_ratio=self.devicePixelRatioF(), parent=self
+        )
+        self.preview_renderer.preview_ready.connect(self._on_preview_ready)
+        self._constraint_widgets = {}
+        self._constraint_keys = {}
+        self.constraint_engine = None
+        self._load_constraints(dialog_engine())
+        self.settings.subscribe(self._on_setting_for_constraints)
+        self.preset_model = PresetListModel(parent=self)
+        self.preset_selection = QItemSelectionModel(self.preset_model, self)
+        self.preset_selection.currentChanged.connect(self._on_preset_selected)
+        self.printer_status = {}
+        self.maintenance_model = MaintenanceListModel(MAINTENANCE_ITEMS, parent=self)
+        self._maintenance_jobs = {}
+        self._maintenance_polling = set()
+        self._maintenance_sending = set()
+        self._maintenance_timer = QTimer(self)
+        self._maintenance_timer.setInterval(1000)
+        self._maintenance_timer.timeout.connect(self._poll_maintenance_jobs)
+        self.status_monitor = None
+        self.printer_status_changed.connect(self._on_printer_status_changed)
+        self.printer_list_model = PrinterListModel(parent=self)
+        self._printer_list_requested = False
+        self._printer_list_timer = QTimer(self)
+        self._printer_list_timer.setSingleShot(True)
+        self._printer_list_timer.setInterval(1000)
+        self._printer_list_timer.timeout.connect(self.refresh_printer_list)
+        self.printer_events.connect(self._on_printer_events)
+        self.printer_index_loaded.connect(self._on_printer_index)
+
+        main_dialog_layout = QVBoxLayout(self)
+        printer_row = QHBoxLayout()
+        printer_row.addWidget(QLabel("Printer:"))
+        printer_icon = get_icon("printer", "printer-printing", QStyle.SP_DriveHDIcon)
+        self.printer_button = QPushButton(printer_icon, "No printer")
+        self.printer_button.setToolTip("Choose another printer")
+        self.printer_button.clicked.connect(self.show_printer_picker)
+        printer_row.addWidget(self.printer_button)
+        printer_row.addStretch(1)
+        main_dialog_layout.addLayout(printer_row)
+        self.tab_widget = QTabWidget()
+        self.tab_main = QWidget()
+        self.tab_more_options = QWidget()
+        self.tab_maintenance = QWidget()
+
+        self.tab_widget.addTab(self.tab_main, "Main")
+        self.tab_widget.addTab(self.tab_more_options, "More Options")
+        self.tab_widget.addTab(self.tab_maintenance, "Maintenance")
+
+        # Tab selain "Main" dibangun saat pertama kali dipilih (atau saat idle).
+        self._tab_builders = {
+            self.tab_main: self.setup_main_tab,
+            self.tab_more_options: self.setup_more_options_tab,
+            self.tab_maintenance: self.setup_maintenance_tab,
+        }
+        self._built_tabs = set()
+        self._capability_combos = []
+        self.ensure_tab_built(self.tab_main)
+        if lazy_tabs:
+            self.tab_widget.currentChanged.connect(
+                lambda index: self.ensure_tab_built(self.tab_widget.widget(index))
+            )
+        else:
+            self.ensure_tab_built(self.tab_more_options)
+            self.ensure_tab_built(self.tab_maintenance)
+        self.tab_widget.currentChanged.connect(lambda index: self._move_left_panel(self.tab_widget.widget(index)))
+
+        main_dialog_layout.addWidget(self.tab_widget)
+
+        bottom_button_layout = QHBoxLayout()
+        help_icon = get_icon("help-contents", "help-faq", QStyle.SP_DialogHelpButton)
+        self.help_button = QPushButton(help_icon, "Help")
+
+        self.dialog_button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.dialog_button_box.rejected.connect(self.reject)
+
+        self.apply_status_label = QLabel()
+        self.apply_progress_bar = QProgressBar()
+        self.apply_progress_bar.setMaximumWidth(160)
+        self.apply_progress_bar.hide()
+        self.apply_progress.connect(self._on_apply_progress)
+
+        bottom_button_layout.addWidget(self.apply_status_label)
+        bottom_button_layout.addWidget(self.apply_progress_bar)
+        bottom_button_layout.addStretch(1)
+        bottom_button_layout.addWidget(self.help_button)
+        bottom_button_layout.addWidget(self.dialog_button_box)
+        main_dialog_layout.addLayout(bottom_button_layout)
+
+        self.help_button.clicked.connect(self.show_help)
+        self.dialog_button_box.accepted.connect(self.apply_settings)
+        self.dialog_button_box.rejected.connect(self.reject)
+
+        # Data printer diisi belakangan oleh pekerja CUPS; dialog tampil lebih dulu.
+        self.cups_client = CupsClient(parent=self)
+        self.printer_name = None
+        self._shown_settings = None
+        if printer_name:
+            self._on_default_printer(printer_name)
+        else:
+            self.get_default_printer()
+
+    def get_default_printer(self):
+        """Meminta printer default secara asinkron; hasilnya lewat default_printer_changed."""
+        return self.cups_client.call(
+            "getDefault",
+            on_result=self._on_default_printer,
+            on_error=lambda e: print("No default printer found:", e),
+        )
+
+    def _on_default_printer(self, name):
+        if not name:
+            print("No default printer found.")
+            return
+        self.select_printer(name)
+
+    def select_printer(self, name):
+        """Mengganti printer aktif; hanya model kemampuan dan status yang dimuat ulang, dialog tetap."""
+        previous = self.printer_name
+        if previous and previous != name:
+            if self.status_monitor is not None:
+                self.status_monitor.remove_printer(previous)
+            self.printer_status = {}
+            if self._ink_levels_button is not None:
+                self._ink_levels_button.setToolTip("")
+        self.printer_name = name
+        self.printer_button.setText(name)
+        self.setWindowTitle(f"{name} - Printing Preferences")
+        self.default_printer_changed.emit(name)
+        self.refresh_capabilities()
+        self.start_status_monitor()
+
+    def start_status_monitor(self):
+        """Memantau status dan tinta printer aktif di thread latar; perubahan lewat printer_status_changed."""
+        if self.status_monitor is None:
+            # Dipanggil dari thread pemantau; sinyal membawa datanya ke thread GUI.
+            self.status_monitor = StatusMonitor(
+                [], self.printer_status_changed.emit, on_events=self.printer_events.emit).start()
+        if self.printer_name:
+            self.status_monitor.add_printer(self.printer_name)
+
+    def load_printer_list(self):
+        """Memuat daftar printer dari cache disk lalu menyegarkannya dari server, keduanya di latar."""
+        self._printer_list_requested = True
+        # Membangun indeks ribuan printer butuh ratusan ms; jangan di thread GUI.
+        threading.Thread(target=lambda: self.printer_index_loaded.emit(load_cached_index()),
+                         name="printer-index", daemon=True).start()
+        self.refresh_printer_list()
+
+    def refresh_printer_list(self):
+        return self.cups_client.submit(
+            refresh_index,
+            on_result=self._on_printer_index,
+            on_error=lambda e: print(f"Gagal membaca daftar printer: {e}"),
+        )
+
+    def _on_printer_index(self, printer_index):
+        # Cache disk yang selesai belakangan tidak boleh menimpa snapshot server.
+        if printer_index.fetched_at < self.printer_list_model.printer_index.fetched_at:
+            return
+        self.printer_list_model.set_index(printer_index)
+
+    @tracked("printer_events")
+    def _on_printer_events(self, events):
+        for event in events:
+            if event.get("notify-subscribed-event") == "printer-state-changed":
+                self.printer_list_model.update_state(event.get("printer-name"), event.get("printer-state"))
+            elif not self._printer_list_timer.isActive():
+                # Printer ditambah/dihapus/diubah: satu penyegaran untuk semburan event.
+                self._printer_list_timer.start()
+
+    def show_printer_picker(self):
+        if not self._printer_list_requested:
+            self.load_printer_list()
+        elif time.time() - self.printer_list_model.printer_index.fetched_at > self.PRINTER_LIST_MAX_AGE:
+            self.refresh_printer_list()
+        popup = PrinterPickerPopup(self.printer_list_model, self.printer_name, parent=self)
+        popup.setAttribute(Qt.WA_DeleteOnClose)
+        popup.printer_chosen.connect(self.select_printer)
+        popup.resize(max(self.printer_button.width(), 420), 360)
+        popup.move(self.printer_button.mapToGlobal(self.printer_button.rect().bottomLeft()))
+        popup.show()
+        return popup
+
+    @tracked("printer_status_changed")
+    def _on_printer_status_changed(self, printer_name, changed):
+        if printer_name != self.printer_name:
+            return
+        self.printer_status.update(changed)
+        if self._ink_levels_button is not None and {"marker-names", "marker-levels"} & changed.keys():
+            levels = ", ".join(
+                f"{name}: {level}%" if level >= 0 else f"{name}: ?"
+                for name, level, _color in marker_entries(self.printer_status)
+            )
+            self._ink_levels_button.setToolTip(levels)
+
+    def show_ink_levels(self):
+        if not self.printer_name:
+            QMessageBox.information(self, "Ink Levels", "No printer available.")
+            return None
+        ink_dialog = InkLevelsDialog(self.printer_name, self.printer_status, parent=self)
+        ink_dialog.setAttribute(Qt.WA_DeleteOnClose)
+        self.printer_status_changed.connect(ink_dialog.update_status)
+        self.status_monitor.refresh(self.printer_name)
+        ink_dialog.show()
+        return ink_dialog
+
+    def refresh_capabilities(self):
+        """Memuat model kemampuan printer aktif (dari cache disk bila masih berlaku)."""
+        if not self.printer_name:
+            return None
+        return self.cups_client.submit(
+            load_capabilities, self.printer_name,
+            on_result=self._on_capabilities,
+            on_error=lambda e: print(f"Gagal membaca kemampuan printer {self.printer_name}: {e}"),
+        )
+
+    def _on_capabilities(self, caps):
+        if caps.printer_name != self.printer_name:
+            return
+        self.capabilities = caps
+        self.preset_model.set_printer_model(caps.make_and_model)
+        for entry in self._capability_combos:
+            self._fill_capability_combo(*entry)
+        self._load_constraints(ConstraintEngine.from_dict(caps.constraints) if caps.constraints else dialog_engine())
+
+    def _constraint_term(self, settings_key, value):
+        """(keyword, choice) engine untuk satu nilai pengaturan dialog."""
+        keyword = self.capabilities.source_for(settings_key) if self.capabilities is not None else None
+        if keyword is None:
+            return settings_key, value
+        return keyword, self.capabilities.value_for_label(keyword, value)
+
+    def _load_constraints(self, engine):
+        self.constraint_engine = engine
+        for key, value in self.settings.as_dict().items():
+            engine.select(*self._constraint_term(key, value))
+        self._constraint_keys = {}
+        for key in self._constraint_widgets:
+            self._constraint_keys.setdefault(self._constraint_term(key, None)[0], []).append(key)
+        for key in self._constraint_widgets:
+            self._apply_constraints(key)
+
+    def _register_constraint_widget(self, settings_key, widget):
+        """Widget yang status aktif/pilihannya mengikuti mesin constraint."""
+        self._constraint_widgets[settings_key] = widget
+        self._constraint_keys.setdefault(self._constraint_term(settings_key, None)[0], []).append(settings_key)
+        self._apply_constraints(settings_key)
+
+    def _on_setting_for_constraints(self, key, value):
+        # Hanya widget yang berbagi constraint dengan opsi ini yang dievaluasi ulang.
+        for keyword in self.constraint_engine.select(*self._constraint_term(key, value)):
+            for affected_key in self._constraint_keys.get(keyword, ()):
+                self._apply_constraints(affected_key)
+
+    def _apply_constraints(self, settings_key):
+        widget = self._constraint_widgets[settings_key]
+        keyword = self._constraint_term(settings_key, None)[0]
+        engine = self.constraint_engine
+        if not engine.constrained(keyword):
+            return
+        if isinstance(widget, QComboBox):
+            model = widget.model()
+            for row in range(widget.count()):
+                value = widget.itemData(row)
+                if value is not None:
+                    model.item(row).setEnabled(not engine.conflicts(keyword, value))
+        elif isinstance(widget, QButtonGroup):
+            for button in widget.buttons():
+                button.setEnabled(not engine.conflicts(keyword, button.text()))
+        elif widget.isCheckable():
+            blocked = engine.conflicts(keyword, True)
+            if blocked and widget.isChecked():
+                widget.setChecked(False)
+            widget.setEnabled(not blocked)
+        else:
+            widget.setEnabled(not engine.conflicts(keyword, True))
+
+    def _register_capability_combo(self, settings_key, combo, source_key=None, leading_items=(), trailing_items=()):
+        """Mendaftarkan combo yang isinya diambil dari model kemampuan printer.
+
+        Panggil sebelum bind_setting; isi bawaan combo dipakai selama model
+        kemampuan belum tersedia.
+        """
+        entry = (settings_key, combo, source_key or settings_key, tuple(leading_items), tuple(trailing_items))
+        self._capability_combos.append(entry)
+        if self.capabilities is not None:
+            self._fill_capability_combo(*entry)
+        if source_key is None:
+            self._register_constraint_widget(settings_key, combo)
+
+    def _fill_capability_combo(self, settings_key, combo, source_key, leading_items, trailing_items):
+        choices = self.capabilities.choices_for(source_key)
+        if not choices:
+            return
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems(leading_items)
+        for value, label in choices:
+            combo.addItem(label, value)
+        combo.addItems(trailing_items)
+        combo.blockSignals(False)
+
+        labels = list(leading_items) + [label for _value, label in choices]
+        current = self.settings.get(settings_key)
+        if current in labels:
+            target = current
+        else:
+            target = self.capabilities.default_label_for(source_key) or labels[0]
+            if leading_items:
+                target = leading_items[0]
+        combo.setCurrentText(target)
+        self.settings.set(settings_key, combo.currentText())
+
+    def ensure_tab_built(self, tab):
+        """Membangun isi tab jika belum; mengembalikan True jika baru dibangun."""
+        if tab in self._built_tabs or tab not in self._tab_builders:
+            return False
+        self._built_tabs.add(tab)
+        builder = self._tab_builders[tab]
+        with get_profiler().phase(builder.__name__, "tabs"), get_metrics().handler(f"tab:{builder.__name__}"):
+            builder()
+        return True
+
+    def showEvent(self, event):
+        get_profiler().mark("first_show")
+        if not self._printer_list_requested:
+            QTimer.singleShot(0, self.load_printer_list)
+        # Cancel mengembalikan pengaturan ke keadaan saat dialog ditampilkan.
+        self._shown_settings = self.settings.as_dict()
+        super().showEvent(event)
+        if self.prebuild_tabs and len(self._built_tabs) < len(self._tab_builders):
+            QTimer.singleShot(0, self._prebuild_next_tab)
+
+    def paintEvent(self, event):
+        profiler = get_profiler()
+        if profiler.enabled and not self._first_paint_done:
+            self._first_paint_done = True
+            profiler.mark("first_paint")
+            QTimer.singleShot(0, profiler.write)
+        super().paintEvent(event)
+
+    def _prebuild_next_tab(self):
+        # Satu tab per putaran event loop agar GUI tetap responsif.
+        for index in range(self.tab_widget.count()):
+            if self.ensure_tab_built(self.tab_widget.widget(index)):
+                QTimer.singleShot(0, self._prebuild_next_tab)
+                return
+
+    def done(self, result):
+        self.cups_client.cancel_all()
+        if self.status_monitor is not None:
+            self.status_monitor.stop()
+            self.status_monitor = None
+        if result == QDialog.Rejected and self._shown_settings is not None:
+            self.settings.update(self._shown_settings)
+        # Setelah pemulihan pengaturan, agar tidak memicu render baru.
+        self.preview_renderer.stop()
+        super().done(result)
+
+    TAB_NAMES = {"main": "tab_main", "more-options": "tab_more_options", "maintenance": "tab_maintenance"}
+
+    def select_tab(self, name):
+        tab = getattr(self, self.TAB_NAMES.get(name, ""), None)
+        if tab is not None:
+            self.ensure_tab_built(tab)
+            self.tab_widget.setCurrentWidget(tab)
+
+    @tracked("reactivate")
+    def reactivate(self, printer_name=None, tab=None):
+        """Menampilkan ulang dialog yang sudah dibangun (mode resident) dengan data printer terbaru."""
+        if printer_name:
+            self._on_default_printer(printer_name)
+        else:
+            self.get_default_printer()
+        if tab:
+            self.select_tab(tab)
+        self.apply_status_label.clear()
+        self.preview_renderer.schedule()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def _on_preview_ready(self, image):
+        pixmap = QPixmap.fromImage(image)
+        for label in self._preview_labels:
+            label.setPixmap(pixmap)
+
+    def current_preset_name(self):
+        index = self.preset_selection.currentIndex()
+        return self.preset_model.name(index.row()) if index.isValid() else None
+
+    @tracked("preset_selected")
+    def _on_preset_selected(self, current, _previous):
+        if not current.isValid():
+            return
+        name = self.preset_model.name(current.row())
+        try:
+            values = preset_settings(name, self.preset_model.store)
+        except KeyError:
+            # Dihapus dari proses lain sejak daftar dibaca.
+            self.preset_model.reload()
+            return
+        self.settings.update(values)
+
+    def show_preset_manager(self):
+        manager = PresetManagerDialog(self.preset_model, self.settings, parent=self)
+        manager.setAttribute(Qt.WA_DeleteOnClose)
+        manager.show()
+        return manager
+
+    def show_fleet_dialog(self, preset_name=None):
+        fleet_dialog = FleetDialog(preset_name, parent=self)
+        fleet_dialog.setAttribute(Qt.WA_DeleteOnClose)
+        fleet_dialog.show()
+        return fleet_dialog
+
+    def show_print_files_dialog(self, paths=()):
+        """Dialog pengiriman file dengan opsi job dari pengaturan dialog saat ini."""
+        if not self.printer_name:
+            QMessageBox.information(self, "Print Files", "No printer available.")
+            return None
+        values = self.settings.as_dict()
+        watermark, header_footer = stamp_settings(values)
+        print_dialog = PrintFilesDialog(self.printer_name, settings_to_cups_options(values, self.capabilities),
+                                        watermark, header_footer, parent=self)
+        print_dialog.add_paths(paths)
+        print_dialog.setAttribute(Qt.WA_DeleteOnClose)
+        print_dialog.show()
+        return print_dialog
+
+    def _on_job_arranger_clicked(self, checked):
+        if checked:
+            self.show_job_arranger()
+
+    def show_job_arranger(self):
+        if not self.printer_name:
+            QMessageBox.information(self, "Job Arranger Lite", "No printer available.")
+            return None
+        job_dialog = JobArrangerDialog(self.printer_name, parent=self)
+        job_dialog.setAttribute(Qt.WA_DeleteOnClose)
+        job_dialog.show()
+        return job_dialog
+
+    def show_help(self):
+        QMessageBox.information(self, "Help", "This dialog allows you to configure printer settings.")
+
+    @tracked("apply_settings")
+    def apply_settings(self):
+        """Mengirim opsi yang berubah ke printer di thread pekerja.
+
+        Handler langsung kembali; progres tampil di bawah dialog dan dialog
+        ditutup setelah server selesai menyimpan.
+        """
+        if not self.printer_name:
+            self.apply_status_label.setText("No printer available; settings were not applied.")
+            return
+        options = settings_to_cups_options(self.settings.as_dict(), self.capabilities)
+        self._set_applying(True)
+        self.cups_client.submit(
+            commit_option_defaults, self.printer_name, options, self.capabilities,
+            progress=self.apply_progress.emit,
+            on_result=self._on_settings_applied,
+            on_error=self._on_apply_failed,
+            timeout=60,
+        )
+
+    def _set_applying(self, busy):
+        self.dialog_button_box.button(QDialogButtonBox.Ok).setEnabled(not busy)
+        self.apply_progress_bar.setVisible(busy)
+        if busy:
+            self.apply_progress_bar.setRange(0, 0)
+            self.apply_status_label.setText("Applying settings...")
+
+    def _on_apply_progress(self, done, total):
+        self.apply_progress_bar.setRange(0, max(total, 1))
+        self.apply_progress_bar.setValue(done)
+        self.apply_status_label.setText(f"Applying {done}/{total}...")
+
+    def _on_settings_applied(self, changes):
+        self._set_applying(False)
+        self.apply_status_label.setText(f"{len(changes)} option(s) updated.")
+        self.settings_applied.emit(changes)
+        self.accept()
+
+    def _on_apply_failed(self, error):
+        self._set_applying(False)
+        self.apply_status_label.setText(f"Failed to apply settings: {error}")
+
+    def _add_left_panel_slot(self, tab, tab_layout):
+        """Mendaftarkan tempat panel kiri di tab; panel dibuat sekali dan berpindah antar tab."""
+        self._left_panel_slots[tab] = tab_layout
+        if self._left_panel is None:
+            self._left_panel = self._create_left_panel()
+        if self._left_panel_tab is None or self.tab_widget.currentWidget() is tab:
+            self._move_left_panel(tab)
+
+    def _move_left_panel(self, tab):
+        tab_layout = self._left_panel_slots.get(tab)
+        if tab_layout is None or tab is self._left_panel_tab:
+            return
+        if self._left_panel_tab is not None:
+            self._left_panel_slots[self._left_panel_tab].removeWidget(self._left_panel)
+        tab_layout.insertWidget(0, self._left_panel, 1)
+        self._left_panel_tab = tab
+        # Ink Levels hanya ada di tab Main.
+        self._ink_levels_button.setVisible(tab is self.tab_main)
+
+    def _create_left_panel(self):
+        left_panel = QWidget()
+        left_column_layout = QVBoxLayout(left_panel)
+        left_column_layout.setContentsMargins(0, 0, 0, 0)
+        presets_groupbox = QGroupBox("Printing Presets")
+        presets_layout = QVBoxLayout()
+        # Semua tab memakai model dan seleksi preset yang sama.
+        presets_list = QListView()
+        presets_list.setUniformItemSizes(True)
+        presets_list.setModel(self.preset_model)
+        presets_list.setSelectionModel(self.preset_selection)
+        add_remove_icon = get_icon("list-add", "document-new", QStyle.SP_FileDialogNewFolder)
+        add_remove_presets_button = QPushButton(add_remove_icon, "Add/Remove Presets...")
+        add_remove_presets_button.clicked.connect(self.show_preset_manager)
+        fleet_icon = get_icon("document-send", "printer", QStyle.SP_DialogApplyButton)
+        apply_to_printers_button = QPushButton(fleet_icon, "Apply to Printers...")
+        apply_to_printers_button.clicked.connect(lambda: self.show_fleet_dialog(self.current_preset_name()))
+        presets_layout.addWidget(presets_list)
+        presets_layout.addWidget(add_remove_presets_button)
+        presets_layout.addWidget(apply_to_printers_button)
+        presets_groupbox.setLayout(presets_layout)
+        left_column_layout.addWidget(presets_groupbox)
+
+        preview_layout = QHBoxLayout()
+        doc_preview_label = QLabel()
+        doc_icon = get_icon("text-x-generic", "document-new", QStyle.SP_FileIcon)
+        if not doc_icon.isNull():
+            doc_pixmap = doc_icon.pixmap(QSize(80, 80))
+            if not doc_pixmap.isNull():
+                doc_preview_label.setPixmap(doc_pixmap)
+            else:
+                doc_preview_label.setText("📄\n(Gagal Pixmap Dok)")
+        else:
+            doc_preview_label.setText("📄\n(Gagal Ikon Dok)")
+        doc_preview_label.setFixedSize(100, 100)
+        doc_preview_label.setAlignment(Qt.AlignCenter)
+        doc_preview_label.setStyleSheet("border: 1px solid gray;")
+        # Ikon di atas hanya tampil sampai pratinjau pertama selesai dirender.
+        self._preview_labels.append(doc_preview_label)
+        self.preview_renderer.schedule()
+
+        printer_preview_label = QLabel()
+        printer_icon = get_icon("printer", "printer-printing", QStyle.SP_DriveHDIcon)
+        if not printer_icon.isNull():
+            printer_pixmap = printer_icon.pixmap(QSize(80, 80))
+            if not printer_pixmap.isNull():
+                printer_preview_label.setPixmap(printer_pixmap)
+            else:
+                printer_preview_label.setText("🖨️\n(Gagal Pixmap Printer)")
+        else:
+            printer_preview_label.setText("🖨️\n(Gagal Ikon Printer)")
+        printer_preview_label.setFixedSize(100, 100)
+        printer_preview_label.setAlignment(Qt.AlignCenter)
+        printer_preview_label.setStyleSheet("border: 1px solid gray;")
+
+        preview_layout.addWidget(doc_preview_label)
+        preview_layout.addWidget(printer_preview_label)
+        left_column_layout.addLayout(preview_layout)
+        left_column_layout.addStretch(1)
+
+        reset_defaults_icon = get_icon("edit-undo", "document-revert", QStyle.SP_ArrowLeft)
+        reset_defaults_button = QPushButton(reset_defaults_icon,"Reset Defaults")
+        left_column_layout.addWidget(reset_defaults_button)
+
+        print_files_icon = get_icon("document-print", "printer", QStyle.SP_DialogOpenButton)
+        print_files_button = QPushButton(print_files_icon, "Print Files...")
+        print_files_button.clicked.connect(lambda: self.show_print_files_dialog())
+        left_column_layout.addWidget(print_files_button)
+
+        ink_icon = get_icon("media-color-management", "preferences-color", QStyle.SP_CustomBase)
+        ink_levels_button = QPushButton(ink_icon, "Ink Levels")
+        ink_levels_button.clicked.connect(self.show_ink_levels)
+        self._ink_levels_button = ink_levels_button
+        left_column_layout.addWidget(ink_levels_button)
+        return left_panel
+        
+    def setup_main_tab(self):
+        main_tab_layout = QHBoxLayout(self.tab_main)
+        self._add_left_panel_slot(self.tab_main, main_tab_layout)
+        right_column_wrapper = QVBoxLayout()
+        right_column_grid = QGridLayout()
+        right_column_grid.setSpacing(10)
+        settings_icon = get_icon("preferences-configure", "configure", QStyle.SP_DesktopIcon)
+
+        right_column_grid.addWidget(QLabel("Document Size:"), 0, 0, Qt.AlignRight)
+        doc_size_combo = QComboBox()
+        paper_sizes = ["Letter (8 1/2 x 11 in)", "A4 (210 x 297 mm)", "Legal (8 1/2 x 14 in)"]
+        doc_size_combo.addItems(paper_sizes)
+        a4_text = "A4 (210 x 297 mm)"
+        if a4_text in paper_sizes:
+            doc_size_combo.setCurrentText(a4_text)
+        self._register_capability_combo("document_size", doc_size_combo)
+        doc_size_settings_button = QPushButton(settings_icon, "Settings...")
+        doc_size_layout = QHBoxLayout()
+        doc_size_layout.addWidget(doc_size_combo)
+        doc_size_layout.addWidget(doc_size_settings_button)
+        right_column_grid.addLayout(doc_size_layout, 0, 1, 1, 2)
+        bind_setting(self.settings, "document_size", doc_size_combo)
+
+        right_column_grid.addWidget(QLabel("Orientation:"), 1, 0, Qt.AlignRight)
+        orientation_portrait_radio = QRadioButton("Portrait")
+        orientation_landscape_radio = QRadioButton("Landscape")
+        orientation_portrait_radio.setChecked(True)
+        orientation_group = QButtonGroup(self.tab_main)
+        orientation_group.addButton(orientation_portrait_radio)
+        orientation_group.addButton(orientation_landscape_radio)
+        orientation_layout = QHBoxLayout()
+        orientation_layout.addWidget(orientation_portrait_radio)
+        orientation_layout.addWidget(orientation_landscape_radio)
+        orientation_layout.addStretch()
+        right_column_grid.addLayout(orientation_layout, 1, 1, 1, 2)
+        bind_setting(self.settings, "orientation", orientation_group)
+
+        right_column_grid.addWidget(QLabel("Paper Type:"), 2, 0, Qt.AlignRight)
+        paper_type_combo = QComboBox()
+        paper_type_combo.addItems(["Plain Paper / Bright White Paper", "Photo Paper Glossy", "Matte Paper"])
+        self._register_capability_combo("paper_type", paper_type_combo)
+        right_column_grid.addWidget(paper_type_combo, 2, 1, 1, 2)
+        bind_setting(self.settings, "paper_type", paper_type_combo)
+
+        right_column_grid.addWidget(QLabel("Quality:"), 3, 0, Qt.AlignRight)
+        quality_combo = QComboBox()
+        quality_combo.addItems(["Standard", "Draft", "High", "Best"])
+        self._register_capability_combo("quality", quality_combo)
+        right_column_grid.addWidget(quality_combo, 3, 1, 1, 2)
+        bind_setting(self.settings, "quality", quality_combo)
+
+        right_column_grid.addWidget(QLabel("Color:"), 4, 0, Qt.AlignRight)
+        color_color_radio = QRadioButton("Color")
+        color_grayscale_radio = QRadioButton("Black/Grayscale")
+        color_color_radio.setChecked(True)
+        color_group = QButtonGroup(self.tab_main)
+        color_group.addButton(color_color_radio)
+        color_group.addButton(color_grayscale_radio)
+        color_layout = QHBoxLayout()
+        color_layout.addWidget(color_color_radio)
+        color_layout.addWidget(color_grayscale_radio)
+        color_layout.addStretch()
+        right_column_grid.addLayout(color_layout, 4, 1, 1, 2)
+        bind_setting(self.settings, "color_mode", color_group)
+
+        sided_printing_checkbox = QCheckBox("2-Sided Printing")
+        sided_printing_settings_button = QPushButton(settings_icon, "Settings...")
+        sided_printing_settings_button.setEnabled(False)
+        sided_printing_checkbox.toggled.connect(sided_printing_settings_button.setEnabled)
+        sided_layout = QHBoxLayout()
+        sided_layout.addWidget(sided_printing_checkbox)
+        sided_layout.addWidget(sided_printing_settings_button)
+        sided_layout.addStretch()
+        right_column_grid.addLayout(sided_layout, 5, 1, 1, 2)
+        bind_setting(self.settings, "two_sided", sided_printing_checkbox)
+
+        right_column_grid.addWidget(QLabel("Multi-Page:"), 6, 0, Qt.AlignRight)
+        multipage_combo = QComboBox()
+        multipage_combo.addItems(["Off", "2 Up", "4 Up", "Custom..."])
+        self._register_capability_combo("multipage", multipage_combo, trailing_items=["Custom..."])
+        page_order_icon = get_icon("view-page-continuous-symbolic", "format-justify-fill", QStyle.SP_ToolBarVerticalExtensionButton)
+        multipage_pageorder_button = QPushButton(page_order_icon,"Page Order...")
+        multipage_pageorder_button.setEnabled(False)
+        multipage_combo.currentIndexChanged.connect(
+            lambda: multipage_pageorder_button.setEnabled(multipage_combo.currentText() != "Off")
+        )
+        multipage_layout = QHBoxLayout()
+        multipage_layout.addWidget(multipage_combo)
+        multipage_layout.addWidget(multipage_pageorder_button)
+        right_column_grid.addLayout(multipage_layout, 6, 1, 1, 2)
+        bind_setting(self.settings, "multipage", multipage_combo)
+
+        right_column_grid.addWidget(QLabel("Copies:"), 7, 0, Qt.AlignRight)
+        copies_spinbox = QSpinBox()
+        copies_spinbox.setMinimum(1)
+        copies_spinbox.setValue(1)
+        collate_checkbox = QCheckBox("Collate")
+        collate_checkbox.setChecked(True)
+        reverse_order_checkbox = QCheckBox("Reverse Order")
+        copies_layout = QHBoxLayout()
+        copies_layout.addWidget(copies_spinbox)
+        copies_layout.addWidget(collate_checkbox)
+        copies_layout.addWidget(reverse_order_checkbox)
+        copies_layout.addStretch()
+        right_column_grid.addLayout(copies_layout, 7, 1, 1, 2)
+        bind_setting(self.settings, "copies", copies_spinbox)
+        bind_setting(self.settings, "collate", collate_checkbox)
+        bind_setting(self.settings, "reverse_order", reverse_order_checkbox)
+
+        print_preview_checkbox = QCheckBox("Print Preview")
+        job_arranger_checkbox = QCheckBox("Job Arranger Lite")
+        quiet_mode_checkbox = QCheckBox("Quiet Mode")
+        checkboxes_layout = QVBoxLayout()
+        checkboxes_layout.addWidget(print_preview_checkbox)
+        checkboxes_layout.addWidget(job_arranger_checkbox)
+        checkboxes_layout.addWidget(quiet_mode_checkbox)
+        right_column_grid.addLayout(checkboxes_layout, 8, 1, Qt.AlignTop)
+        bind_setting(self.settings, "print_preview", print_preview_checkbox)
+        bind_setting(self.settings, "job_arranger", job_arranger_checkbox)
+        job_arranger_checkbox.clicked.connect(self._on_job_arranger_clicked)
+        bind_setting(self.settings, "quiet_mode", quiet_mode_checkbox)
+        right_column_grid.setRowStretch(9, 1)
+        right_column_wrapper.addLayout(right_column_grid)
+        right_column_wrapper.addStretch(1)
+
+        show_settings_icon = get_icon("document-properties", "preferences-system", QStyle.SP_DialogApplyButton)
+        show_settings_button_main = QPushButton(show_settings_icon, "Show Settings")
+        show_settings_layout_main = QHBoxLayout()
+        show_settings_layout_main.addStretch(1)
+        show_settings_layout_main.addWidget(show_settings_button_main)
+        right_column_wrapper.addLayout(show_settings_layout_main)
+        main_tab_layout.addLayout(right_column_wrapper, 2)
+
+    def setup_more_options_tab(self):
+        more_options_tab_layout = QHBoxLayout(self.tab_more_options)
+        self._add_left_panel_slot(self.tab_more_options, more_options_tab_layout)
+        right_column_wrapper = QVBoxLayout()
+        right_column_grid = QGridLayout()
+        right_column_grid.setSpacing(10)
+        right_column_grid.setColumnStretch(2,1)
+        settings_icon = get_icon("preferences-configure", "configure", QStyle.SP_DesktopIcon)
+
+        right_column_grid.addWidget(QLabel("Document Size:"), 0, 0, Qt.AlignRight)
+        self.mo_doc_size_combo = QComboBox()
+        paper_sizes = ["Letter (8 1/2 x 11 in)", "A4 (210 x 297 mm)", "Legal (8 1/2 x 14 in)"]
+        self.mo_doc_size_combo.addItems(paper_sizes)
+        a4_text = "A4 (210 x 297 mm)"
+        if a4_text in paper_sizes:
+            self.mo_doc_size_combo.setCurrentText(a4_text)
+        self._register_capability_combo("document_size", self.mo_doc_size_combo)
+        right_column_grid.addWidget(self.mo_doc_size_combo, 0, 1, 1, 2)
+        bind_setting(self.settings, "document_size", self.mo_doc_size_combo)
+
+        right_column_grid.addWidget(QLabel("Output Paper:"), 1, 0, Qt.AlignRight)
+        self.output_paper_combo = QComboBox()
+        self.output_paper_combo.addItems(["Same as Document Size", "Letter (8 1/2 x 11 in)", "A4 (210 x 297 mm)"])
+        self._register_capability_combo("output_paper", self.output_paper_combo, source_key="document_size",
+                                        leading_items=["Same as Document Size"])
+        right_column_grid.addWidget(self.output_paper_combo, 1, 1, 1, 2)
+        bind_setting(self.settings, "output_paper", self.output_paper_combo)
+
+        right_column_grid.addWidget(QLabel("Reduce/Enlarge Document:"), 2, 0, Qt.AlignTop | Qt.AlignRight)
+        reduce_enlarge_layout = QVBoxLayout()
+        self.fit_to_page_checkbox = QCheckBox("Fit to Page")
+        zoom_layout = QHBoxLayout()
+        self.zoom_to_checkbox = QCheckBox("Zoom to")
+        self.zoom_spinbox = QSpinBox()
+        self.zoom_spinbox.setSuffix(" %")
+        self.zoom_spinbox.setRange(10, 400)
+        self.zoom_spinbox.setValue(100)
+        self.zoom_spinbox.setEnabled(False)
+        self.zoom_to_checkbox.toggled.connect(self.zoom_spinbox.setEnabled)
+        zoom_layout.addWidget(self.zoom_to_checkbox)
+        zoom_layout.addWidget(self.zoom_spinbox)
+        zoom_layout.addStretch()
+        reduce_enlarge_layout.addWidget(self.fit_to_page_checkbox)
+        reduce_enlarge_layout.addLayout(zoom_layout)
+        right_column_grid.addLayout(reduce_enlarge_layout, 2, 1, 1, 2)
+        bind_setting(self.settings, "fit_to_page", self.fit_to_page_checkbox)
+        bind_setting(self.settings, "zoom_enabled", self.zoom_to_checkbox)
+        bind_setting(self.settings, "zoom", self.zoom_spinbox)
+        # Fit to Page menonaktifkan Zoom lewat constraints.DIALOG_CONSTRAINTS.
+        self._register_constraint_widget("zoom_enabled", self.zoom_to_checkbox)
+
+        right_column_grid.addWidget(QLabel("Color Correction:"), 3, 0, Qt.AlignTop | Qt.AlignRight)
+        color_correction_layout = QVBoxLayout()
+        self.cc_auto_radio = QRadioButton("Automatic")
+        self.cc_auto_radio.setChecked(True)
+        self.cc_custom_radio = QRadioButton("Custom")
+        advanced_cc_icon = get_icon("color-management", "preferences-color", QStyle.SP_CustomBase)
+        self.cc_advanced_button = QPushButton(advanced_cc_icon,"Advanced...")
+        self.cc_advanced_button.setEnabled(False)
+        image_options_icon = get_icon("image-sharpen", "transform-crop-and-resize", QStyle.SP_CustomBase)
+        self.cc_image_options_button = QPushButton(image_options_icon, "Image Options...")
+        custom_cc_layout = QHBoxLayout()
+        custom_cc_layout.addWidget(self.cc_custom_radio)
+        custom_cc_layout.addWidget(self.cc_advanced_button)
+        custom_cc_layout.addStretch()
+        color_correction_layout.addWidget(self.cc_auto_radio)
+        color_correction_layout.addLayout(custom_cc_layout)
+        color_correction_layout.addWidget(self.cc_image_options_button, 0, Qt.AlignLeft)
+        right_column_grid.addLayout(color_correction_layout, 3, 1, 1, 2)
+        self.cc_group = QButtonGroup(self.tab_more_options)
+        self.cc_group.addButton(self.cc_auto_radio)
+        self.cc_group.addButton(self.cc_custom_radio)
+        bind_setting(self.settings, "color_correction", self.cc_group)
+        self._register_constraint_widget("cc_advanced", self.cc_advanced_button)
+
+        right_column_grid.addWidget(QLabel("Watermark:"), 4, 0, Qt.AlignRight)
+        self.watermark_combo = QComboBox()
+        self.watermark_combo.addItems(["None", "CONFIDENTIAL", "DRAFT", "Add/Delete..."])
+        watermark_add_icon = get_icon("document-edit", "draw-text", QStyle.SP_FileLinkIcon)
+        self.watermark_add_delete_button = QPushButton(watermark_add_icon,"Add/Delete...")
+        self.watermark_settings_button = QPushButton(settings_icon, "Settings...")
+        self.watermark_settings_button.setEnabled(False)
+        def watermark_changed(text):
+            is_none = (text == "None")
+            self.watermark_settings_button.setEnabled(not is_none)
+            if text == "Add/Delete...":
+                print("Add/Delete Watermark action from combobox (placeholder)")
+        self.watermark_combo.currentTextChanged.connect(watermark_changed)
+        watermark_controls_layout = QHBoxLayout()
+        watermark_controls_layout.addWidget(self.watermark_combo,1)
+        watermark_controls_layout.addWidget(self.watermark_add_delete_button)
+        watermark_controls_layout.addWidget(self.watermark_settings_button)
+        right_column_grid.addLayout(watermark_controls_layout, 4, 1, 1, 2)
+        bind_setting(self.settings, "watermark", self.watermark_combo)
+
+        self.header_footer_checkbox = QCheckBox("Header/Footer")
+        header_footer_icon = get_icon("insert-header-footer", "format-header-symbolic", QStyle.SP_FileDialogDetailedView)
+        self.header_footer_settings_button = QPushButton(header_footer_icon, "Settings...")
+        self.header_footer_settings_button.setEnabled(False)
+        self.header_footer_checkbox.toggled.connect(self.header_footer_settings_button.setEnabled)
+        header_footer_layout = QHBoxLayout()
+        header_footer_layout.addWidget(self.header_footer_checkbox)
+        header_footer_layout.addWidget(self.header_footer_settings_button)
+        header_footer_layout.addStretch()
+        right_column_grid.addLayout(header_footer_layout, 5, 1, 1, 2)
+        bind_setting(self.settings, "header_footer", self.header_footer_checkbox)
+
+        additional_settings_group = QGroupBox("Additional Settings")
+        additional_settings_layout = QVBoxLayout()
+        self.rotate_checkbox = QCheckBox("Rotate 180°")
+        self.high_speed_checkbox = QCheckBox("High Speed")
+        self.mirror_image_checkbox = QCheckBox("Mirror Image")
+        additional_settings_layout.addWidget(self.rotate_checkbox)
+        additional_settings_layout.addWidget(self.high_speed_checkbox)
+        additional_settings_layout.addWidget(self.mirror_image_checkbox)
+        additional_settings_group.setLayout(additional_settings_layout)
+        right_column_grid.addWidget(additional_settings_group, 6, 1, 1, 2)
+        bind_setting(self.settings, "rotate_180", self.rotate_checkbox)
+        bind_setting(self.settings, "high_speed", self.high_speed_checkbox)
+        bind_setting(self.settings, "mirror_image", self.mirror_image_checkbox)
+        right_column_grid.setRowStretch(7, 1)
+        right_column_wrapper.addLayout(right_column_grid)
+        right_column_wrapper.addStretch(1)
+
+        show_settings_icon_more = get_icon("document-properties", "preferences-system", QStyle.SP_DialogApplyButton)
+        show_settings_button_more = QPushButton(show_settings_icon_more, "Show Settings")
+        show_settings_layout_more = QHBoxLayout()
+        show_settings_layout_more.addStretch(1)
+        show_settings_layout_more.addWidget(show_settings_button_more)
+        right_column_wrapper.addLayout(show_settings_layout_more)
+        more_options_tab_layout.addLayout(right_column_wrapper, 2)
+        
+    @tracked("maintenance_action")
+    def maintenance_action(self, title):
+        if title in MAINTENANCE_COMMANDS:
+            self.run_maintenance(title)
+        elif title == "Ink Cartridge Settings":
+            self.printer_ink_settings()
+        else:
+            QMessageBox.information(self, "Maintenance", f"{title} (dummy).")
+
+    def run_maintenance(self, title, printer_name=None):
+        """Mengirim job maintenance di thread pekerja; statusnya dilacak per job-id."""
+        printer_name = printer_name or self.printer_name
+        if not printer_name:
+            self._set_maintenance_status(title, "No printer available.", busy=False)
+            return
+        task = (printer_name, title)
+        if task in self._maintenance_sending or task in self._maintenance_jobs.values():
+            return
+        self._maintenance_sending.add(task)
+        self._set_maintenance_status(title, f"Sending to {printer_name}...", busy=True)
+        self.cups_client.submit(
+            submit_maintenance, printer_name, title,
+            on_result=lambda job_id: self._on_maintenance_submitted(printer_name, title, job_id),
+            on_error=lambda e: self._on_maintenance_failed(printer_name, title, e),
+        )
+
+    def _on_maintenance_failed(self, printer_name, title, error):
+        self._maintenance_sending.discard((printer_name, title))
+        self._set_maintenance_status(title, f"Failed on {printer_name}: {error}", busy=False)
+
+    def _on_maintenance_submitted(self, printer_name, title, job_id):
+        self._maintenance_sending.discard((printer_name, title))
+        self._maintenance_jobs[job_id] = (printer_name, title)
+        self._set_maintenance_status(title, f"Job {job_id} on {printer_name}: Waiting", busy=True)
+        if not self._maintenance_timer.isActive():
+            self._maintenance_timer.start()
+
+    def _poll_maintenance_jobs(self):
+        if not self._maintenance_jobs:
+            self._maintenance_timer.stop()
+            return
+        for job_id in self._maintenance_jobs:
+            if job_id in self._maintenance_polling:
+                continue
+            self._maintenance_polling.add(job_id)
+            self.cups_client.submit(
+                job_status, job_id,
+                on_result=lambda status, j=job_id: self._on_maintenance_status(j, *status),
+                on_error=lambda e, j=job_id: self._on_maintenance_status(j, None, f"Status unavailable: {e}"),
+            )
+
+    def _on_maintenance_status(self, job_id, state, text):
+        self._maintenance_polling.discard(job_id)
+        printer_name, title = self._maintenance_jobs.get(job_id, (None, None))
+        if title is None:
+            return
+        finished = state in TERMINAL_JOB_STATES
+        if finished:
+            del self._maintenance_jobs[job_id]
+        self._set_maintenance_status(title, f"Job {job_id} on {printer_name}: {text}", busy=not finished)
+
+    def _set_maintenance_status(self, title, text, busy):
+        if not self.maintenance_model.set_status(title, text, busy):
+            print(f"{title}: {text}")
+
+    def printer_clean(self):
+        self.run_maintenance("Cleaning")
+
+    def printer_deep_clean(self):
+        self.run_maintenance("Deep Cleaning")
+
+    def printer_align_head(self):
+        self.run_maintenance("Print Head Alignment")
+
+    def printer_nozzle_check(self):
+        self.run_maintenance("Nozzle Check")
+
+    def printer_ink_settings(self):
+        QMessageBox.information(self, "Ink Cartridge Settings", "Ink cartridge settings (dummy).")
+
+
+    def setup_maintenance_tab(self):
+        main_layout = QVBoxLayout(self.tab_maintenance)
+        main_layout.setContentsMargins(10, 10, 10, 10)
+
+        ink_cart_icon_theme = get_icon("color-palette", "preferences-desktop-color", QStyle.SP_CustomBase)
+        if not ink_cart_icon_theme.isNull():
+            self.maintenance_model.set_icon("Ink Cartridge Settings", ink_cart_icon_theme)
+
+        # Satu view + delegate untuk semua item, berapa pun jumlah item maintenance.
+        maintenance_list = QListView()
+        maintenance_list.setObjectName("MaintenanceList")
+        maintenance_list.setModel(self.maintenance_model)
+        maintenance_list.setItemDelegate(RichTextItemDelegate(self.maintenance_model.icon_size, maintenance_list))
+        maintenance_list.setResizeMode(QListView.Adjust)
+        maintenance_list.setSpacing(2)
+        maintenance_list.setMouseTracking(True)
+        maintenance_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        maintenance_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        maintenance_list.clicked.connect(lambda index: self.maintenance_action(self.maintenance_model.title(index.row())))
+        main_layout.addWidget(maintenance_list)
+
+
+def start_metrics(app, metrics):
+    """Detak event loop untuk watchdog jeda, endpoint HTTP dan dump JSON saat keluar."""
+    heartbeat = QTimer(app)
+    heartbeat.setInterval(HEARTBEAT_MS)
+    heartbeat.timeout.connect(metrics.start_watchdog().beat)
+    heartbeat.start()
+    try:
+        if metrics.serve() is not None:
+            print(f"INFO: Metrik tersedia di http://{metrics.host}:{metrics.port}/metrics", file=sys.stderr)
+    except OSError as e:
+        print(f"WARNING: Endpoint metrik tidak bisa dibuka: {e}", file=sys.stderr)
+    if metrics.dump:
+        app.aboutToQuit.connect(lambda: print(f"INFO: Metrik ditulis ke {metrics.write()}", file=sys.stderr))
+    app.aboutToQuit.connect(metrics.close)
+
+
+def run_gui(argv=None, printer_name=None, tab=None, resident=False, hidden=False):
+    """Menjalankan aplikasi dialog; mengembalikan kode keluar event loop.
+
+    resident=True menjaga proses dan dialog tetap hidup setelah ditutup dan
+    melayani peluncuran berikutnya lewat InstanceServer; hidden=True
+    (bersama resident) memulai tanpa menampilkan dialog.
+    """
+    argv = sys.argv if argv is None else argv
+    profiler = get_profiler()
+    with profiler.phase("QApplication"):
+        app = QApplication(argv)
+    with profiler.phase("theme setup"):
+        QIcon.setThemeName("breeze")
+    print(f"INFO: Mencoba mengatur tema ikon ke 'breeze'.")
+    print(f"--- Diagnostik Ikon ---")
+    print(f"Nama Tema Qt Saat Ini (setelah setThemeName): {QIcon.themeName()}")
+    print(f"Path Pencarian Tema Qt: {QIcon.themeSearchPaths()}")
+    print(f"----------------------")
+    
+    # app.setStyleSheet("""
+    #     QFrame#MaintenanceItemFrame {
+    #         border: 1px solid #e0e0e0; 
+    #         border-radius: 3px;        
+    #         background-color: #f9f9f9; 
+    #         padding: 5px;          
+    #         margin-bottom: 2px;        
+    #     }
+    #     QFrame#MaintenanceItemFrame:hover {
+    #         background-color: #eef4ff; 
+    #     }
+    # """)
+
+    # app.setStyle("Fusion") 
+    app.aboutToQuit.connect(PLACEHOLDER_CACHE.save)
+    if profiler.enabled:
+        app.aboutToQuit.connect(lambda: print(f"INFO: Profil startup ditulis ke {profiler.write()}", file=sys.stderr))
+    metrics = get_metrics()
+    if metrics.enabled:
+        start_metrics(app, metrics)
+    with profiler.phase("dialog construction"), get_metrics().handler("dialog construction"):
+        dialog = LinuxPrinterPreferencesDialog(printer_name=printer_name)
+    if tab:
+        dialog.select_tab(tab)
+    if resident:
+        app.setQuitOnLastWindowClosed(False)
+        server = InstanceServer(parent=app)
+        if server.listen():
+            def on_request(request):
+                if request.get("quit"):
+                    app.quit()
+                else:
+                    dialog.reactivate(request.get("printer"), request.get("tab"))
+            server.request_received.connect(on_request)
+            app.aboutToQuit.connect(server.close)
+        else:
+            resident = hidden = False
+            app.setQuitOnLastWindowClosed(True)
+    if resident and hidden:
+        # Semua tab dibangun saat idle agar tampilan pertama nanti sudah siap.
+        QTimer.singleShot(0, dialog._prebuild_next_tab)
+        return app.exec()
+    with profiler.phase("dialog.show"):
+        dialog.show()
+    return app.exec()
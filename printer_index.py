@@ -0,0 +1,274 @@
+"""Daftar printer terindeks untuk pemilih printer dengan pencarian inkremental.
+
+Snapshot getPrinters disimpan di cache disk sehingga daftar langsung tersedia
+saat dialog dibuka, lalu disegarkan di latar. PrinterIndex menyimpan kolom
+sebagai list paralel terurut nama (bukan dict per printer) plus indeks
+trigram berbentuk bitmask, dan menjawab pencarian prefix/substring tanpa I/O;
+kueri yang memperpanjang kueri sebelumnya hanya menyaring hasil sebelumnya.
+"""
+import os
+import re
+import json
+import time
+import bisect
+import collections
+
+from app_paths import cache_dir, atomic_write
+
+CACHE_VERSION = 1
+PRINTER_FIELDS = ("printer-info", "printer-location", "printer-make-and-model", "printer-state")
+PRINTER_STATE_STOPPED = 5
+PRINTER_STATE_LABELS = {3: "idle", 4: "processing", PRINTER_STATE_STOPPED: "stopped"}
+# Kata kunci kueri "field:nilai"; tanpa field, kata dicari di semua kolom.
+QUERY_FIELDS = {
+    "name": "name", "location": "location", "loc": "location",
+    "model": "model", "make": "model", "state": "state",
+}
+
+
+def fetch_printers(conn):
+    """Snapshot {nama: {atribut PRINTER_FIELDS}} plus nama printer default."""
+    printers = conn.getPrinters()
+    snapshot = {name: {key: attributes.get(key) for key in PRINTER_FIELDS}
+                for name, attributes in printers.items()}
+    return snapshot, conn.getDefault()
+
+
+_WORD = re.compile(r"\w+")
+
+
+def _mask_from_rows(rows):
+    """Bitmask int (bit i = baris i) dari daftar baris."""
+    mask = 0
+    for row in rows:
+        mask |= 1 << row
+    return mask
+
+
+def _rows_from_mask(mask):
+    """Kebalikan _mask_from_rows: daftar baris urut naik."""
+    # Digit biner dibaca dari kanan: digit ke-i adalah bit baris i.
+    return [row for row, bit in enumerate(reversed(bin(mask)[2:])) if bit == "1"]
+
+
+class PrinterIndex:
+    """Indeks nama/lokasi/model/status untuk ribuan antrean.
+
+    Setiap trigram teks printer (nama, lokasi, model, info) dipetakan ke
+    bitmask baris yang memuatnya. Kata kueri dijawab dengan AND bitmask;
+    bigram/unigram didapat dari OR trigram berawalan sama (teks diberi
+    padding), sehingga kata 1-3 huruf tepat tanpa memeriksa baris. Untuk kata
+    yang lebih panjang, prefix nama (rentang baris) dan prefix kata lokasi/
+    model/info sudah pasti cocok; hanya sisa kandidat trigram yang diperiksa.
+    Membangun indeks 5000 printer butuh beberapa ratus ms: lakukan di
+    thread pekerja.
+    """
+
+    def __init__(self, printers=None, default=None, fetched_at=0.0):
+        self.default = default
+        self.fetched_at = fetched_at
+        printers = printers or {}
+        self.names = sorted(printers, key=lambda name: (name.casefold(), name))
+        self._keys = [name.casefold() for name in self.names]
+        self.locations = []
+        self.models = []
+        self.states = []
+        self.infos = []
+        for name in self.names:
+            attributes = printers[name]
+            self.locations.append(attributes.get("printer-location") or "")
+            self.models.append(attributes.get("printer-make-and-model") or "")
+            self.infos.append(attributes.get("printer-info") or "")
+            self.states.append(attributes.get("printer-state") or 0)
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        self._columns = {
+            "name": self._keys,
+            "location": [text.casefold() for text in self.locations],
+            "model": [text.casefold() for text in self.models],
+        }
+        self._haystacks = ["\x00".join(parts).casefold() for parts in zip(
+            self.names, self.locations, self.models, self.infos)]
+        self._all = (1 << len(self.names)) - 1
+        self._state_masks = {}
+        for state in set(self.states):
+            self._state_masks[state] = _mask_from_rows(
+                row for row, value in enumerate(self.states) if value == state)
+        self._grams = self._build_grams()
+        self._short_masks = None
+        self._vocabularies = self._build_words()
+        self._last_query = None
+        self._last_mask = None
+
+    def _build_grams(self):
+        rows_by_gram = collections.defaultdict(list)
+        for row, text in enumerate(self._haystacks):
+            padded = text + "\x00\x00"
+            for gram in set(map("".join, zip(padded, padded[1:], padded[2:]))):
+                rows_by_gram[gram].append(row)
+        return {gram: _mask_from_rows(rows) for gram, rows in rows_by_gram.items()}
+
+    def _build_words(self):
+        """{kolom: (kata terurut, bitmask per kata)} untuk lokasi, model dan info.
+
+        Nama tidak perlu karena prefix nama sudah berupa rentang baris.
+        """
+        vocabularies = {}
+        for column, texts in (("location", self._columns["location"]), ("model", self._columns["model"]),
+                              ("info", self.infos)):
+            rows_by_word = collections.defaultdict(list)
+            for row, text in enumerate(texts):
+                for word in set(_WORD.findall(text.casefold())):
+                    rows_by_word[word].append(row)
+            words = sorted(rows_by_word)
+            vocabularies[column] = (words, [_mask_from_rows(rows_by_word[word]) for word in words])
+        return vocabularies
+
+    def _short_gram_masks(self):
+        # Bitmask bigram/unigram baru dihitung saat pertama dibutuhkan.
+        masks = {}
+        for gram, mask in self._grams.items():
+            for prefix in (gram[:1], gram[:2]):
+                masks[prefix] = masks.get(prefix, 0) | mask
+        self._short_masks = masks
+        return masks
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def row_of(self, name):
+        return self._rows.get(name, -1)
+
+    def printer(self, row):
+        return {
+            "name": self.names[row], "location": self.locations[row], "model": self.models[row],
+            "info": self.infos[row], "state": PRINTER_STATE_LABELS.get(self.states[row], ""),
+        }
+
+    def set_state(self, name, state):
+        """Memperbarui status satu printer dari event tanpa membangun ulang indeks."""
+        row = self._rows.get(name)
+        if row is None or state is None or state == self.states[row]:
+            return False
+        bit = 1 << row
+        self._state_masks[self.states[row]] &= ~bit
+        self._state_masks[state] = self._state_masks.get(state, 0) | bit
+        self.states[row] = state
+        self._last_query = None
+        return True
+
+    def _prefix_range(self, prefix):
+        return (bisect.bisect_left(self._keys, prefix),
+                bisect.bisect_left(self._keys, prefix + "\U0010ffff"))
+
+    def _exact_mask(self, text, column=None):
+        """Bitmask baris yang pasti memuat text di kolom (None = semua): nama atau kata berawalan text."""
+        mask = 0
+        if column in (None, "name"):
+            low, high = self._prefix_range(text)
+            mask = ((1 << high) - 1) ^ ((1 << low) - 1)
+        for name, (words, masks) in self._vocabularies.items():
+            if column in (None, name):
+                low, high = bisect.bisect_left(words, text), bisect.bisect_left(words, text + "\U0010ffff")
+                for word_mask in masks[low:high]:
+                    mask |= word_mask
+        return mask
+
+    def _text_mask(self, text):
+        """Bitmask baris yang mungkin memuat text (tepat untuk 1-3 huruf)."""
+        if len(text) < 3:
+            masks = self._short_masks or self._short_gram_masks()
+            return masks.get(text, 0)
+        mask = self._all
+        grams = self._grams
+        for start in range(len(text) - 2):
+            mask &= grams.get(text[start:start + 3], 0)
+            if not mask:
+                break
+        return mask
+
+    def search(self, query):
+        """Baris yang cocok dengan semua kata kueri; yang namanya berawalan kata pertama di depan."""
+        query = query.strip().casefold()
+        if not query:
+            return list(range(len(self.names)))
+        mask = self._all
+        last = self._last_query
+        if last and query.startswith(last) and ":" not in query[len(last):]:
+            # Kueri hanya bertambah panjang: hasilnya pasti subset hasil sebelumnya.
+            mask = self._last_mask
+        terms = query.split()
+        for term in terms:
+            field, sep, value = term.partition(":")
+            column = QUERY_FIELDS.get(field) if sep else None
+            if column is None:
+                value = term
+            elif not value:
+                continue
+            if column == "state":
+                mask &= sum(state_mask for state, state_mask in self._state_masks.items()
+                            if PRINTER_STATE_LABELS.get(state, "").startswith(value))
+                continue
+            if column is None and len(value) <= 3:
+                mask &= self._text_mask(value)
+                continue
+            exact = self._exact_mask(value, column)
+            candidates = mask & self._text_mask(value) & ~exact
+            mask &= exact
+            if candidates:
+                # Hanya kandidat trigram yang belum pasti yang diperiksa baris per baris.
+                values = self._columns[column] if column else self._haystacks
+                mask |= _mask_from_rows(row for row in _rows_from_mask(candidates) if value in values[row])
+        self._last_query, self._last_mask = query, mask
+        rows = _rows_from_mask(mask)
+        field, sep, value = terms[0].partition(":")
+        prefix = value if sep and QUERY_FIELDS.get(field) == "name" else (None if sep else terms[0])
+        if not prefix or not rows:
+            return rows
+        # rows urut naik dan nama terurut, jadi prefix nama adalah satu potongan rows.
+        low, high = self._prefix_range(prefix)
+        start, end = bisect.bisect_left(rows, low), bisect.bisect_left(rows, high)
+        return rows[start:end] + rows[:start] + rows[end:]
+
+    def to_dict(self):
+        return {
+            "version": CACHE_VERSION,
+            "fetched_at": self.fetched_at,
+            "default": self.default,
+            "printers": {name: [self.infos[row], self.locations[row], self.models[row], self.states[row]]
+                         for row, name in enumerate(self.names)},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        printers = {name: dict(zip(PRINTER_FIELDS, values)) for name, values in data["printers"].items()}
+        return cls(printers, data.get("default"), data.get("fetched_at", 0.0))
+
+
+def _cache_path():
+    return os.path.join(cache_dir(), "printers.json")
+
+
+def load_cached_index():
+    """Indeks dari cache disk; indeks kosong jika cache tidak ada atau rusak."""
+    try:
+        with open(_cache_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == CACHE_VERSION:
+            return PrinterIndex.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return PrinterIndex()
+
+
+def refresh_index(conn):
+    """Membaca snapshot terbaru dari server, membangun indeks dan menyimpannya ke cache."""
+    printers, default = fetch_printers(conn)
+    index = PrinterIndex(printers, default, time.time())
+    try:
+        atomic_write(_cache_path(), json.dumps(index.to_dict()).encode("utf-8"))
+    except OSError as e:
+        print(f"Gagal menyimpan cache daftar printer: {e}")
+    return index
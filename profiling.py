@@ -0,0 +1,133 @@
+"""Profil waktu startup: durasi per fase, penghitung dan penanda waktu.
+
+Aktif lewat `printer.py --profile-startup[=PATH]` atau variabel lingkungan
+PRINTER_PROFILE_STARTUP=PATH. Hasilnya file JSON berformat Chrome trace
+(bisa dibuka di chrome://tracing atau Perfetto) dengan ringkasan tambahan
+di kunci "summary".
+"""
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+
+ENV_VAR = "PRINTER_PROFILE_STARTUP"
+DEFAULT_OUTPUT = "printer-startup-profile.json"
+
+
+class StartupProfiler:
+    """Mencatat fase (durasi), penanda (instan) dan penghitung sejak proses profil dibuat."""
+
+    def __init__(self, output_path=None, enabled=True):
+        self.enabled = enabled
+        self.output_path = output_path or DEFAULT_OUTPUT
+        self._origin_ns = time.perf_counter_ns()
+        self._events = []
+        self._marks = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _now_us(self):
+        return (time.perf_counter_ns() - self._origin_ns) / 1000.0
+
+    @contextlib.contextmanager
+    def _timed(self, name, category):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            with self._lock:
+                self._events.append({
+                    "name": name, "cat": category, "ph": "X", "ts": start, "dur": end - start,
+                    "pid": os.getpid(), "tid": threading.get_ident(),
+                })
+
+    def phase(self, name, category="startup"):
+        """Context manager yang mencatat durasi satu fase."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(name, category)
+
+    def mark(self, name, once=True):
+        """Mencatat penanda waktu, mis. first_show; once=True mengabaikan pemanggilan berikutnya."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if once and name in self._marks:
+                return
+            ts = self._now_us()
+            self._marks[name] = ts
+            self._events.append({
+                "name": name, "cat": "mark", "ph": "i", "s": "p", "ts": ts,
+                "pid": os.getpid(), "tid": threading.get_ident(),
+            })
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def summary(self):
+        with self._lock:
+            phases = {}
+            for event in self._events:
+                if event["ph"] == "X":
+                    phases[event["name"]] = round(phases.get(event["name"], 0.0) + event["dur"] / 1000.0, 3)
+            return {
+                "phases_ms": phases,
+                "marks_ms": {name: round(ts / 1000.0, 3) for name, ts in self._marks.items()},
+                "counters": dict(self._counters),
+                "python": sys.version.split()[0],
+                "platform": sys.platform,
+            }
+
+    def write(self, path=None):
+        """Menulis trace + ringkasan ke file JSON; mengembalikan path-nya."""
+        if not self.enabled:
+            return None
+        path = path or self.output_path
+        summary = self.summary()
+        with self._lock:
+            events = list(self._events)
+        counter_events = [{"name": name, "ph": "C", "ts": self._now_us(), "pid": os.getpid(),
+                           "args": {"value": value}} for name, value in summary["counters"].items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events + counter_events, "displayTimeUnit": "ms",
+                       "summary": summary}, f, indent=1)
+        return path
+
+
+_profiler = StartupProfiler(enabled=False)
+
+
+def get_profiler():
+    """Profiler aktif; objek nonaktif (tanpa biaya berarti) jika profil tidak diminta."""
+    return _profiler
+
+
+def configure_profiler(argv):
+    """Mengaktifkan profiler dari --profile-startup[=PATH] atau PRINTER_PROFILE_STARTUP.
+
+    Opsi --profile-startup dibuang dari argv agar tidak diteruskan ke Qt.
+    Mengembalikan argv yang sudah dibersihkan.
+    """
+    global _profiler
+    output_path = os.environ.get(ENV_VAR) or None
+    enabled = output_path is not None
+    remaining = []
+    for arg in argv:
+        if arg == "--profile-startup":
+            enabled = True
+        elif arg.startswith("--profile-startup="):
+            enabled = True
+            output_path = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+    if output_path == "1":
+        output_path = None
+    if enabled:
+        _profiler = StartupProfiler(output_path)
+    return remaining
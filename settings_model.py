@@ -0,0 +1,221 @@
+"""Model pengaturan bersama untuk semua tab dialog, tanpa ketergantungan Qt."""
+
+
+class SettingsModel:
+    """Menyimpan nilai pengaturan per kunci dan memberi tahu pendengar saat berubah.
+
+    Nilai yang di-set sebelum widget-nya dibuat tetap disimpan dan diterapkan
+    ketika widget tersebut di-bind (lihat bind_setting di printer.py).
+    """
+
+    def __init__(self, values=None):
+        self._values = dict(values or {})
+        self._listeners = {}
+        self._global_listeners = []
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def set(self, key, value):
+        """Mengubah satu nilai; mengembalikan False jika nilainya sama."""
+        if key in self._values and self._values[key] == value:
+            return False
+        self._values[key] = value
+        for callback in list(self._listeners.get(key, ())):
+            callback(value)
+        for callback in list(self._global_listeners):
+            callback(key, value)
+        return True
+
+    def setdefault(self, key, value):
+        """Mengisi nilai awal tanpa memicu pendengar."""
+        return self._values.setdefault(key, value)
+
+    def update(self, values):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def as_dict(self):
+        return dict(self._values)
+
+    def subscribe(self, callback, key=None):
+        """callback(value) untuk satu kunci, atau callback(key, value) untuk semua kunci."""
+        if key is None:
+            self._global_listeners.append(callback)
+        else:
+            self._listeners.setdefault(key, []).append(callback)
+
+    def unsubscribe(self, callback, key=None):
+        listeners = self._global_listeners if key is None else self._listeners.get(key, [])
+        if callback in listeners:
+            listeners.remove(callback)
+
+
+# Nilai tetap untuk kontrol yang tidak diisi dari model kemampuan printer.
+STATIC_CHOICES = {
+    "document_size": {
+        "Letter (8 1/2 x 11 in)": "na_letter_8.5x11in",
+        "A4 (210 x 297 mm)": "iso_a4_210x297mm",
+        "Legal (8 1/2 x 14 in)": "na_legal_8.5x14in",
+    },
+    "paper_type": {
+        "Plain Paper / Bright White Paper": "stationery",
+        "Photo Paper Glossy": "photographic-glossy",
+        "Matte Paper": "photographic-matte",
+    },
+    "quality": {"Draft": "3", "Standard": "4", "High": "5", "Best": "5"},
+    "multipage": {"Off": "1", "2 Up": "2", "4 Up": "4"},
+    "color_mode": {"Color": "color", "Black/Grayscale": "monochrome"},
+}
+
+# Nama opsi IPP bawaan untuk kontrol berbasis pilihan.
+STATIC_OPTION_NAMES = {
+    "document_size": "media",
+    "paper_type": "media-type",
+    "quality": "print-quality",
+    "multipage": "number-up",
+    "color_mode": "print-color-mode",
+}
+
+# Nilai yang dianggap berlaku jika printer belum punya default untuk opsi tersebut.
+NEUTRAL_OPTION_VALUES = {
+    "orientation-requested": "3",
+    "sides": "one-sided",
+    "number-up": "1",
+    "copies": "1",
+    "multiple-document-handling": "separate-documents-collated-copies",
+    "outputorder": "normal",
+    "fit-to-page": "false",
+    "scaling": "100",
+    "mirror": "false",
+}
+
+# Semua opsi CUPS yang bisa dihasilkan settings_to_cups_options (tanpa model kemampuan).
+MAPPED_OPTION_NAMES = sorted(set(STATIC_OPTION_NAMES.values()) | set(NEUTRAL_OPTION_VALUES))
+
+# Pengaturan yang hanya berlaku di dialog dan tidak punya padanan opsi CUPS.
+DIALOG_ONLY_KEYS = {
+    "output_paper", "color_correction", "high_speed", "watermark", "header_footer",
+    "print_preview", "job_arranger", "quiet_mode",
+}
+
+
+def _choice_option(key, label, caps):
+    if caps is not None:
+        keyword = caps.source_for(key)
+        if keyword is not None:
+            value = caps.value_for_label(keyword, label)
+            if value is not None:
+                return keyword, str(value)
+    value = STATIC_CHOICES.get(key, {}).get(label)
+    if value is None:
+        return None
+    return STATIC_OPTION_NAMES[key], value
+
+
+def settings_to_cups_options(values, caps=None):
+    """Menerjemahkan nilai SettingsModel (tab Main dan More Options) menjadi opsi CUPS."""
+    options = {}
+    for key in ("document_size", "paper_type", "quality", "multipage", "color_mode"):
+        if key in values:
+            mapped = _choice_option(key, values[key], caps)
+            if mapped is not None:
+                options[mapped[0]] = mapped[1]
+
+    landscape = values.get("orientation") == "Landscape"
+    rotated = bool(values.get("rotate_180"))
+    if "orientation" in values or "rotate_180" in values:
+        # IPP: 3 portrait, 4 landscape, 5 reverse-landscape, 6 reverse-portrait.
+        options["orientation-requested"] = {(False, False): "3", (True, False): "4",
+                                            (True, True): "5", (False, True): "6"}[(landscape, rotated)]
+    if "two_sided" in values:
+        options["sides"] = "two-sided-long-edge" if values["two_sided"] else "one-sided"
+    if "copies" in values:
+        options["copies"] = str(values["copies"])
+    if "collate" in values:
+        options["multiple-document-handling"] = (
+            "separate-documents-collated-copies" if values["collate"]
+            else "separate-documents-uncollated-copies"
+        )
+    if "reverse_order" in values:
+        options["outputorder"] = "reverse" if values["reverse_order"] else "normal"
+    if "fit_to_page" in values:
+        options["fit-to-page"] = "true" if values["fit_to_page"] else "false"
+    if "zoom" in values or "zoom_enabled" in values:
+        zoom_active = values.get("zoom_enabled") and not values.get("fit_to_page")
+        options["scaling"] = str(values.get("zoom", 100)) if zoom_active else "100"
+    if "mirror_image" in values:
+        options["mirror"] = "true" if values["mirror_image"] else "false"
+    return options
+
+
+def read_option_defaults(conn, printer_name, option_names, caps=None):
+    """Membaca default printer saat ini untuk opsi-opsi yang diberikan.
+
+    Atribut IPP <opsi>-default didahulukan; opsi PPD memakai default dari
+    model kemampuan printer.
+    """
+    attributes = conn.getPrinterAttributes(
+        printer_name, requested_attributes=[f"{name}-default" for name in option_names]
+    ) if option_names else {}
+    current = {}
+    for name in option_names:
+        value = attributes.get(f"{name}-default")
+        if value is None and caps is not None and name in caps.options:
+            value = caps.options[name]["default"]
+        if value is None:
+            value = NEUTRAL_OPTION_VALUES.get(name)
+        if isinstance(value, (list, tuple)):
+            value = ",".join(str(v) for v in value)
+        current[name] = None if value is None else str(value)
+    return current
+
+
+def diff_options(options, current):
+    """Opsi yang nilainya berbeda dari default printer saat ini."""
+    return {name: value for name, value in options.items() if current.get(name) != value}
+
+
+class PartialCommitError(Exception):
+    """Sebagian opsi sudah tersimpan sebelum satu opsi gagal.
+
+    applied berisi opsi yang sudah diterapkan, option nama opsi yang gagal dan
+    error penyebabnya.
+    """
+
+    def __init__(self, printer_name, applied, option, error):
+        self.printer_name = printer_name
+        self.applied = applied
+        self.option = option
+        self.error = error
+        done = ", ".join(f"{name}={value}" for name, value in applied.items()) or "tidak ada"
+        super().__init__(f"Gagal menyimpan {option!r} di {printer_name}: {error} (sudah diterapkan: {done})")
+
+
+def commit_option_defaults(conn, printer_name, options, caps=None, progress=None):
+    """Menyimpan hanya opsi yang berubah sebagai default printer, dalam satu tugas pekerja.
+
+    CUPS menyimpan satu opsi per permintaan (addPrinterOptionDefault), jadi
+    penyimpanan tidak atomik: jika satu opsi gagal, PartialCommitError
+    melaporkan opsi yang sudah diterapkan. progress(done, total) dipanggil dari
+    thread pekerja setelah setiap opsi. Mengembalikan dict opsi yang benar-benar
+    dikirim.
+    """
+    current = read_option_defaults(conn, printer_name, list(options), caps)
+    changes = diff_options(options, current)
+    total = len(changes)
+    if progress is not None:
+        progress(0, total)
+    applied = {}
+    for done, (name, value) in enumerate(changes.items(), 1):
+        try:
+            conn.addPrinterOptionDefault(printer_name, name, value)
+        except Exception as e:
+            raise PartialCommitError(printer_name, applied, name, e) from e
+        applied[name] = value
+        if progress is not None:
+            progress(done, total)
+    return changes
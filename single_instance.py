@@ -0,0 +1,47 @@
+"""Mode resident: peluncuran berikutnya diteruskan ke proses dialog yang sudah berjalan.
+
+Server memakai QLocalServer (printer_gui.InstanceServer) pada socket Unix di
+XDG_RUNTIME_DIR. Sisi klien di sini sengaja hanya memakai modul socket
+standar, sehingga peluncuran kedua tidak perlu mengimpor PySide6 sama sekali.
+Protokol: satu baris JSON permintaan, dibalas "ok\\n".
+"""
+import os
+import json
+import socket
+import tempfile
+
+from app_paths import APP_NAME
+
+FORWARD_TIMEOUT = 2.0
+
+
+def socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"{APP_NAME}-{os.getuid()}.sock")
+
+
+def encode_request(request):
+    return json.dumps(request).encode("utf-8") + b"\n"
+
+
+def decode_request(data):
+    request = json.loads(data.decode("utf-8"))
+    if not isinstance(request, dict):
+        raise ValueError("Permintaan harus berupa objek JSON")
+    return request
+
+
+def forward_to_running(request, path=None, timeout=FORWARD_TIMEOUT):
+    """Mengirim permintaan ke instance resident; False jika tidak ada yang mendengarkan."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path or socket_path())
+            client.sendall(encode_request(request))
+            reply = client.recv(16)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return False
+    except OSError as e:
+        print(f"Instance resident tidak menjawab: {e}")
+        return False
+    return reply.startswith(b"ok")
@@ -0,0 +1,349 @@
+"""Cap watermark dan header/footer pada job PDF sebelum dikirim ke CUPS.
+
+Dokumen asli tidak ditulis ulang: byte-nya dialirkan apa adanya, lalu
+ditambah satu incremental update PDF berisi overlay. Overlay watermark dan
+header dibuat sekali sebagai Form XObject dan dipakai ulang di setiap
+halaman; per halaman hanya ada satu content stream kecil (cm + Do + nomor
+halaman) dan salinan kamus halaman. Memori tetap kecil berapa pun jumlah
+halamannya, dan kecepatannya mendekati kecepatan membaca file.
+
+pypdf hanya dipakai untuk membaca struktur halaman dan diimpor saat
+dibutuhkan, sehingga aplikasi tetap berjalan tanpa pypdf selama tidak ada
+job yang perlu dicap.
+"""
+import io
+import os
+import re
+import time
+import math
+import getpass
+
+CHUNK_SIZE = 1 << 20
+# Nilai combo Watermark yang berarti tanpa watermark.
+NO_WATERMARK = {None, "", "None", "Add/Delete..."}
+
+_WATERMARK_BOX = 1000.0
+_HEADER_BOX = (1000.0, 30.0)
+# Lebar glyph Helvetica-Bold (1/1000 em) untuk memusatkan teks; karakter lain ~556.
+_HELVETICA_BOLD_WIDTHS = dict(zip(
+    " ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-.",
+    [278, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+     667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611] + [556] * 10 + [333, 278],
+))
+
+
+class StampError(Exception):
+    """PDF tidak bisa dicap (terenkripsi, rusak, atau pypdf tidak tersedia)."""
+
+
+def _require_pypdf():
+    try:
+        import pypdf
+    except ImportError as e:
+        raise StampError("pypdf diperlukan untuk watermark/header-footer (pip install pypdf)") from e
+    return pypdf
+
+
+def stamp_settings(values):
+    """(watermark, header_footer) dari nilai SettingsModel; watermark None jika tidak ada."""
+    watermark = values.get("watermark")
+    return (None if watermark in NO_WATERMARK else watermark), bool(values.get("header_footer"))
+
+
+def needs_stamping(watermark=None, header_footer=False):
+    return watermark not in NO_WATERMARK or bool(header_footer)
+
+
+def _pdf_string(text):
+    data = text.encode("cp1252", "replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _text_width(text, size):
+    return sum(_HELVETICA_BOLD_WIDTHS.get(char.upper(), 556) for char in text) * size / 1000.0
+
+
+def _matrix_multiply(m, n):
+    """Matriks PDF [a b c d e f]: hasil menerapkan m lalu n."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (a * a2 + b * c2, a * b2 + b * d2, c * a2 + d * c2, c * b2 + d * d2,
+            e * a2 + f * c2 + e2, e * b2 + f * d2 + f2)
+
+
+def _page_geometry(page):
+    """(lebar tampil, tinggi tampil, matriks dari koordinat tampil ke ruang halaman)."""
+    box = page.cropbox
+    x0, y0 = float(box.left), float(box.bottom)
+    width, height = float(box.width), float(box.height)
+    rotate = page.rotation % 360
+    if rotate == 90:
+        return height, width, (0, 1, -1, 0, x0 + width, y0)
+    if rotate == 180:
+        return width, height, (-1, 0, 0, -1, x0 + width, y0 + height)
+    if rotate == 270:
+        return height, width, (0, -1, 1, 0, x0, y0 + height)
+    return width, height, (1, 0, 0, 1, x0, y0)
+
+
+def _format_number(value):
+    text = f"{value:.4f}".rstrip("0").rstrip(".")
+    return text if text not in ("", "-0") else "0"
+
+
+def _cm(matrix):
+    return (" ".join(_format_number(v) for v in matrix) + " cm").encode("ascii")
+
+
+def _watermark_content(text):
+    # Teks diagonal mengisi sekitar 95% sisi kotak.
+    size = max(40.0, min(200.0, _WATERMARK_BOX * 0.95 / max(_text_width(text, 1.0), 0.001)))
+    width = _text_width(text, size)
+    angle = math.radians(35)
+    cos, sin = math.cos(angle), math.sin(angle)
+    center = _WATERMARK_BOX / 2
+    # Titik awal teks digeser agar pusat teks tepat di tengah kotak.
+    tx = center - cos * width / 2 + sin * size * 0.35
+    ty = center - sin * width / 2 - cos * size * 0.35
+    return b"".join([
+        b"q /PrnGS gs 0.85 0.1 0.1 rg BT /PrnF ", _format_number(size).encode(), b" Tf ",
+        " ".join(_format_number(v) for v in (cos, sin, -sin, cos, tx, ty)).encode(), b" Tm ",
+        _pdf_string(text), b" Tj ET Q",
+    ])
+
+
+def _header_content(left, right):
+    width = _HEADER_BOX[0]
+    size = 14.0
+    return b"".join([
+        b"q 0.3 g BT /PrnF ", _format_number(size).encode(), b" Tf 20 8 Td ", _pdf_string(left), b" Tj ET ",
+        b"BT /PrnF ", _format_number(size).encode(), b" Tf ",
+        _format_number(width - 20 - _text_width(right, size)).encode(), b" 8 Td ", _pdf_string(right), b" Tj ET Q",
+    ])
+
+
+class _UpdateWriter:
+    """Menulis objek incremental update sambil mencatat offset untuk xref."""
+
+    def __init__(self, base_offset, first_free):
+        self.offset = base_offset
+        self.next_number = first_free
+        self.entries = {}
+        self._buffer = io.BytesIO()
+
+    def reserve(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def write_object(self, number, body, generation=0):
+        self.entries[number] = (self.offset + self._buffer.tell(), generation)
+        self._buffer.write(f"{number} {generation} obj\n".encode("ascii"))
+        self._buffer.write(body)
+        self._buffer.write(b"\nendobj\n")
+
+    def write_stream(self, number, dictionary, data):
+        self.write_object(number, dictionary + f" /Length {len(data)} >>\nstream\n".encode("ascii")
+                          + data + b"\nendstream")
+
+    def drain(self):
+        """Byte yang sudah ditulis sejak drain terakhir."""
+        data = self._buffer.getvalue()
+        self.offset += len(data)
+        self._buffer = io.BytesIO()
+        return data
+
+    def write_raw(self, data):
+        self._buffer.write(data)
+
+
+def _find_startxref(handle, size):
+    handle.seek(max(0, size - 2048))
+    tail = handle.read()
+    match = re.search(rb"startxref\s+(\d+)\s+%%EOF\s*$", tail) or re.search(rb"startxref\s+(\d+)", tail)
+    if not match:
+        raise StampError("startxref tidak ditemukan; PDF rusak")
+    offset = int(match.group(1))
+    handle.seek(offset)
+    uses_table = handle.read(4) == b"xref"
+    return offset, uses_table
+
+
+def _serialize(obj):
+    stream = io.BytesIO()
+    obj.write_to_stream(stream)
+    return stream.getvalue()
+
+
+def _xref_entries(entries):
+    """Mengelompokkan nomor objek menjadi subbagian berurutan [(awal, [(offset, gen), ...])]."""
+    sections = []
+    for number in sorted(entries):
+        if sections and number == sections[-1][0] + len(sections[-1][1]):
+            sections[-1][1].append(entries[number])
+        else:
+            sections.append((number, [entries[number]]))
+    return sections
+
+
+def stamp_pdf_stream(path, watermark=None, header_footer=False, header_left=None, header_right=None,
+                     chunk_size=CHUNK_SIZE):
+    """Generator chunk byte PDF yang sudah dicap.
+
+    Tanpa watermark maupun header/footer, file dialirkan apa adanya.
+    StampError untuk PDF terenkripsi atau rusak, sebelum chunk pertama.
+    """
+    if not needs_stamping(watermark, header_footer):
+        yield from _read_chunks(path, chunk_size)
+        return
+    pypdf = _require_pypdf()
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+
+    size = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        try:
+            reader = pypdf.PdfReader(handle)
+            encrypted = reader.is_encrypted
+        except pypdf.errors.PdfReadError as e:
+            raise StampError(f"PDF tidak bisa dibaca: {e}") from e
+        if encrypted:
+            raise StampError("PDF terenkripsi tidak bisa dicap")
+        prev_xref, uses_table = _find_startxref(handle, size)
+        trailer = reader.trailer
+        page_count = len(reader.pages)
+
+        # Dokumen asli dialirkan lebih dulu, tanpa diubah.
+        tail = b""
+        for chunk in _read_chunks(path, chunk_size):
+            tail = chunk[-1:] or tail
+            yield chunk
+        separator = b"" if tail == b"\n" else b"\n"
+        writer = _UpdateWriter(size, int(trailer["/Size"]))
+        writer.write_raw(separator)
+
+        font = writer.reserve()
+        writer.write_object(font, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+                                  b"/Encoding /WinAnsiEncoding >>")
+        gstate = writer.reserve()
+        writer.write_object(gstate, b"<< /Type /ExtGState /ca 0.22 /CA 0.22 >>")
+        form_resources = f"/Resources << /Font << /PrnF {font} 0 R >> /ExtGState << /PrnGS {gstate} 0 R >> >>"
+        overlays = {}
+        if watermark not in NO_WATERMARK:
+            overlays["/PrnWm"] = writer.reserve()
+            writer.write_stream(overlays["/PrnWm"], (
+                f"<< /Type /XObject /Subtype /Form /BBox [0 0 {_WATERMARK_BOX:g} {_WATERMARK_BOX:g}] "
+                + form_resources).encode("ascii"), _watermark_content(watermark))
+        if header_footer:
+            left = header_left if header_left is not None else getpass.getuser()
+            right = header_right if header_right is not None else time.strftime("%Y-%m-%d %H:%M")
+            overlays["/PrnHdr"] = writer.reserve()
+            writer.write_stream(overlays["/PrnHdr"], (
+                f"<< /Type /XObject /Subtype /Form /BBox [0 0 {_HEADER_BOX[0]:g} {_HEADER_BOX[1]:g}] "
+                + form_resources).encode("ascii"), _header_content(left, right))
+        # "q" dipasang di depan isi halaman asli agar state grafisnya tidak bocor ke overlay.
+        save_state = writer.reserve()
+        writer.write_stream(save_state, b"<<", b"q")
+        yield writer.drain()
+
+        resources_cache = {}
+        for page_number, page in enumerate(reader.pages, 1):
+            width, height, to_page = _page_geometry(page)
+            content = [b"Q"]
+            if "/PrnWm" in overlays:
+                scale = min(width, height) / _WATERMARK_BOX
+                placement = (scale, 0, 0, scale, (width - _WATERMARK_BOX * scale) / 2,
+                             (height - _WATERMARK_BOX * scale) / 2)
+                content += [b"q", _cm(_matrix_multiply(placement, to_page)), b"/PrnWm Do Q"]
+            if "/PrnHdr" in overlays:
+                scale = width / _HEADER_BOX[0]
+                placement = (scale, 0, 0, scale, 0, height - (_HEADER_BOX[1] + 6) * scale)
+                content += [b"q", _cm(_matrix_multiply(placement, to_page)), b"/PrnHdr Do Q"]
+                label = f"Page {page_number} of {page_count}"
+                font_size = max(6.0, 14.0 * scale)
+                footer = (1, 0, 0, 1, (width - _text_width(label, font_size)) / 2, 12 * scale + 4)
+                content += [b"q 0.3 g", _cm(_matrix_multiply(footer, to_page)),
+                            b"BT /PrnF ", _format_number(font_size).encode(), b" Tf 0 0 Td ",
+                            _pdf_string(label), b" Tj ET Q"]
+            overlay_stream = writer.reserve()
+            writer.write_stream(overlay_stream, b"<<", b" ".join(content))
+
+            resources = page.raw_get("/Resources") if "/Resources" in page else None
+            resources_key = (("ref", resources.idnum) if isinstance(resources, IndirectObject)
+                             else ("obj", id(resources)))
+            cached = resources_cache.get(resources_key)
+            if cached is None:
+                merged = DictionaryObject(resources.get_object() if resources is not None else {})
+                xobjects = DictionaryObject(merged.get("/XObject", DictionaryObject()).get_object())
+                for name, number in overlays.items():
+                    xobjects[NameObject(name)] = IndirectObject(number, 0, reader)
+                merged[NameObject("/XObject")] = xobjects
+                fonts = DictionaryObject(merged.get("/Font", DictionaryObject()).get_object())
+                fonts[NameObject("/PrnF")] = IndirectObject(font, 0, reader)
+                merged[NameObject("/Font")] = fonts
+                number = writer.reserve()
+                writer.write_object(number, _serialize(merged))
+                # Objek asli disimpan agar id() tidak dipakai ulang selama iterasi.
+                cached = resources_cache[resources_key] = (number, resources)
+            page_dict = DictionaryObject(page)
+            original_contents = page.raw_get("/Contents") if "/Contents" in page else None
+            if original_contents is None:
+                contents = []
+            elif isinstance(original_contents, IndirectObject) and not isinstance(
+                    original_contents.get_object(), ArrayObject):
+                contents = [original_contents]
+            else:
+                contents = list(original_contents.get_object())
+            page_dict[NameObject("/Contents")] = ArrayObject(
+                [IndirectObject(save_state, 0, reader)] + contents + [IndirectObject(overlay_stream, 0, reader)])
+            page_dict[NameObject("/Resources")] = IndirectObject(cached[0], 0, reader)
+            reference = page.indirect_reference
+            writer.write_object(reference.idnum, _serialize(page_dict), reference.generation)
+            if writer._buffer.tell() >= chunk_size:
+                yield writer.drain()
+
+        root = trailer.raw_get("/Root")
+        extra = f"/Root {root.idnum} {root.generation} R /Prev {prev_xref}"
+        info = trailer.raw_get("/Info") if "/Info" in trailer else None
+        if isinstance(info, IndirectObject):
+            extra += f" /Info {info.idnum} {info.generation} R"
+        if "/ID" in trailer:
+            extra += " /ID " + _serialize(trailer["/ID"]).decode("latin-1")
+        yield writer.drain()
+        yield _xref_section(writer, extra, uses_table)
+
+
+def _xref_section(writer, extra, uses_table):
+    """xref untuk objek update, dalam format yang sama dengan dokumen asli."""
+    xref_offset = writer.offset
+    if uses_table:
+        # Subbagian "0 1" (kepala daftar objek bebas) membuat pembaca yang ketat tidak mengeluh.
+        lines = [b"xref\n0 1\n0000000000 65535 f\r\n"]
+        for start, entries in _xref_entries(writer.entries):
+            lines.append(f"{start} {len(entries)}\n".encode("ascii"))
+            lines.extend(f"{offset:010d} {generation:05d} n\r\n".encode("ascii") for offset, generation in entries)
+        lines.append(f"trailer\n<< /Size {writer.next_number} {extra} >>\n".encode("latin-1"))
+        lines.append(f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+        return b"".join(lines)
+    # Dokumen asli memakai xref stream: tulis xref stream juga (tanpa filter).
+    number = writer.reserve()
+    entries = dict(writer.entries)
+    entries[number] = (xref_offset, 0)
+    index, data = [], io.BytesIO()
+    for start, section in _xref_entries(entries):
+        index += [start, len(section)]
+        for offset, generation in section:
+            data.write(bytes([1]) + offset.to_bytes(5, "big") + generation.to_bytes(2, "big"))
+    payload = data.getvalue()
+    header = (f"{number} 0 obj\n<< /Type /XRef /Size {writer.next_number} /W [1 5 2] "
+              f"/Index [{' '.join(map(str, index))}] {extra} /Length {len(payload)} >>\nstream\n")
+    return (header.encode("latin-1") + payload + b"\nendstream\nendobj\n"
+            + f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+
+
+def _read_chunks(path, chunk_size):
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,226 @@
+"""Pemantau status printer dan level tinta berbasis langganan notifikasi CUPS.
+
+Satu langganan server (pull, lewat getNotifications dengan nomor urut) dipakai
+untuk semua printer yang dipantau. Atribut status lengkap hanya dibaca ulang
+untuk printer yang mendapat event, sehingga memantau banyak printer nyaris
+tidak membebani cupsd. Jika server tidak mendukung langganan, pemantau
+kembali ke polling berselang.
+"""
+import time
+import threading
+
+import cups
+
+from cups_backend import ConnectionPool
+
+STATUS_ATTRIBUTES = [
+    "printer-state", "printer-state-reasons", "printer-state-message",
+    "marker-names", "marker-levels", "marker-colors", "marker-types",
+    "marker-low-levels", "marker-high-levels",
+]
+SUBSCRIBED_EVENTS = [
+    "printer-state-changed", "printer-config-changed", "printer-deleted",
+    "printer-added", "printer-modified",
+]
+SERVER_URI = "ipp://localhost/"
+
+# Arti khusus nilai marker-levels (RFC 3805).
+MARKER_LEVEL_UNKNOWN = (-1, -2)
+MARKER_LEVEL_SOME_REMAINING = -3
+
+
+def marker_entries(status):
+    """Daftar (nama, level, warna) dari atribut marker-* printer."""
+    names = status.get("marker-names") or []
+    levels = status.get("marker-levels") or []
+    colors = status.get("marker-colors") or []
+    if isinstance(names, str):
+        names, levels, colors = [names], [levels], [colors]
+    entries = []
+    for index, name in enumerate(names):
+        level = levels[index] if index < len(levels) else -1
+        color = colors[index] if index < len(colors) else ""
+        # Marker multi-warna ditulis "#RRGGBB#RRGGBB"; ambil warna pertama.
+        parts = [part for part in color.split("#") if part]
+        entries.append((name, level, "#" + parts[0] if color.startswith("#") and parts else "#808080"))
+    return entries
+
+
+class StatusMonitor:
+    """Thread latar yang memantau atribut status beberapa printer.
+
+    on_change(printer_name, changed) dipanggil dari thread pemantau dengan
+    hanya atribut yang berubah sejak laporan terakhir (laporan pertama berisi
+    semua atribut STATUS_ATTRIBUTES yang tersedia). on_events(events), jika
+    diberikan, menerima semua event printer di server (termasuk printer yang
+    tidak dipantau), mis. untuk menyegarkan daftar printer.
+    """
+
+    def __init__(self, printers, on_change, pool=None, lease_duration=3600,
+                 min_interval=1.0, max_interval=60.0, fallback_interval=30.0, on_events=None):
+        self.printers = set(printers)
+        self.on_change = on_change
+        self.on_events = on_events
+        self.pool = pool if pool is not None else ConnectionPool(max_idle=1)
+        self.lease_duration = lease_duration
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.fallback_interval = fallback_interval
+        self.polling_fallback = False
+        self.requests = 0
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._conn = None
+        self._subscription_id = None
+        self._next_sequence = 0
+        self._renewed_at = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="status-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, wait=False):
+        self._stop.set()
+        self._wake.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def add_printer(self, name):
+        with self._lock:
+            self.printers.add(name)
+        self._wake.set()
+
+    def remove_printer(self, name):
+        with self._lock:
+            self.printers.discard(name)
+            self._snapshots.pop(name, None)
+
+    def refresh(self, name=None):
+        """Meminta pembacaan ulang penuh (mis. saat dialog tinta dibuka)."""
+        with self._lock:
+            targets = [name] if name else list(self.printers)
+            for target in targets:
+                self._snapshots.pop(target, None)
+        self._wake.set()
+
+    def _ipp(self, method, *args, **kwargs):
+        self.requests += 1
+        return getattr(self._conn, method)(*args, **kwargs)
+
+    def _fetch(self, name):
+        attributes = self._ipp("getPrinterAttributes", name, requested_attributes=STATUS_ATTRIBUTES)
+        status = {key: attributes[key] for key in STATUS_ATTRIBUTES if key in attributes}
+        with self._lock:
+            if name not in self.printers:
+                return
+            previous = self._snapshots.get(name, {})
+            changed = {key: value for key, value in status.items() if previous.get(key) != value}
+            self._snapshots[name] = status
+        if changed:
+            self.on_change(name, changed)
+
+    def _subscribe(self):
+        try:
+            self._subscription_id = self._ipp(
+                "createSubscription", SERVER_URI, events=SUBSCRIBED_EVENTS,
+                lease_duration=self.lease_duration,
+            )
+            self._next_sequence = 0
+            self._renewed_at = time.monotonic()
+            self.polling_fallback = False
+        except cups.IPPError as e:
+            print(f"Langganan CUPS tidak tersedia, kembali ke polling: {e}")
+            self._subscription_id = None
+            self.polling_fallback = True
+
+    def _poll_events(self):
+        """Mengambil event baru; mengembalikan (printer yang berubah, interval tunggu berikutnya)."""
+        if self._next_sequence:
+            reply = self._ipp("getNotifications", [self._subscription_id], sequence_numbers=[self._next_sequence])
+        else:
+            # pycups menolak sequence_numbers=None; tanpa nomor urut, keyword-nya dihilangkan.
+            reply = self._ipp("getNotifications", [self._subscription_id])
+        dirty = set()
+        for event in reply.get("events", []):
+            self._next_sequence = max(self._next_sequence, event.get("notify-sequence-number", 0) + 1)
+            name = event.get("printer-name")
+            if name is None:
+                continue
+            if event.get("notify-subscribed-event") == "printer-deleted":
+                self.remove_printer(name)
+            else:
+                dirty.add(name)
+        if self.on_events is not None and reply.get("events"):
+            self.on_events(reply["events"])
+        interval = reply.get("notify-get-interval", self.min_interval * 5)
+        return dirty, min(self.max_interval, max(self.min_interval, interval))
+
+    def _fetch_all(self, names):
+        for name in names:
+            try:
+                self._fetch(name)
+            except cups.IPPError as e:
+                print(f"Gagal membaca status {name}: {e}")
+
+    def _run(self):
+        # Diperbarui saat separuh lease berlalu (waktu nyata, bukan jumlah putaran:
+        # tunggu bisa berakhir lebih cepat karena ada notifikasi).
+        renew_after = self.lease_duration / 2.0
+        while not self._stop.is_set():
+            try:
+                if self._conn is None:
+                    self._conn = self.pool.acquire()
+                    self._subscribe()
+                with self._lock:
+                    missing = {name for name in self.printers if name not in self._snapshots}
+                self._fetch_all(missing)
+                if self.polling_fallback:
+                    with self._lock:
+                        dirty = set(self.printers) - missing
+                    interval = self.fallback_interval
+                else:
+                    dirty, interval = self._poll_events()
+                    with self._lock:
+                        dirty &= self.printers
+                    dirty -= missing
+                self._fetch_all(dirty)
+                if not self.polling_fallback and self.lease_duration > 0:
+                    renew_in = renew_after - (time.monotonic() - self._renewed_at)
+                    if renew_in <= 0:
+                        self._ipp("renewSubscription", self._subscription_id, lease_duration=self.lease_duration)
+                        self._renewed_at = time.monotonic()
+                        renew_in = renew_after
+                    interval = min(interval, renew_in)
+            except Exception as e:
+                # Koneksi atau langganan hilang (mis. cupsd restart): mulai ulang.
+                print(f"Pemantau status: {e}; mencoba lagi")
+                self._cancel_subscription()
+                self.pool.release(self._conn, discard=True)
+                self._conn = None
+                interval = self.fallback_interval
+                with self._lock:
+                    self._snapshots.clear()
+            self._wake.wait(interval)
+            self._wake.clear()
+        self._cleanup()
+
+    def _cancel_subscription(self):
+        # Best effort: langganan yang tertinggal tetap memakan slot di cupsd sampai lease habis.
+        if self._conn is not None and self._subscription_id is not None:
+            try:
+                self._ipp("cancelSubscription", self._subscription_id)
+            except Exception:
+                pass
+        self._subscription_id = None
+
+    def _cleanup(self):
+        if self._conn is None:
+            return
+        self._cancel_subscription()
+        self.pool.release(self._conn)
+        self._conn = None